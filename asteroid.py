@@ -2,9 +2,12 @@ import pygame
 from circleshape import CircleShape
 from constants import (
     ASTEROID_MIN_RADIUS,
+    ASTEROID_POOL_SIZE,
     SCREEN_WIDTH,
     SCREEN_HEIGHT,
 )
+from pool import Pool
+from spritecache import atlas
 import random
 
 
@@ -12,8 +15,8 @@ class Asteroid(CircleShape):
     def __init__(self, x, y, radius):
         super().__init__(x, y, radius)
 
-    def draw(self, screen):
-        pygame.draw.circle(screen, "white", self.position, self.radius, 2)
+    def blits(self):
+        return [atlas.blit_at(atlas.circle(self.radius, "white", 2), self.render_position())]
 
     def update(self, dt):
         self.position += self.velocity * dt
@@ -28,20 +31,26 @@ class Asteroid(CircleShape):
         elif self.position.y < 0:
             self.position.y = SCREEN_HEIGHT
 
-    def split(self):
-        self.kill()
-
-        if self.radius <= ASTEROID_MIN_RADIUS:
-            return
-
-        angle = random.uniform(20, 50)
-        new_velocity1 = self.velocity.rotate(angle)
-        new_velocity2 = self.velocity.rotate(-angle)
-
-        new_radius = self.radius - ASTEROID_MIN_RADIUS
-
-        asteroid1 = Asteroid(self.position.x, self.position.y, new_radius)
-        asteroid2 = Asteroid(self.position.x, self.position.y, new_radius)
-
-        asteroid1.velocity = new_velocity1 * 1.2
-        asteroid2.velocity = new_velocity2 * 1.2
+    def split(self, rng=random):
+        # Fragments are acquired before this asteroid is released, so the
+        # pool can't hand this very instance back out as one of them
+        position = pygame.Vector2(self.position)
+        velocity = pygame.Vector2(self.velocity)
+        radius = self.radius
+        pool = type(self).pool
+        fragments = []
+        if radius > ASTEROID_MIN_RADIUS:
+            angle = rng.uniform(20, 50)
+            new_radius = radius - ASTEROID_MIN_RADIUS
+            for new_velocity in (velocity.rotate(angle), velocity.rotate(-angle)):
+                fragment = pool.acquire(position.x, position.y, new_radius)
+                fragment.velocity = new_velocity * 1.2
+                fragments.append(fragment)
+
+        pool.release(self)
+        if self.particles:
+            self.particles.burst(position, velocity, radius)
+        return fragments
+
+
+Asteroid.pool = Pool(Asteroid, ASTEROID_POOL_SIZE)
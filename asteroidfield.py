@@ -5,6 +5,8 @@ from constants import *
 
 
 class AsteroidField(pygame.sprite.Sprite):
+    asteroid_class = Asteroid  # Swapped for ArrayAsteroid by the array backend
+
     edges = [
         [
             pygame.Vector2(1, 0),
@@ -28,24 +30,41 @@ class AsteroidField(pygame.sprite.Sprite):
         ],
     ]
 
-    def __init__(self):
+    def __init__(self, rng=random, spawn_rate=ASTEROID_SPAWN_RATE, has_room=None, scheduler=None):
         pygame.sprite.Sprite.__init__(self, self.containers)
-        self.spawn_timer = 0.0
+        self.spawn_rate = spawn_rate  # seconds between spawns
+        self.rng = rng  # a seeded random.Random makes spawns reproducible
+        self.has_room = has_room  # optional check that vetoes spawns at the entity caps
+        # Spawns run off a timer on the World's scheduler; without one the
+        # field only spawns when spawn() is called
+        self.scheduler = scheduler
+        self.spawn_timer = None
+        if scheduler is not None:
+            self.schedule_spawn(scheduler.now + spawn_rate)
+
+    def schedule_spawn(self, when):
+        self.spawn_timer = self.scheduler.at(when, self.spawn_due)
+
+    def kill(self):
+        if self.scheduler is not None:
+            self.scheduler.cancel(self.spawn_timer)
+        super().kill()
 
     def spawn(self, radius, position, velocity):
-        asteroid = Asteroid(position.x, position.y, radius)
+        asteroid = self.asteroid_class.pool.acquire(position.x, position.y, radius)
         asteroid.velocity = velocity
 
-    def update(self, dt):
-        self.spawn_timer += dt
-        if self.spawn_timer > ASTEROID_SPAWN_RATE:
-            self.spawn_timer = 0
-
-            # spawn a new asteroid at a random edge
-            edge = random.choice(self.edges)
-            speed = random.randint(40, 100)
-            velocity = edge[0] * speed
-            velocity = velocity.rotate(random.randint(-30, 30))
-            position = edge[1](random.uniform(0, 1))
-            kind = random.randint(1, ASTEROID_KINDS)
-            self.spawn(ASTEROID_MIN_RADIUS * kind, position, velocity)
+    def spawn_due(self):
+        # The next spawn counts from this step, like the old per-frame timer did
+        self.schedule_spawn(self.scheduler.now + self.spawn_rate)
+        if self.has_room and not self.has_room():
+            return
+
+        # spawn a new asteroid at a random edge
+        edge = self.rng.choice(self.edges)
+        speed = self.rng.randint(40, 100)
+        velocity = edge[0] * speed
+        velocity = velocity.rotate(self.rng.randint(-30, 30))
+        position = edge[1](self.rng.uniform(0, 1))
+        kind = self.rng.randint(1, ASTEROID_KINDS)
+        self.spawn(ASTEROID_MIN_RADIUS * kind, position, velocity)
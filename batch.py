@@ -0,0 +1,171 @@
+"""Run many seeded headless games across a process pool.
+
+Each game is a World flown by a pilot from bots.py until game over or a
+time limit. Workers send a summary back as each game finishes. Summaries
+are appended to a JSON-lines checkpoint file, so an interrupted sweep
+resumes where it stopped. At the end, score and survival-time
+histograms are printed and written as JSON.
+
+    python batch.py --games 5000 --spawn-rate 0.6 --checkpoint sweep.jsonl
+"""
+import argparse
+import json
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from bots import PILOTS
+from constants import ASTEROID_SPAWN_RATE, POWERUP_DROP_CHANCE
+from world import World
+
+STEP_DT = 1 / 60
+
+
+def run_game(seed, pilot="random", params=None, max_time=600.0, dt=STEP_DT):
+    world = World(seed=seed, **(params or {}))
+    # The pilot gets its own stream so its choices don't shift the game's RNG
+    bot = PILOTS[pilot](random.Random(seed ^ 0x5EED))
+    while not world.game_over and world.elapsed < max_time:
+        world.step(dt, bot.inputs(world))
+    return {
+        "seed": seed,
+        "score": world.score,
+        "survival_time": world.elapsed,
+        "game_over": world.game_over,
+        "powerups_collected": world.powerups_collected,
+    }
+
+
+def histogram(values, bins=20):
+    if not values:
+        return {"edges": [], "counts": []}
+    low, high = min(values), max(values)
+    width = (high - low) / bins or 1
+    counts = [0] * bins
+    for value in values:
+        counts[min(int((value - low) / width), bins - 1)] += 1
+    return {"edges": [low + width * i for i in range(bins + 1)], "counts": counts}
+
+
+def load_checkpoint(path, config):
+    # Summaries already in the checkpoint by seed; it must belong to the same sweep
+    if not path or not os.path.exists(path):
+        return {}
+    summaries = {}
+    with open(path, "r") as f:
+        header = f.readline()
+        if header and json.loads(header) != {"config": config}:
+            raise ValueError(f"{path} is a checkpoint for a different sweep")
+        for line in f:
+            try:
+                summary = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn line from an interrupted run
+            summaries[summary["seed"]] = summary  # a re-run seed replaces its old row
+    return summaries
+
+
+def write_checkpoint(path, config, summaries):
+    # Rewrite the checkpoint with only complete rows, so appends start on a fresh line
+    with open(path + ".tmp", "w") as f:
+        f.write(json.dumps({"config": config}) + "\n")
+        for summary in summaries.values():
+            f.write(json.dumps(summary) + "\n")
+    os.replace(path + ".tmp", path)
+
+
+def run_batch(seeds, config, workers=None, checkpoint=None, on_result=None):
+    summaries = load_checkpoint(checkpoint, config)
+    pending = [seed for seed in seeds if seed not in summaries]
+
+    out = None
+    if checkpoint:
+        write_checkpoint(checkpoint, config, summaries)
+        out = open(checkpoint, "a")
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    run_game, seed, config["pilot"], config["params"], config["max_time"]
+                )
+                for seed in pending
+            ]
+            for future in as_completed(futures):
+                summary = future.result()
+                summaries[summary["seed"]] = summary
+                if out:
+                    out.write(json.dumps(summary) + "\n")
+                    out.flush()
+                if on_result:
+                    on_result(summary)
+    finally:
+        if out:
+            out.close()
+    return list(summaries.values())
+
+
+def aggregate(summaries, bins=20):
+    scores = [summary["score"] for summary in summaries]
+    times = [summary["survival_time"] for summary in summaries]
+    count = len(summaries)
+    return {
+        "games": count,
+        "mean_score": sum(scores) / count if count else 0,
+        "mean_survival_time": sum(times) / count if count else 0,
+        "score_histogram": histogram(scores, bins),
+        "survival_time_histogram": histogram(times, bins),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Batch-simulate seeded Asteroids games")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--pilot", choices=sorted(PILOTS), default="random")
+    parser.add_argument("--max-time", type=float, default=600.0, help="simulated seconds before a game is cut off")
+    parser.add_argument("--spawn-rate", type=float, default=ASTEROID_SPAWN_RATE)
+    parser.add_argument("--drop-chance", type=float, default=POWERUP_DROP_CHANCE)
+    parser.add_argument("--powerup-duration", type=float, default=None)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--checkpoint", default=None, help="JSON-lines file to stream results to and resume from")
+    parser.add_argument("--bins", type=int, default=20)
+    parser.add_argument("--output", default="batch_results.json")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = {
+        "pilot": args.pilot,
+        "max_time": args.max_time,
+        "params": {
+            "spawn_rate": args.spawn_rate,
+            "powerup_drop_chance": args.drop_chance,
+            "powerup_duration": args.powerup_duration,
+        },
+    }
+    seeds = range(args.first_seed, args.first_seed + args.games)
+    finished = 0
+
+    def progress(summary):
+        nonlocal finished
+        finished += 1
+        if finished % 100 == 0:
+            print(f"{finished} games finished", file=sys.stderr)
+
+    summaries = run_batch(seeds, config, args.workers, args.checkpoint, progress)
+    result = {"config": config, **aggregate(summaries, args.bins)}
+    with open(args.output, "w") as f:
+        json.dump(result, f, indent=2)
+    print(
+        f"{result['games']} games: mean score {result['mean_score']:.1f}, "
+        f"mean survival {result['mean_survival_time']:.1f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""Seeded performance scenarios with per-phase timings and baseline checks.
+
+Run with the dummy video driver, e.g.
+
+    SDL_VIDEODRIVER=dummy python benchmark.py
+
+Each scenario builds a World from a fixed seed and times the collision
+pass, the `updatable` updates, drawing the `drawable` group and the full
+frame separately. Results are written as JSON (bench_results.json by
+default). With a baseline file, the run fails when any phase's median is
+slower than the baseline by more than the tolerance. Regenerate the
+baseline with --update-baseline on the machine that runs the checks, and
+commit it along with any change meant to alter a phase's cost or a
+scenario's setup, so the gate always compares against the current tree.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, ASTEROID_MIN_RADIUS, ASTEROID_KINDS, PLAYER_SHOOT_SPEED
+from player import PlayerInput
+from powerup import RapidFirePowerUp, SpreadShotPowerUp
+from spritecache import draw_sprites
+from world import World, UNLIMITED
+
+BASELINE_FILE = "bench_baseline.json"
+RESULTS_FILE = "bench_results.json"
+PHASES = ("collision", "update", "draw", "frame")
+FRAME_DT = 1 / 60
+EFFECT_DURATION = 10**9  # seconds
+
+# name -> asteroids, shots, frames, player inputs
+SCENARIOS = {
+    "asteroids_1000": dict(asteroids=1000, shots=0, frames=120, inputs={}),
+    "shots_vs_asteroids": dict(asteroids=300, shots=300, frames=120, inputs={}),
+    "spread_burst": dict(
+        asteroids=200,
+        shots=0,
+        frames=240,
+        inputs=dict(fire=True, right=True),
+        spread_shot=True,
+        rapid_fire=True,
+    ),
+    "long_session": dict(asteroids=0, shots=0, frames=3600, inputs="random"),
+}
+
+
+def build_world(spec, seed, array_physics=False):
+    rng = random.Random(seed)
+    # Limits off, so the dense scenarios keep every entity they spawn
+    world = World(array_physics=array_physics, seed=seed, limits=UNLIMITED)
+    world.lives = 10**9  # keep the session going however often the ship is hit
+    for _ in range(spec["asteroids"]):
+        world.asteroid_field.spawn(
+            ASTEROID_MIN_RADIUS * rng.randint(1, ASTEROID_KINDS),
+            pygame.Vector2(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT)),
+            pygame.Vector2(rng.uniform(40, 100), 0).rotate(rng.uniform(0, 360)),
+        )
+    for _ in range(spec["shots"]):
+        shot = world.player.shot_class.pool.acquire(
+            rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT)
+        )
+        shot.velocity = pygame.Vector2(0, PLAYER_SHOOT_SPEED).rotate(rng.uniform(0, 360))
+    # Power-ups go through the player's effects, as a pickup would, with a
+    # duration that outlasts any run
+    if spec.get("spread_shot"):
+        world.player.add_effect(SpreadShotPowerUp, EFFECT_DURATION)
+    if spec.get("rapid_fire"):
+        world.player.add_effect(RapidFirePowerUp, EFFECT_DURATION)
+    return world
+
+
+def scripted_inputs(spec, rng):
+    if spec["inputs"] == "random":
+        return PlayerInput(*(rng.random() < 0.5 for _ in PlayerInput._fields))
+    return PlayerInput(**spec["inputs"])
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    count = len(samples)
+    return {
+        "mean_ms": sum(samples) / count * 1000,
+        "p50_ms": samples[count // 2] * 1000,
+        "p95_ms": samples[min(count - 1, int(count * 0.95))] * 1000,
+        "p99_ms": samples[min(count - 1, int(count * 0.99))] * 1000,
+        "max_ms": samples[-1] * 1000,
+    }
+
+
+def run_scenario(spec, seed, frames=None, array_physics=False):
+    world = build_world(spec, seed, array_physics)
+    surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    rng = random.Random(seed)
+    timings = {phase: [] for phase in PHASES}
+    clock = time.perf_counter
+
+    for _ in range(frames or spec["frames"]):
+        inputs = scripted_inputs(spec, rng)
+        world.elapsed += FRAME_DT
+        world.bind()
+
+        # Unlike World.step, the update pass also runs on frames where the
+        # ship was hit, so dense fields don't hide its cost
+        start = clock()
+        world.scheduler.advance(world.elapsed)  # asteroid spawns and cooldowns, as in World.step
+        scheduled = clock()
+        world.collide()
+        collided = clock()
+        world.advance(FRAME_DT, inputs)
+        updated = clock()
+        surface.fill("#000000")
+        draw_sprites(surface, world.drawable)
+        drawn = clock()
+
+        timings["collision"].append(collided - scheduled)
+        timings["update"].append(scheduled - start + updated - collided)
+        timings["draw"].append(drawn - updated)
+        timings["frame"].append(drawn - start)
+
+    result = {phase: summarize(samples) for phase, samples in timings.items()}
+    result["entities"] = len(world.drawable)
+    return result
+
+
+def run(names=None, seed=0, frames=None, array_physics=False):
+    results = {}
+    for name in names or SCENARIOS:
+        results[name] = run_scenario(SCENARIOS[name], seed, frames, array_physics)
+    return {
+        "meta": {
+            "seed": seed,
+            "array_physics": array_physics,
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "machine": platform.machine(),
+        },
+        "scenarios": results,
+    }
+
+
+def compare(results, baseline, tolerance):
+    # Phases whose median got slower than baseline * (1 + tolerance)
+    regressions = []
+    for name, phases in results["scenarios"].items():
+        base_phases = baseline.get("scenarios", {}).get(name)
+        if not base_phases:
+            continue
+        for phase in PHASES:
+            current = phases[phase]["p50_ms"]
+            reference = base_phases[phase]["p50_ms"]
+            if current > reference * (1 + tolerance):
+                regressions.append((name, phase, reference, current))
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Asteroids benchmark suite")
+    parser.add_argument("scenarios", nargs="*", help=f"scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--frames", type=int, default=None, help="override the frame count of every scenario")
+    parser.add_argument("--array-physics", action="store_true")
+    parser.add_argument("--output", default=RESULTS_FILE, help="write results as JSON to this file")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed slowdown, 0.5 = 50%%")
+    parser.add_argument("--update-baseline", action="store_true")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        print(f"Unknown scenarios: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+
+    results = run(args.scenarios, args.seed, args.frames, args.array_physics)
+    output = json.dumps(results, indent=2)
+    with open(args.output, "w") as f:
+        f.write(output)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            f.write(output)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        return 0
+    with open(args.baseline, "r") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    for name, phase, reference, current in regressions:
+        print(f"REGRESSION {name}/{phase}: {reference:.3f} ms -> {current:.3f} ms", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
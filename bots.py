@@ -0,0 +1,129 @@
+import random
+import pygame
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from player import PlayerInput
+
+
+class Pilot:
+    """Produces a PlayerInput for each simulation step of a World."""
+
+    def __init__(self, rng=None):
+        self.rng = rng or random.Random()
+
+    def inputs(self, world):
+        raise NotImplementedError("Subclasses must implement this method.")
+
+
+class RandomPilot(Pilot):
+    # Mashes random keys, holding each combination for a few steps
+    def __init__(self, rng=None, hold=10):
+        super().__init__(rng)
+        self.hold = hold
+        self.held = 0
+        self.current = PlayerInput()
+
+    def inputs(self, world):
+        if self.held <= 0:
+            self.current = PlayerInput(*(self.rng.random() < 0.5 for _ in PlayerInput._fields))
+            self.held = self.hold
+        self.held -= 1
+        return self.current
+
+
+class SpinAndFirePilot(Pilot):
+    # Turret play: sit still, turn and keep firing
+    def inputs(self, world):
+        return PlayerInput(right=True, fire=True)
+
+
+def offset(origin, target):
+    # Shortest vector from origin to target on the wrapping screen
+    return pygame.Vector2(
+        (target.x - origin.x + SCREEN_WIDTH / 2) % SCREEN_WIDTH - SCREEN_WIDTH / 2,
+        (target.y - origin.y + SCREEN_HEIGHT / 2) % SCREEN_HEIGHT - SCREEN_HEIGHT / 2,
+    )
+
+
+def nearest(origin, sprites):
+    # (sprite, offset to it) for the closest sprite, or (None, None)
+    best, best_offset, best_distance = None, None, float("inf")
+    for sprite in sprites:
+        to_sprite = offset(origin, sprite.position)
+        distance = to_sprite.length_squared()
+        if distance < best_distance:
+            best, best_offset, best_distance = sprite, to_sprite, distance
+    return best, best_offset
+
+
+def steer(rotation, direction, tolerance):
+    # (left, right, aligned): the turn that points `rotation` along `direction`
+    error = (pygame.Vector2(0, 1).angle_to(direction) - rotation + 180) % 360 - 180
+    return error < -tolerance, error > tolerance, abs(error) <= tolerance
+
+
+class IdlePilot(Pilot):
+    # Leaves the ship alone, so the field fills up to its limits
+    def inputs(self, world):
+        return PlayerInput()
+
+
+class AimPilot(Pilot):
+    # Turns towards the nearest asteroid and fires once lined up on it.
+    # The target is picked again every `retarget` steps or when it's gone.
+    def __init__(self, rng=None, retarget=6, tolerance=4.0):
+        super().__init__(rng)
+        self.retarget = retarget
+        self.tolerance = tolerance
+        self.target = None
+        self.countdown = 0
+
+    def inputs(self, world):
+        player = world.player
+        self.countdown -= 1
+        if self.target is None or not self.target.alive() or self.countdown <= 0:
+            self.target, _ = nearest(player.position, world.asteroids)
+            self.countdown = self.retarget
+        if self.target is None:
+            return PlayerInput()
+        left, right, aligned = steer(player.rotation, offset(player.position, self.target.position), self.tolerance)
+        return PlayerInput(left=left, right=right, fire=aligned)
+
+
+class EvadePilot(Pilot):
+    # Flies away from any asteroid closer than `danger` pixels, else drifts
+    def __init__(self, rng=None, danger=150.0, tolerance=30.0):
+        super().__init__(rng)
+        self.danger = danger
+        self.tolerance = tolerance
+
+    def inputs(self, world):
+        player = world.player
+        threat, to_threat = nearest(player.position, world.asteroids)
+        if threat is None or to_threat.length() - threat.radius > self.danger:
+            return PlayerInput()
+        left, right, aligned = steer(player.rotation, -to_threat, self.tolerance)
+        return PlayerInput(forward=aligned, left=left, right=right)
+
+
+class ScriptedPilot(Pilot):
+    # Hands the ship to each pilot in turn for `period` simulated seconds
+    def __init__(self, rng=None, pilots=(AimPilot, EvadePilot, IdlePilot), period=30.0):
+        super().__init__(rng)
+        self.pilots = [pilot(self.rng) for pilot in pilots]
+        self.period = period
+
+    def current(self, world):
+        return self.pilots[int(world.elapsed / self.period) % len(self.pilots)]
+
+    def inputs(self, world):
+        return self.current(world).inputs(world)
+
+
+PILOTS = {
+    "random": RandomPilot,
+    "spin": SpinAndFirePilot,
+    "idle": IdlePilot,
+    "aim": AimPilot,
+    "evade": EvadePilot,
+    "scripted": ScriptedPilot,
+}
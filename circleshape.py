@@ -1,8 +1,23 @@
+import math
 import pygame
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from scheduler import Scheduler
 
 
 # Base class for game objects
 class CircleShape(pygame.sprite.Sprite):
+    # Fraction of the way from the previous to the current simulation state
+    # that is drawn. Set by the render loop in fixed-step mode.
+    render_alpha = 1.0
+    # Simulation time in seconds, set by the World before each step. New and
+    # reused entities record it in `born`, which entity lifetimes count from.
+    clock = 0.0
+    # ParticleSystem that effects are emitted into, or None. Set by the World.
+    particles = None
+    # Timers for cooldowns and effects run on the World's scheduler; this
+    # stand-in only serves entities made outside any World
+    scheduler = Scheduler()
+
     def __init__(self, x, y, radius):
         # Add to sprite groups only if containers are set
         containers = getattr(self, "containers", None)
@@ -14,15 +29,71 @@ class CircleShape(pygame.sprite.Sprite):
         self.position = pygame.Vector2(x, y)
         self.velocity = pygame.Vector2(0, 0)
         self.radius = radius
+        self.prev_position = pygame.Vector2(x, y)
+        self.born = CircleShape.clock
+
+    def reset(self, x, y, radius):
+        # Re-initialise a released instance; mirrors __init__
+        containers = getattr(self, "containers", None)
+        if containers:
+            self.add(containers)  # type: ignore
+
+        self.position = pygame.Vector2(x, y)
+        self.velocity = pygame.Vector2(0, 0)
+        self.radius = radius
+        self.prev_position = pygame.Vector2(x, y)
+        self.born = CircleShape.clock
+
+    def blits(self):
+        # (surface, destination) pairs for Surface.blits(); sub-classes must override
+        return []
 
     def draw(self, screen):
-        # sub-classes must override
-        pass
+        screen.blits(self.blits(), False)
 
     def update(self, dt):
         # sub-classes must override
         pass
 
+    def remember_position(self):
+        # Called before each simulation step when rendering interpolates
+        self.prev_position = pygame.Vector2(self.position)
+
+    def render_position(self):
+        position = self.position
+        alpha = CircleShape.render_alpha
+        if alpha >= 1.0:
+            return position
+        prev = self.prev_position
+        # Don't smear objects across the screen on the step they wrap around
+        if abs(position.x - prev.x) > SCREEN_WIDTH / 2 or abs(position.y - prev.y) > SCREEN_HEIGHT / 2:
+            return position
+        return prev.lerp(position, alpha)
+
     def check_collision(self, other):
-        distance = self.position.distance_to(other.position)
-        return distance <= (self.radius + other.radius)
+        # Compare squared distances to avoid a square root per pair
+        reach = self.radius + other.radius
+        return self.position.distance_squared_to(other.position) <= reach * reach
+
+    def time_of_impact(self, other, dt):
+        # Swept test over the last `dt` seconds of motion. Returns the fraction
+        # of the step (0..1) at which the circles first touched, or None.
+        # Both paths are traced back along the velocities; the start offset is
+        # taken across the nearer screen edge, so paths that wrapped line up.
+        reach = self.radius + other.radius
+        offset = (self.position - self.velocity * dt) - (other.position - other.velocity * dt)
+        offset.x = (offset.x + SCREEN_WIDTH / 2) % SCREEN_WIDTH - SCREEN_WIDTH / 2
+        offset.y = (offset.y + SCREEN_HEIGHT / 2) % SCREEN_HEIGHT - SCREEN_HEIGHT / 2
+        c = offset.dot(offset) - reach * reach
+        if c <= 0:
+            return 0.0  # Already touching at the start of the step
+        motion = (self.velocity - other.velocity) * dt
+        a = motion.dot(motion)
+        b = offset.dot(motion)
+        if a == 0 or b >= 0:
+            return None  # Not moving relative to each other, or moving apart
+        disc = b * b - a * c
+        if disc < 0:
+            return None
+        t = (-b - math.sqrt(disc)) / a
+        return t if t <= 1.0 else None
@@ -0,0 +1,200 @@
+"""Networked client for server.py.
+
+    python client.py --host 127.0.0.1 --port 9999
+
+Sends the keyboard state as input bits every frame and draws the field
+from the server's snapshots, extrapolating each entity along its velocity
+between them. --loss, --latency and --jitter simulate a bad network on
+everything the client sends.
+"""
+import argparse
+import asyncio
+from player import PlayerInput
+from replay import pack_input
+from world import NO_INPUT
+from netcode import (
+    HELLO,
+    INPUT,
+    BYE,
+    WELCOME,
+    SNAPSHOT,
+    SHIP,
+    INPUT_MESSAGE,
+    WELCOME_MESSAGE,
+    ROTATION_STEPS,
+    NetworkConditions,
+    apply,
+    extrapolate,
+    unpack_snapshot,
+)
+
+HELLO_RETRY = 0.25  # seconds between HELLOs until the server answers
+VIEW_HISTORY = 32  # received snapshots kept as delta bases
+
+
+class GameClient(asyncio.DatagramProtocol):
+    def __init__(self, conditions=None):
+        self.conditions = conditions or NetworkConditions()
+        self.transport = None
+        self.loop = None
+        self.player_id = None
+        self.rate = None
+        self.welcomed = asyncio.Event()
+        self.views = {}  # snapshot tick -> {net id: record}
+        self.latest = 0  # newest snapshot tick applied
+        self.received_at = 0.0  # loop time the newest snapshot arrived
+        self.score = 0
+        self.lives = 0
+        self.inputs = NO_INPUT
+        self.seq = 0
+        self.bytes_received = 0
+        self.snapshots_received = 0
+        self.unusable = 0  # deltas against a snapshot this client no longer has
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.loop = asyncio.get_running_loop()
+        self.loop.create_task(self.say_hello())
+
+    async def say_hello(self):
+        while not self.welcomed.is_set():
+            self.send(bytes([HELLO]))
+            await asyncio.sleep(HELLO_RETRY)
+
+    def send(self, data):
+        self.conditions.sendto(self.loop, self.transport, data)
+
+    def send_input(self, inputs=None):
+        if inputs is not None:
+            self.inputs = inputs
+        self.seq += 1
+        self.send(INPUT_MESSAGE.pack(INPUT, self.seq, self.latest, pack_input(self.inputs)))
+
+    def rejoin(self):
+        # After a game over: ask for a new ship
+        self.welcomed.clear()
+        self.loop.create_task(self.say_hello())
+
+    def close(self):
+        if self.transport and not self.transport.is_closing():
+            self.transport.sendto(bytes([BYE]))
+            self.transport.close()
+
+    def datagram_received(self, data, address):
+        if not data:
+            return
+        self.bytes_received += len(data)
+        if data[0] == WELCOME and len(data) >= WELCOME_MESSAGE.size:
+            _, self.player_id, self.rate = WELCOME_MESSAGE.unpack_from(data)
+            self.welcomed.set()
+        elif data[0] == SNAPSHOT:
+            self.snapshot_received(data)
+
+    def snapshot_received(self, data):
+        tick, base_tick, score, lives, records, removed = unpack_snapshot(data)
+        if tick in self.views:
+            return  # duplicate
+        if base_tick:
+            base = self.views.get(base_tick)
+            if base is None:
+                self.unusable += 1
+                return
+        else:
+            base = {}
+        self.snapshots_received += 1
+        self.views[tick] = apply(base, records, removed)
+        while len(self.views) > VIEW_HISTORY:
+            del self.views[min(self.views)]
+        if tick > self.latest:
+            self.latest = tick
+            self.received_at = self.loop.time()
+            self.score = score
+            self.lives = lives
+
+    def view(self):
+        return self.views.get(self.latest, {})
+
+    def server_tick(self):
+        # Estimated current server tick, for extrapolating between snapshots
+        if not self.rate:
+            return self.latest
+        return self.latest + (self.loop.time() - self.received_at) * self.rate
+
+    def entities(self):
+        # (kind, extra, x, y, radius, rotation in degrees) at the estimated server time
+        tick = self.server_tick()
+        for record in self.view().values():
+            x, y = extrapolate(record, tick, self.rate or 1)
+            yield record[1], record[2], x, y, record[7], record[8] * 360 / ROTATION_STEPS
+
+
+async def connect(host, port, conditions=None):
+    loop = asyncio.get_running_loop()
+    return await loop.create_datagram_endpoint(
+        lambda: GameClient(conditions), remote_addr=(host, port)
+    )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Asteroids multiplayer client")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9999)
+    parser.add_argument("--fps", type=int, default=60)
+    parser.add_argument("--loss", type=float, default=0.0, help="fraction of outgoing packets to drop")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every outgoing packet")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra seconds per packet")
+    return parser.parse_args(argv)
+
+
+async def play(args):
+    import pygame
+    from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+    from netcode import RAPID_FIRE, SHIELD, SPREAD_SHOT
+    from spritecache import atlas
+    from textcache import text_cache, get_font
+
+    colors = {RAPID_FIRE: (0, 255, 0), SHIELD: (0, 0, 255), SPREAD_SHOT: (255, 165, 0)}
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    transport, client = await connect(
+        args.host, args.port, NetworkConditions(args.loss, args.latency, args.jitter)
+    )
+    try:
+        while True:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_r and client.latest and not client.lives:
+                    client.rejoin()
+            if client.welcomed.is_set():
+                client.send_input(PlayerInput.from_keys(pygame.key.get_pressed()))
+
+            screen.fill("#000000")
+            blits = []
+            for kind, extra, x, y, radius, rotation in client.entities():
+                if kind == SHIP:
+                    color = "white" if extra == client.player_id else (160, 160, 160)
+                    blits.append(atlas.blit_at(atlas.ship(radius, color, rotation), (x, y)))
+                elif kind in colors:
+                    blits.append(atlas.blit_at(atlas.circle(radius, colors[kind]), (x, y)))
+                else:
+                    blits.append(atlas.blit_at(atlas.circle(radius, "white", 2), (x, y)))
+            screen.blits(blits, False)
+            hud = f"Score: {client.score}  Lives: {client.lives}"
+            if client.latest and not client.lives:
+                hud += "  Game over - R to rejoin"
+            screen.blit(text_cache.render(get_font(36), hud), (10, 10))
+            pygame.display.flip()
+            await asyncio.sleep(1 / args.fps)
+    finally:
+        client.close()
+        pygame.quit()
+
+
+def main(argv=None):
+    asyncio.run(play(parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,13 @@
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 
+SIM_RATE = 60  # fixed-step simulation rate, steps per second
+MAX_CATCHUP_STEPS = 5  # fixed steps allowed per rendered frame
+DIRTY_RECT_THRESHOLD = 0.5  # dirty screen fraction above which a full flip is cheaper
+TEXT_CACHE_SIZE = 64  # rendered text surfaces kept by the LRU text cache
+PROFILER_FRAMES = 600  # frames kept in the profiler's ring buffer
+PROFILER_OVERLAY_INTERVAL = 0.25  # seconds between profiler overlay refreshes
+
 ASTEROID_MIN_RADIUS = 20
 ASTEROID_KINDS = 3
 ASTEROID_SPAWN_RATE = 0.8  # seconds
@@ -11,5 +18,38 @@ PLAYER_TURN_SPEED = 300
 PLAYER_SPEED = 200
 PLAYER_SHOOT_SPEED = 500
 PLAYER_SHOOT_COOLDOWN = 0.3
+PLAYER_LIVES = 3
 
 SHOT_RADIUS = 5
+SHOT_LIFETIME = 2.0  # seconds before a shot expires
+SHOT_RANGE = None  # pixels a shot may travel; None for no limit
+
+POWERUP_DROP_CHANCE = 0.2  # chance a destroyed asteroid drops a power-up
+POWERUP_LIFETIME = 10.0  # seconds an uncollected power-up stays on the field
+
+# Entity caps; past them the oldest entities of a type are evicted first
+MAX_ASTEROIDS = 200
+MAX_SHOTS = 150
+MAX_POWERUPS = 8
+MAX_ENTITIES = 400  # asteroids, shots and power-ups together
+
+SHIP_ROTATION_STEPS = 72  # pre-rendered ship rotations (5 degrees apart)
+
+SHOT_POOL_SIZE = 256  # spare shots kept for reuse
+ASTEROID_POOL_SIZE = 256  # spare asteroids kept for reuse
+
+REWIND_SNAPSHOTS = 100  # world snapshots kept for rewinding
+REWIND_INTERVAL = 6  # simulation steps between rewind snapshots
+
+EVENT_LOG_SIZE = 4096  # game events buffered before the oldest are dropped
+
+# Internal render resolutions, as fractions of the window size
+RENDER_SCALES = (0.5, 0.625, 0.75, 0.875, 1.0)
+RENDER_SCALE_WINDOW = 30  # frames measured before each scale decision
+RENDER_SCALE_HIGH = 0.9  # lower the scale above this fraction of the frame budget
+RENDER_SCALE_LOW = 0.6  # raise it again below this fraction
+
+PARTICLE_BUDGET = 2048  # live particles at most; 0 turns particle effects off
+PARTICLES_PER_RADIUS = 0.6  # debris particles per pixel of a destroyed asteroid's radius
+THRUST_PARTICLE_RATE = 90  # engine particles per second of thrust
+PARTICLE_DRAG = 0.3  # fraction of a particle's speed left after one second
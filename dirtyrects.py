@@ -0,0 +1,61 @@
+import pygame
+from constants import DIRTY_RECT_THRESHOLD
+from spritecache import draw_sprites
+
+
+class DirtyRectRenderer:
+    """Redraws and presents only the parts of the screen that changed.
+
+    Every frame the rects drawn in the previous frame are erased, the new
+    frame is drawn while its rects are recorded, and both sets are pushed
+    with pygame.display.update(). When the dirty area covers more than
+    `threshold` of the screen, or after invalidate(), the frame is cleared
+    and flipped whole instead.
+    """
+
+    def __init__(self, screen, background="#000000", threshold=DIRTY_RECT_THRESHOLD):
+        self.screen = screen
+        self.background = background
+        self.threshold = threshold
+        self.previous = []
+        self.current = []
+        self.full_redraw = True
+        self.full_frames = 0
+        self.partial_frames = 0
+
+    def invalidate(self):
+        # Redraw and present the whole screen on the next frame
+        self.full_redraw = True
+
+    def begin(self):
+        if self.full_redraw:
+            self.screen.fill(self.background)
+        else:
+            for rect in self.previous:
+                self.screen.fill(self.background, rect)
+        self.current = []
+
+    def draw_sprites(self, sprites):
+        self.current.extend(draw_sprites(self.screen, sprites, True))
+
+    def draw_blits(self, blits):
+        # A prepared (surface, destination) batch, as published by pipeline.py
+        self.current.extend(self.screen.blits(blits, True))
+
+    def blit(self, surface, dest):
+        rect = self.screen.blit(surface, dest)
+        self.current.append(rect)
+        return rect
+
+    def present(self):
+        dirty = self.previous + self.current
+        screen_area = self.screen.get_width() * self.screen.get_height()
+        dirty_area = sum(rect.w * rect.h for rect in dirty)
+        if self.full_redraw or dirty_area > screen_area * self.threshold:
+            pygame.display.flip()
+            self.full_frames += 1
+        else:
+            pygame.display.update(dirty)
+            self.partial_frames += 1
+        self.previous = self.current
+        self.full_redraw = False
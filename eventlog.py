@@ -0,0 +1,106 @@
+import json
+import threading
+import time
+from collections import deque
+from constants import EVENT_LOG_SIZE
+
+DEBUG, INFO, WARNING, ERROR = 10, 20, 30, 40
+LEVEL_NAMES = {DEBUG: "debug", INFO: "info", WARNING: "warning", ERROR: "error"}
+LEVELS = {name: level for level, name in LEVEL_NAMES.items()}
+
+
+class EventLog:
+    """Structured game events, kept in a ring buffer and written as JSON lines.
+
+    log() only appends a tuple of the raw field values; a record below the
+    log level costs one comparison. Records are turned into JSON on a
+    background thread (or by flush()), so the game loop never waits on
+    stdout or disk. When the buffer is full the oldest records are dropped
+    and counted in `dropped`.
+    """
+
+    def __init__(self, level=INFO, capacity=EVENT_LOG_SIZE, flush_interval=0.5):
+        self.level = level
+        self.records = deque(maxlen=capacity)
+        self.dropped = 0
+        self.flush_interval = flush_interval
+        self.file = None
+        self.lock = threading.Lock()  # serializes writes to the file
+        self.stopping = threading.Event()
+        self.thread = None
+
+    def open(self, path):
+        # Start writing records to `path` from a background thread
+        self.close()
+        self.file = open(path, "a")
+        self.stopping.clear()
+        self.thread = threading.Thread(target=self._run, name="event-log", daemon=True)
+        self.thread.start()
+
+    def enabled_for(self, level):
+        return level >= self.level
+
+    def log(self, level, event, **fields):
+        if level < self.level:
+            return
+        records = self.records
+        if len(records) == records.maxlen:
+            self.dropped += 1
+        records.append((time.time(), level, event, fields))
+
+    def debug(self, event, **fields):
+        self.log(DEBUG, event, **fields)
+
+    def info(self, event, **fields):
+        self.log(INFO, event, **fields)
+
+    def warning(self, event, **fields):
+        self.log(WARNING, event, **fields)
+
+    def error(self, event, **fields):
+        self.log(ERROR, event, **fields)
+
+    def recent(self, n=None):
+        # The newest buffered records, oldest first, without consuming them
+        records = list(self.records)
+        return records if n is None else records[-n:]
+
+    def flush(self):
+        # Write out everything buffered so far; without a file it is dropped
+        with self.lock:
+            lines = []
+            records = self.records
+            while records:
+                try:
+                    record = records.popleft()
+                except IndexError:
+                    break
+                if self.file:
+                    lines.append(format_record(record))
+            if lines:
+                self.file.write("\n".join(lines) + "\n")
+                self.file.flush()
+
+    def close(self):
+        if self.thread:
+            self.stopping.set()
+            self.thread.join()
+            self.thread = None
+        if self.file:
+            self.flush()
+            self.file.close()
+            self.file = None
+
+    def _run(self):
+        while not self.stopping.wait(self.flush_interval):
+            self.flush()
+
+
+def format_record(record):
+    timestamp, level, event, fields = record
+    entry = {"t": round(timestamp, 6), "level": LEVEL_NAMES.get(level, level), "event": event}
+    entry.update(fields)
+    return json.dumps(entry, default=str)
+
+
+event_log = EventLog()
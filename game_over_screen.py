@@ -0,0 +1,67 @@
+import pygame
+from textcache import text_cache, get_font
+
+class GameOverScreen:
+    def __init__(self, screen_width, screen_height):
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+
+        self.text_color = (255, 255, 255)  # White
+        self.background = (0, 0, 0)
+
+        self.key = None
+        self.surface = None
+        self.rect = None
+
+    @property
+    def title_font(self):
+        return get_font(74)
+
+    @property
+    def text_font(self):
+        return get_font(36)
+
+    @property
+    def options_font(self):
+        return get_font(50)
+
+    def compose(self, score, high_scores, rank=None):
+        # Re-rendered only when the final score, rank or high-score list changes
+        key = (score, tuple(high_scores), rank)
+        if key == self.key:
+            return self.surface, self.rect
+
+        items = []
+        center_x = self.screen_width / 2
+
+        title_surf = text_cache.render(self.title_font, "Game Over", self.text_color)
+        items.append((title_surf, title_surf.get_rect(center=(center_x, self.screen_height / 3))))
+
+        final_score_text = f"Final Score: {score}" if rank is None else f"Final Score: {score} (#{rank})"
+        final_score_surf = text_cache.render(self.text_font, final_score_text, self.text_color)
+        items.append((final_score_surf, final_score_surf.get_rect(center=(center_x, self.screen_height / 2))))
+
+        # High Scores
+        hs_start_y = self.screen_height / 2 + 40
+        hs_title_surf = text_cache.render(self.text_font, "High Scores:", self.text_color)
+        items.append((hs_title_surf, hs_title_surf.get_rect(center=(center_x, hs_start_y))))
+        for idx, hs in enumerate(high_scores):
+            hs_surf = text_cache.render(self.text_font, f"{idx + 1}. {hs}", self.text_color)
+            items.append((hs_surf, hs_surf.get_rect(center=(center_x, hs_start_y + 30 * (idx + 1)))))
+
+        option_start_y = hs_start_y + 30 * (len(high_scores) + 1)
+        restart_surf = text_cache.render(self.options_font, "R - Restart", self.text_color)
+        items.append((restart_surf, restart_surf.get_rect(center=(center_x, option_start_y))))
+
+        quit_surf = text_cache.render(self.options_font, "Q - Quit", self.text_color)
+        items.append((quit_surf, quit_surf.get_rect(center=(center_x, option_start_y + 60))))
+
+        # Compose onto one surface just large enough to hold every line
+        self.rect = items[0][1].unionall([rect for _, rect in items[1:]])
+        self.surface = pygame.Surface(self.rect.size)
+        self.surface.fill(self.background)
+        for surf, rect in items:
+            self.surface.blit(surf, rect.move(-self.rect.x, -self.rect.y))
+
+        self.key = key
+        return self.surface, self.rect
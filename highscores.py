@@ -0,0 +1,16 @@
+import json
+import os
+
+# Scores list written by versions before the SQLite leaderboard; only read
+# once, by Leaderboard.import_json
+SCORES_FILE = "scores.json"
+
+
+def load_high_scores(path=SCORES_FILE):
+    if os.path.exists(path):
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            return []
+    return []
@@ -0,0 +1,143 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import NamedTuple
+from highscores import SCORES_FILE, load_high_scores
+
+LEADERBOARD_FILE = "leaderboard.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    finished_at REAL NOT NULL,
+    duration REAL NOT NULL,
+    powerups INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS runs_by_score ON runs (score DESC);
+CREATE INDEX IF NOT EXISTS runs_by_player ON runs (player, score DESC);
+
+-- Number of runs per distinct score, kept by trigger so rank queries sum
+-- over distinct scores instead of counting rows
+CREATE TABLE IF NOT EXISTS score_counts (
+    score INTEGER PRIMARY KEY,
+    runs INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS runs_count AFTER INSERT ON runs BEGIN
+    INSERT INTO score_counts (score, runs) VALUES (NEW.score, 1)
+    ON CONFLICT (score) DO UPDATE SET runs = runs + 1;
+END;
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class Run(NamedTuple):
+    player: str
+    score: int
+    finished_at: float
+    duration: float
+    powerups: int
+
+
+class Leaderboard:
+    """Every finished run in an indexed SQLite database.
+
+    Each thread gets its own connection, so the game can record runs on a
+    worker thread while other threads query.
+    """
+
+    def __init__(self, path=LEADERBOARD_FILE):
+        self.path = path
+        self.local = threading.local()
+        with self.connection() as db:
+            db.executescript(SCHEMA)
+
+    def connection(self):
+        db = getattr(self.local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA busy_timeout=5000")  # other game instances may be writing
+            self.local.db = db
+        return db
+
+    def close(self):
+        db = getattr(self.local, "db", None)
+        if db is not None:
+            db.close()
+            self.local.db = None
+
+    def record(self, player, score, duration, powerups=0, finished_at=None):
+        if finished_at is None:
+            finished_at = time.time()
+        with self.connection() as db:
+            cursor = db.execute(
+                "INSERT INTO runs (player, score, finished_at, duration, powerups) VALUES (?, ?, ?, ?, ?)",
+                (player, score, finished_at, duration, powerups),
+            )
+        return cursor.lastrowid
+
+    def record_many(self, runs):
+        with self.connection() as db:
+            db.executemany(
+                "INSERT INTO runs (player, score, finished_at, duration, powerups) VALUES (?, ?, ?, ?, ?)",
+                runs,
+            )
+
+    def top(self, k=5):
+        rows = self.connection().execute(
+            "SELECT player, score, finished_at, duration, powerups FROM runs"
+            " ORDER BY score DESC LIMIT ?",
+            (k,),
+        )
+        return [Run(*row) for row in rows]
+
+    def player_best(self, player):
+        row = self.connection().execute(
+            "SELECT player, score, finished_at, duration, powerups FROM runs"
+            " WHERE player = ? ORDER BY score DESC LIMIT 1",
+            (player,),
+        ).fetchone()
+        return Run(*row) if row else None
+
+    def rank_of(self, score):
+        # 1-based position a run with this score holds (ties share a rank)
+        (better,) = self.connection().execute(
+            "SELECT COALESCE(SUM(runs), 0) FROM score_counts WHERE score > ?", (score,)
+        ).fetchone()
+        return better + 1
+
+    def count(self):
+        (total,) = self.connection().execute("SELECT COALESCE(SUM(runs), 0) FROM score_counts").fetchone()
+        return total
+
+    def import_json(self, path=SCORES_FILE, player="legacy"):
+        # One-time import of a scores.json list; returns the number of runs added
+        key = f"imported:{os.path.abspath(path)}"
+        db = self.connection()
+        if db.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone():
+            return 0
+        if not os.path.exists(path):
+            return 0
+        try:
+            scores = [int(score) for score in load_high_scores(path)]
+        except (TypeError, ValueError):
+            scores = []
+        with db:
+            db.executemany(
+                "INSERT INTO runs (player, score, finished_at, duration, powerups) VALUES (?, ?, ?, 0, 0)",
+                [(player, score, os.path.getmtime(path)) for score in scores],
+            )
+            db.execute("INSERT INTO meta (key, value) VALUES (?, ?)", (key, str(len(scores))))
+        return len(scores)
+
+    def finish_run(self, player, score, duration, powerups, k=5):
+        # Record a run and return (top k, rank of the run), for the game-over screen
+        self.record(player, score, duration, powerups)
+        return self.top(k), self.rank_of(score)
@@ -1,97 +1,340 @@
+import time
+STARTED = time.perf_counter() # Taken before the heavy imports, for the startup report
 import pygame
-from constants import SCREEN_WIDTH, SCREEN_HEIGHT
-from player import Player
-from asteroid import Asteroid
-from asteroidfield import AsteroidField
-from shot import Shot
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, MAX_CATCHUP_STEPS, REWIND_INTERVAL, SIM_RATE, PARTICLE_BUDGET
+from profiler import FrameProfiler, StartupTimer, EVENTS, DRAW, PRESENT
+from eventlog import event_log, LEVELS
 import sys
-import random # For power-up spawning chance
-from pause_menu import PauseMenu
-from powerup import (
-    RapidFirePowerUp,
-    ShieldPowerUp,
-    SpreadShotPowerUp,
-    PowerUp,
-)
-import json
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import atexit
+import importlib.util
 import os
-
-SCORES_FILE = "scores.json"
-
-
-def load_high_scores():
-    if os.path.exists(SCORES_FILE):
-        try:
-            with open(SCORES_FILE, "r") as f:
-                return json.load(f)
-        except json.JSONDecodeError:
-            return []
-    return []
-
-
-def save_high_scores(scores):
-    with open(SCORES_FILE, "w") as f:
-        json.dump(scores, f)
-
-
-def update_high_scores(scores, new_score, limit=5):
-    scores.append(new_score)
-    scores = sorted(scores, reverse=True)[:limit]
-    save_high_scores(scores)
-    return scores
-
-
-def main():
+import random
+
+
+def render_scale(value):
+    # --render-scale: "auto" or a fraction of the window size
+    if value == "auto":
+        return value
+    scale = float(value)
+    if not 0 < scale <= 1:
+        raise argparse.ArgumentTypeError("must be 'auto' or a number in (0, 1]")
+    return scale
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Asteroids")
+    parser.add_argument(
+        "--array-physics",
+        action="store_true",
+        help="integrate asteroids and shots with the vectorized NumPy backend",
+    )
+    parser.add_argument(
+        "--sim-rate",
+        type=float,
+        default=None,
+        help="run the simulation at a fixed rate (steps per second) and interpolate rendering",
+    )
+    parser.add_argument(
+        "--max-catchup",
+        type=int,
+        default=MAX_CATCHUP_STEPS,
+        help="most fixed simulation steps run per rendered frame",
+    )
+    parser.add_argument(
+        "--ccd",
+        action="store_true",
+        help="sweep shots along their path so they can't skip past asteroids at low --sim-rate",
+    )
+    parser.add_argument(
+        "--threaded",
+        action="store_true",
+        help="run the simulation on its own thread at --sim-rate and draw its latest published frame",
+    )
+    parser.add_argument(
+        "--dirty-rects",
+        action="store_true",
+        help="redraw and present only the changed parts of the screen",
+    )
+    parser.add_argument(
+        "--render-scale",
+        type=render_scale,
+        default=1.0,
+        metavar="SCALE",
+        help="draw the playfield at this fraction of the window size and scale it up, "
+        "or 'auto' to adjust it to the frame rate",
+    )
+    parser.add_argument(
+        "--particles",
+        type=int,
+        default=PARTICLE_BUDGET,
+        metavar="N",
+        help="most debris and exhaust particles alive at once; 0 turns them off (they need numpy)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="start with the frame profiler overlay on (toggle with F3, export with F4)",
+    )
+    parser.add_argument(
+        "--name",
+        default=os.environ.get("USER", "player"),
+        help="player name for the leaderboard",
+    )
+    parser.add_argument("--seed", type=int, default=None, help="seed for all game randomness")
+    parser.add_argument(
+        "--record",
+        metavar="PATH",
+        default=None,
+        help="record the seed and every step's inputs to PATH (play back with replay.py)",
+    )
+    parser.add_argument("--fps", type=int, default=60, help="display frame rate cap")
+    parser.add_argument(
+        "--log",
+        metavar="PATH",
+        default=None,
+        help="append game events to PATH as JSON lines",
+    )
+    parser.add_argument("--log-level", choices=list(LEVELS), default="info")
+    parser.add_argument(
+        "--startup-report",
+        action="store_true",
+        help="print how long each startup phase took, up to the first presented frame",
+    )
+    parser.add_argument("--quit-after", type=int, metavar="N", default=None, help="quit after N frames")
+    args = parser.parse_args(argv)
+    if args.dirty_rects and args.render_scale != 1.0:
+        parser.error("--dirty-rects can't be combined with --render-scale")
+    return args
+
+
+def main(argv=None):
+    startup = StartupTimer(STARTED)
+    startup.mark("imports")
+    args = parse_args(argv)
     print("Starting asteroids!")
     print(f"Screen width: {SCREEN_WIDTH}")
     print(f"Screen height: {SCREEN_HEIGHT}")
 
     # Initilize the "control pobjects"
-    pygame.init()
+    # Only the modules the game uses; pygame.init() would also start audio and joysticks
+    pygame.display.init()
+    pygame.font.init()
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    startup.mark("display")
+    # The entity modules and menus load once the window is up; their import
+    # time counts towards the "world" phase
+    from circleshape import CircleShape
+    from player import PlayerInput
+    from timestep import FixedTimestep
+    from spritecache import draw_sprites, sprite_blits
+    from world import World
+    from snapshot import RewindBuffer, capture, restore
+    from pause_menu import PauseMenu
+    from game_over_screen import GameOverScreen
+    from textcache import text_cache, get_font
+
+    renderer = None
+    if args.dirty_rects:
+        from dirtyrects import DirtyRectRenderer
+
+        renderer = DirtyRectRenderer(screen)
+    # The playfield goes through `scaler` when it's drawn below window resolution
+    scaler = controller = None
+    if args.render_scale != 1.0:
+        from renderscale import ScaledRenderer, ResolutionController
+
+        if args.render_scale == "auto":
+            controller = ResolutionController(1 / args.fps)
+        scaler = ScaledRenderer(screen, controller.scale if controller else args.render_scale)
+    # Everything drawn goes through `blit` so the dirty-rect renderer sees it
+    blit = renderer.blit if renderer else screen.blit
+
+    stepper = None
+    if args.sim_rate and not args.threaded:
+        stepper = FixedTimestep(args.sim_rate, args.max_catchup)
+    seed = args.seed if args.seed is not None else random.randrange(2**63)
+    particles = args.particles
+    if particles and importlib.util.find_spec("numpy") is None:
+        particles = 0 # Play without effects rather than fail
+    world = World(
+        array_physics=args.array_physics,
+        interpolate=stepper is not None,
+        seed=seed,
+        continuous_collision=args.ccd,
+        particles=particles,
+    )
+    event_log.level = LEVELS[args.log_level]
+    if args.log:
+        event_log.open(args.log)
+        atexit.register(event_log.close) # Write out what is still buffered
+
+    recorder = None
+    if args.record:
+        from replay import ReplayRecorder
+
+        recorder = ReplayRecorder.open(args.record, seed, args.array_physics, args.ccd)
+        atexit.register(recorder.close) # The game exits through sys.exit()
+
+    # Snapshots for rewinding (Backspace) and the quick-save slot (F5/F9).
+    # A recording can't follow a jump back in time, so both are off while recording.
+    rewind = RewindBuffer()
+    rewind_step = max(1, round((args.sim_rate or args.fps) / REWIND_INTERVAL)) # About a second
+    quick_save = None
+    steps = 0
+
+    def step(dt, inputs):
+        nonlocal steps
+        if recorder:
+            dt = recorder.record(dt, inputs)
+        world.step(dt, inputs)
+        steps += 1
+        if not recorder and steps % REWIND_INTERVAL == 0:
+            rewind.push(world)
+
+    def jumped_back():
+        # Don't make up for the frame time that passed before the jump
+        if sim:
+            sim.resync()
+        if stepper:
+            stepper.reset()
+
+    def save():
+        nonlocal quick_save
+        quick_save = capture(world)
+
+    def load():
+        restore(world, quick_save)
+        jumped_back()
+
+    def rewind_back():
+        if len(rewind):
+            rewind.rewind(world, min(len(rewind), rewind_step))
+            jumped_back()
+
+    def restart():
+        world.reset()
+        rewind.clear()
+        if recorder:
+            recorder.mark_reset()
+        jumped_back()
+
+    # With --threaded the world belongs to the simulation thread: this loop
+    # only sets its inputs, draws its published frames and hands it anything
+    # else that changes the world through on_sim()
+    sim = None
+    render_timing = None
+    if args.threaded:
+        from pipeline import SimulationThread, ThreadTiming, timing_report
+
+        sim = SimulationThread(world, step, args.sim_rate or SIM_RATE, args.max_catchup)
+        render_timing = ThreadTiming("render")
+
+        def report_threads():
+            sim.stop()
+            report = timing_report(sim.timing, render_timing)
+            event_log.info("threads", report=report, dropped_steps=sim.dropped_steps)
+            print(report)
+
+        atexit.register(report_threads)
+
+    def on_sim(fn):
+        if sim:
+            sim.call(fn)
+        else:
+            fn()
+
+    def state():
+        # Score, lives and game-over flag as last drawn: the World, or its latest Frame
+        return sim.frames.latest() if sim else world
+
+    def quit_game():
+        if sim:
+            sim.stop() # Before pygame goes away under it
+        pygame.quit()
+        sys.exit()
 
-    updatable = pygame.sprite.Group()
-    drawable = pygame.sprite.Group()
-    asteroids = pygame.sprite.Group()
-    shots = pygame.sprite.Group()
-    powerups_group = pygame.sprite.Group() # Power-ups group
-
-    Player.containers = (updatable, drawable)
-    Asteroid.containers = (asteroids, updatable, drawable)
-    AsteroidField.containers = updatable # AsteroidField itself is updatable
-    Shot.containers = (shots, updatable, drawable)
-    PowerUp.containers = (powerups_group, updatable, drawable) # Assign containers for PowerUp
-
-    player = Player(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
-    asteroid_field = AsteroidField() # Creates initial asteroids which get added to groups
     pause_menu = PauseMenu(SCREEN_WIDTH, SCREEN_HEIGHT)
+    game_over_screen = GameOverScreen(SCREEN_WIDTH, SCREEN_HEIGHT)
     resume_rect = None
     quit_rect = None
 
-    high_scores = load_high_scores()
+    profiler = FrameProfiler(enabled=args.profile)
+    if not sim: # Its sections are marked from this thread only
+        world.profiler = profiler
+
+    # Leaderboard writes and queries run off the frame loop. The database is
+    # opened on the worker when the first game ends, not at startup.
+    leaderboard = None
+    leaderboard_jobs = ThreadPoolExecutor(max_workers=1, thread_name_prefix="leaderboard")
+    atexit.register(leaderboard_jobs.shutdown) # Let the last write finish on quit
+    finished_run = None
+    high_scores = []
+    rank = None
 
-    score = 0
-    lives = 3
-    score_font = pygame.font.Font(None, 36)
-    game_over_font = pygame.font.Font(None, 74)
-    options_font = pygame.font.Font(None, 50)
+    def finish_run(*run):
+        nonlocal leaderboard
+        if leaderboard is None:
+            from leaderboard import Leaderboard
 
-    game_state = "PLAYING"
+            leaderboard = Leaderboard()
+            leaderboard.import_json() # Carries over an old scores.json the first time
+        return leaderboard.finish_run(*run)
+
+    startup.mark("world")
+    frames = 0
 
     # Initilize the clock and delta time (for proper rendering)
     clock = pygame.time.Clock()
     dt = 0
     paused = False
+    was_game_over = False
+    restart_queued = False
+    if sim:
+        sim.start()
 
     # Main game loop
     while True:
+        profiler.begin_frame()
+        frame_started = time.perf_counter()
+        if render_timing:
+            render_timing.begin()
+        shown = state()
+        if shown.game_over and not was_game_over:
+            finished_run = leaderboard_jobs.submit(
+                finish_run,
+                args.name,
+                shown.score,
+                shown.elapsed,
+                shown.powerups_collected,
+            )
+            high_scores, rank = [], None
+        was_game_over = shown.game_over
+        if not shown.game_over:
+            restart_queued = False
+
         # Event handling
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-
-            if game_state == "PLAYING":
+                quit_game()
+
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F3:
+                    profiler.toggle()
+                elif event.key == pygame.K_F4:
+                    profiler.export_csv("profile.csv")
+                    profiler.export_chrome_trace("profile_trace.json")
+                    print("Wrote profile.csv and profile_trace.json")
+
+            if not shown.game_over:
+                if event.type == pygame.KEYDOWN and not recorder:
+                    if event.key == pygame.K_F5:
+                        on_sim(save)
+                    elif event.key == pygame.K_F9 and quick_save:
+                        on_sim(load)
+                    elif event.key == pygame.K_BACKSPACE:
+                        on_sim(rewind_back)
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
                         paused = not paused
@@ -102,8 +345,7 @@ def main():
                             paused = False
                             resume_rect, quit_rect = None, None
                         elif event.key == pygame.K_q:
-                            pygame.quit()
-                            sys.exit()
+                            quit_game()
                 if paused and event.type == pygame.MOUSEBUTTONDOWN:
                     if event.button == 1: # Left mouse button
                         mouse_pos = pygame.mouse.get_pos()
@@ -111,131 +353,114 @@ def main():
                             paused = False
                             resume_rect, quit_rect = None, None
                         elif quit_rect and quit_rect.collidepoint(mouse_pos):
-                            pygame.quit()
-                            sys.exit()
-            
-            elif game_state == "GAME_OVER":
+                            quit_game()
+
+            else:
                 if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_r:
-                        # Reset game
-                        score = 0
-                        lives = 3
-                        player.kill()
-                        for a in asteroids: a.kill()
-                        for s in shots: s.kill()
-                        for p in powerups_group: p.kill() # Clear existing power-ups
-
-                        player = Player(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2) # Re-creates and adds to groups
-                        asteroid_field.kill()  # Remove old asteroid field before creating a new one
-                        asteroid_field = AsteroidField() # Re-creates and adds asteroids to groups
-                        
+                    if event.key == pygame.K_r and not restart_queued:
+                        # The shown frame stays game-over until the restart has run
+                        # on the simulation thread; further presses are ignored
+                        restart_queued = True
+                        on_sim(restart)
                         paused = False
-                        game_state = "PLAYING"
                     elif event.key == pygame.K_q:
-                        pygame.quit()
-                        sys.exit()
+                        quit_game()
 
-        # Game logic and rendering
-        screen.fill("#000000") # Fill background once
+        profiler.mark(EVENTS)
 
-        if game_state == "PLAYING":
+        # Game logic and rendering
+        if renderer:
+            renderer.begin() # Erase only what was drawn last frame
+        elif scaler:
+            scaler.begin()
+        else:
+            screen.fill("#000000") # Fill background once
+
+        if not shown.game_over:
+            if sim:
+                sim.paused = paused
             if not paused:
-                player_respawned = False
-                for asteroid in asteroids:
-                    if asteroid.check_collision(player):
-                      if player.shield_active:
-                            asteroid.split()
-                            player.shield_active = False
-                            player.powerup_timer = 0
-                            player.active_powerup_type = None
-                            player.active_powerup_color = None
-                      else:
-                        player.kill()
-                        lives -= 1
-                        if lives > 0:
-                            player = Player(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
-                            player_respawned = True
-                        else:
-                            game_state = "GAME_OVER"
-                            high_scores = update_high_scores(high_scores, score)
-                        break
-                if game_state == "GAME_OVER" or player_respawned:
-                    continue
-
-                for shot in shots: # This loop should not run if game_state became GAME_OVER
-                    for asteroid in asteroids: # Need to iterate asteroids again for shot collision
-                        if asteroid.check_collision(shot):
-                            shot.kill()
-                            asteroid.split()
-                            score += 10
-                            # Spawn power-up chance
-                            if random.random() < 0.2:  # 20% chance
-                                powerup_cls = random.choice([
-                                    RapidFirePowerUp,
-                                    ShieldPowerUp,
-                                    SpreadShotPowerUp,
-                                ])
-                                powerup_cls(asteroid.position.x, asteroid.position.y)
-                                print(
-                                    f"Spawned {powerup_cls.__name__} at ({asteroid.position.x}, {asteroid.position.y})"
-                                )
-                            break # Assume one shot hits one asteroid part
-                
-                # Player-powerup collision
-                collected_powerups = pygame.sprite.spritecollide(player, powerups_group, True, pygame.sprite.collide_circle)
-                for powerup_obj in collected_powerups:
-                    powerup_obj.apply_effect(player)
-                    print(f"Collected {powerup_obj.powerup_type} power-up! Player cooldown multiplier: {player.shoot_cooldown_multiplier}, Timer: {player.powerup_timer}")
-
-                for sprite in updatable:
-                    sprite.update(dt)
-            
-            # Drawing is done for all sprites in drawable group, including powerups if added
-            for sprite in drawable:
-                sprite.draw(screen) # Player, Asteroids, Shots, PowerUps use their own draw if defined, or rely on self.image
-
-            score_text_surface = score_font.render(f"Score: {score}", True, (255, 255, 255))
-            lives_text_surface = score_font.render(f"Lives: {lives}", True, (255, 255, 255))
-            screen.blit(score_text_surface, (10, 10))
-            screen.blit(lives_text_surface, (10, 40))
+                inputs = PlayerInput.from_keys(pygame.key.get_pressed())
+                if sim:
+                    sim.inputs = inputs
+                elif stepper:
+                    for _ in range(stepper.advance(dt)):
+                        step(stepper.step_dt, inputs)
+                    CircleShape.render_alpha = stepper.alpha
+                else:
+                    step(dt, inputs)
+
+            # All sprites in the drawable group go out in one batched blits() call
+            if scaler:
+                scaler.draw_blits(shown.blits if sim else sprite_blits(world.drawable))
+                scaler.present()
+            elif sim:
+                # Already batched on the simulation thread
+                if renderer:
+                    renderer.draw_blits(shown.blits)
+                else:
+                    screen.blits(shown.blits, False)
+            elif renderer:
+                renderer.draw_sprites(world.drawable)
+            else:
+                draw_sprites(screen, world.drawable)
+
+            score_text_surface = text_cache.render(get_font(36), f"Score: {shown.score}")
+            lives_text_surface = text_cache.render(get_font(36), f"Lives: {shown.lives}")
+            blit(score_text_surface, (10, 10))
+            blit(lives_text_surface, (10, 40))
 
             if paused:
-                overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-                overlay.fill((0, 0, 0, 128))
-                screen.blit(overlay, (0, 0))
-                resume_rect, quit_rect = pause_menu.draw(screen)
-
-        elif game_state == "GAME_OVER":
-            # Game Over Screen
-            title_surf = game_over_font.render("Game Over", True, (255, 255, 255))
-            title_rect = title_surf.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 3))
-            screen.blit(title_surf, title_rect)
-
-            final_score_surf = score_font.render(f"Final Score: {score}", True, (255, 255, 255))
-            final_score_rect = final_score_surf.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2))
-            screen.blit(final_score_surf, final_score_rect)
-
-            # High Scores
-            hs_start_y = SCREEN_HEIGHT / 2 + 40
-            hs_title_surf = score_font.render("High Scores:", True, (255, 255, 255))
-            hs_title_rect = hs_title_surf.get_rect(center=(SCREEN_WIDTH / 2, hs_start_y))
-            screen.blit(hs_title_surf, hs_title_rect)
-            for idx, hs in enumerate(high_scores):
-                hs_surf = score_font.render(f"{idx + 1}. {hs}", True, (255, 255, 255))
-                hs_rect = hs_surf.get_rect(center=(SCREEN_WIDTH / 2, hs_start_y + 30 * (idx + 1)))
-                screen.blit(hs_surf, hs_rect)
-
-            option_start_y = hs_start_y + 30 * (len(high_scores) + 1)
-            restart_surf = options_font.render("R - Restart", True, (255, 255, 255))
-            restart_rect = restart_surf.get_rect(center=(SCREEN_WIDTH / 2, option_start_y))
-            screen.blit(restart_surf, restart_rect)
-
-            quit_surf = options_font.render("Q - Quit", True, (255, 255, 255))
-            quit_rect_go = quit_surf.get_rect(center=(SCREEN_WIDTH / 2, option_start_y + 60))
-            screen.blit(quit_surf, quit_rect_go)
-
-        pygame.display.flip()
-        dt = clock.tick(60) / 1000
+                # Overlay and menu text come pre-composed in one surface
+                blit(pause_menu.compose(), (0, 0))
+                resume_rect, quit_rect = pause_menu.resume_rect, pause_menu.quit_rect
+
+        else:
+            # Game Over Screen, composed once per final score
+            if scaler:
+                scaler.present()
+            if finished_run and finished_run.done():
+                if finished_run.exception():
+                    print(f"Could not update the leaderboard: {finished_run.exception()}")
+                else:
+                    top_runs, rank = finished_run.result()
+                    high_scores = [f"{run.score}  {run.player}" for run in top_runs]
+                finished_run = None
+            game_over_surf, game_over_rect = game_over_screen.compose(shown.score, high_scores, rank)
+            blit(game_over_surf, game_over_rect)
+
+        if profiler.enabled:
+            profiler.draw_overlay(blit, get_font(24))
+        profiler.mark(DRAW)
+
+        if renderer:
+            renderer.present()
+        else:
+            pygame.display.flip()
+        profiler.mark(PRESENT)
+        frames += 1
+        if frames == 1:
+            startup.mark("first_frame")
+            event_log.info("startup", **startup.milliseconds())
+            if args.startup_report:
+                print(startup.report())
+        if frames == args.quit_after:
+            quit_game()
+        if profiler.enabled:
+            profiler.end_frame(
+                asteroids=len(world.asteroids),
+                shots=len(world.shots),
+                powerups=len(world.powerups_group),
+                drawable=len(world.drawable),
+                **world.limit_counts,
+                **({"render_scale": scaler.scale} if scaler else {}),
+                **({"particles": world.particles.count} if world.particles else {}),
+            )
+        if controller:
+            scaler.set_scale(controller.update(time.perf_counter() - frame_started))
+        if render_timing:
+            render_timing.end()
+        dt = clock.tick(args.fps) / 1000
 
 
 if __name__ == "__main__":
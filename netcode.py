@@ -0,0 +1,249 @@
+"""Wire format and snapshot delta compression for networked play.
+
+All messages are single UDP datagrams, little-endian, starting with a
+message type byte.
+
+    client -> server
+        HELLO   type
+        INPUT   type, input sequence (u32), last snapshot tick received (u32), input bits (u8)
+        BYE     type
+    server -> client
+        WELCOME type, player id (u8), simulation rate (u16)
+        SNAPSHOT type, tick (u32), base tick (u32), score (u32), lives (u8),
+                 record count (u16), removal count (u16), records, removed ids (u16 each)
+
+Entities are sent as dead-reckoning records: a quantized position and
+velocity plus the tick they were taken at. The receiver extrapolates along
+the velocity, so an asteroid or shot is only resent when it appears, wraps
+or otherwise drifts from its predicted path. Each snapshot is a delta
+against the newest snapshot the client acknowledged (base tick 0 means a
+full snapshot), so bandwidth follows the rate of change on the field rather
+than the number of entities on it.
+"""
+import random
+import struct
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+
+HELLO, INPUT, BYE = 1, 2, 3
+WELCOME, SNAPSHOT = 16, 17
+
+ASTEROID, SHOT, SHIP, RAPID_FIRE, SHIELD, SPREAD_SHOT = range(6)
+POWERUP_KINDS = {"rapid_fire": RAPID_FIRE, "shield": SHIELD, "spread_shot": SPREAD_SHOT}
+
+MESSAGE_TYPE = struct.Struct("<B")
+INPUT_MESSAGE = struct.Struct("<BIIB")
+WELCOME_MESSAGE = struct.Struct("<BBH")
+SNAPSHOT_HEADER = struct.Struct("<BIIIBHH")
+# net id, kind, extra (ship: owner id), x, y, vx, vy, radius, rotation, tick
+RECORD = struct.Struct("<HBBHHhhBBI")
+REMOVED = struct.Struct("<H")
+
+POSITION_SCALE = 4  # quarter-pixel positions
+POSITION_OFFSET = 64  # room for entities just off the top/left edge
+VELOCITY_SCALE = 8  # 1/8 px/s velocities
+ROTATION_STEPS = 256
+DRIFT_TOLERANCE = 2.0  # pixels an entity may stray from its last record
+MAX_SNAPSHOT_RECORDS = 60
+# Bytes of records and removals per snapshot; with the header, inside a typical 1200-byte MTU
+SNAPSHOT_PAYLOAD = MAX_SNAPSHOT_RECORDS * RECORD.size
+
+
+def quantize_position(value):
+    return min(65535, max(0, round((value + POSITION_OFFSET) * POSITION_SCALE)))
+
+
+def dequantize_position(value):
+    return value / POSITION_SCALE - POSITION_OFFSET
+
+
+def quantize_velocity(value):
+    return min(32767, max(-32768, round(value * VELOCITY_SCALE)))
+
+
+def quantize_rotation(degrees):
+    return round(degrees % 360 * ROTATION_STEPS / 360) % ROTATION_STEPS
+
+
+def extrapolate(record, tick, rate):
+    # Position of a record's entity at `tick`, wrapped like the simulation does
+    _, _, _, qx, qy, qvx, qvy, _, _, base = record
+    elapsed = (tick - base) / rate
+    x = dequantize_position(qx) + qvx / VELOCITY_SCALE * elapsed
+    y = dequantize_position(qy) + qvy / VELOCITY_SCALE * elapsed
+    if qvx or qvy:
+        x %= SCREEN_WIDTH
+        y %= SCREEN_HEIGHT
+    return x, y
+
+
+def pack_snapshot(tick, base_tick, score, lives, records, removed):
+    parts = [SNAPSHOT_HEADER.pack(SNAPSHOT, tick, base_tick, score, lives, len(records), len(removed))]
+    parts.extend(RECORD.pack(*record) for record in records)
+    parts.extend(REMOVED.pack(net_id) for net_id in removed)
+    return b"".join(parts)
+
+
+def unpack_snapshot(data):
+    # (tick, base tick, score, lives, [records], [removed ids])
+    _, tick, base_tick, score, lives, n_records, n_removed = SNAPSHOT_HEADER.unpack_from(data)
+    offset = SNAPSHOT_HEADER.size
+    records = list(RECORD.iter_unpack(data[offset : offset + RECORD.size * n_records]))
+    offset += RECORD.size * n_records
+    removed = [net_id for (net_id,) in REMOVED.iter_unpack(data[offset : offset + REMOVED.size * n_removed])]
+    return tick, base_tick, score, lives, records, removed
+
+
+def diff(view, current, budget=SNAPSHOT_PAYLOAD, sent=None):
+    # Records and removals that bring `view` (net id -> record, what the
+    # client holds) towards `current`. Together they fit in `budget` bytes,
+    # so a snapshot stays inside the MTU; the rest stay different and go
+    # out with a later snapshot. `sent` is the view the client will hold
+    # once every snapshot in flight arrives: changes it lacks go first, so
+    # resends of unacknowledged ones can't keep the same entities at the
+    # front while the others wait.
+    removed, removed_resends = [], []
+    for net_id in view:
+        if net_id not in current:
+            if sent is not None and net_id not in sent:
+                removed_resends.append(net_id)
+            else:
+                removed.append(net_id)
+    records, resends = [], []
+    for net_id, record in current.items():
+        if view.get(net_id) != record:
+            if sent is not None and sent.get(net_id) == record:
+                resends.append(record)
+            else:
+                records.append(record)
+
+    removed = removed[: budget // REMOVED.size]
+    budget -= len(removed) * REMOVED.size
+    records = records[: budget // RECORD.size]
+    budget -= len(records) * RECORD.size
+    removed_resends = removed_resends[: budget // REMOVED.size]
+    budget -= len(removed_resends) * REMOVED.size
+    records += resends[: budget // RECORD.size]
+    return records, removed + removed_resends
+
+
+def apply(view, records, removed):
+    # The view a client holds after receiving a delta against `view`
+    view = dict(view)
+    for record in records:
+        view[record[0]] = record
+    for net_id in removed:
+        view.pop(net_id, None)
+    return view
+
+
+def make_record(net_id, kind, extra, sprite, rotation, tick):
+    position, velocity = sprite.position, sprite.velocity
+    return (
+        net_id,
+        kind,
+        extra,
+        quantize_position(position.x),
+        quantize_position(position.y),
+        quantize_velocity(velocity.x),
+        quantize_velocity(velocity.y),
+        min(255, round(sprite.radius)),
+        rotation,
+        tick,
+    )
+
+
+def still_predicts(record, kind, extra, sprite, rotation, tick, rate):
+    # True while `record` extrapolates to within DRIFT_TOLERANCE of the entity
+    _, r_kind, r_extra, _, _, qvx, qvy, radius, r_rotation, _ = record
+    velocity = sprite.velocity
+    if (
+        r_kind != kind
+        or r_extra != extra
+        or r_rotation != rotation
+        or radius != min(255, round(sprite.radius))
+        or qvx != quantize_velocity(velocity.x)
+        or qvy != quantize_velocity(velocity.y)
+    ):
+        return False
+    x, y = extrapolate(record, tick, rate)
+    dx = (sprite.position.x - x + SCREEN_WIDTH / 2) % SCREEN_WIDTH - SCREEN_WIDTH / 2
+    dy = (sprite.position.y - y + SCREEN_HEIGHT / 2) % SCREEN_HEIGHT - SCREEN_HEIGHT / 2
+    return dx * dx + dy * dy <= DRIFT_TOLERANCE * DRIFT_TOLERANCE
+
+
+class EntityRecords:
+    """The server's current record of every entity, by 16-bit net id.
+
+    update() keeps an entity's previous record while it still predicts the
+    entity, so unchanged records compare equal across snapshots and drop
+    out of the deltas. Net ids of entities that left the field are reused.
+    """
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.ids = {}  # sprite -> net id
+        self.records = {}  # net id -> record
+        self.free_ids = []
+        self.next_id = 1
+
+    def allocate(self):
+        if self.free_ids:
+            return self.free_ids.pop()
+        if self.next_id > 65535:
+            raise RuntimeError("More than 65535 networked entities")
+        self.next_id += 1
+        return self.next_id - 1
+
+    def update(self, entities, tick):
+        # `entities` yields (sprite, kind, extra, rotation)
+        ids, previous = self.ids, self.records
+        seen = {}
+        records = {}
+        for sprite, kind, extra, rotation in entities:
+            net_id = ids.get(sprite)
+            if net_id is None:
+                net_id = self.allocate()
+            seen[sprite] = net_id
+            record = previous.get(net_id)
+            if record is None or not still_predicts(record, kind, extra, sprite, rotation, tick, self.rate):
+                record = make_record(net_id, kind, extra, sprite, rotation, tick)
+            records[net_id] = record
+        for sprite, net_id in ids.items():
+            if sprite not in seen:
+                self.free_ids.append(net_id)
+        self.ids = seen
+        self.records = records
+        return records
+
+
+class NetworkConditions:
+    """Simulated packet loss and latency for sendto() on a datagram transport.
+
+    Each packet is dropped with probability `loss`, otherwise delivered
+    after `latency` seconds plus up to `jitter` more (so packets can also
+    arrive out of order). With the defaults packets go out immediately.
+    """
+
+    def __init__(self, loss=0.0, latency=0.0, jitter=0.0, rng=None):
+        self.loss = loss
+        self.latency = latency
+        self.jitter = jitter
+        self.rng = rng or random.Random()
+        self.sent = 0
+        self.dropped = 0
+
+    def sendto(self, loop, transport, data, addr=None):
+        self.sent += 1
+        if self.loss and self.rng.random() < self.loss:
+            self.dropped += 1
+            return
+        delay = self.latency + (self.rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay <= 0:
+            transport.sendto(data, addr)
+        else:
+            loop.call_later(delay, _send_if_open, transport, data, addr)
+
+
+def _send_if_open(transport, data, addr):
+    if not transport.is_closing():
+        transport.sendto(data, addr)
@@ -0,0 +1,140 @@
+import math
+import pygame
+from constants import (
+    PARTICLE_BUDGET,
+    PARTICLES_PER_RADIUS,
+    THRUST_PARTICLE_RATE,
+    PARTICLE_DRAG,
+    SCREEN_WIDTH,
+    SCREEN_HEIGHT,
+)
+from spritecache import atlas
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency, only needed for particle effects
+    np = None
+
+DEBRIS, THRUST = 0, 1
+# Colours each kind fades through over its life, brightest first
+FADES = (
+    ((255, 255, 255), (190, 190, 190), (130, 130, 130), (70, 70, 70)),
+    ((255, 230, 120), (255, 160, 40), (220, 80, 20), (120, 30, 10)),
+)
+PARTICLE_RADIUS = 1.5
+
+
+class ParticleSystem(pygame.sprite.Sprite):
+    """Explosion debris and engine exhaust, in preallocated NumPy arrays.
+
+    The whole system is a single sprite in `updatable` and `drawable`:
+    update() ages, moves and wraps every particle in one vectorized pass
+    and compacts out the dead ones, and blits() hands all live particles to
+    the one batched Surface.blits() call of the frame. Live particles
+    occupy the first `count` rows, up to `budget`.
+
+    Emitters ask for a number of particles and get fewer the fuller the
+    system is, in proportion to the free room, so a busy field thins its
+    effects out instead of cutting them off. Particles are cosmetic: they
+    draw from their own random generator and never touch the World's.
+    """
+
+    def __init__(self, budget=PARTICLE_BUDGET, seed=None):
+        if np is None:
+            raise RuntimeError("Particle effects require numpy")
+        super().__init__()
+        self.budget = budget
+        self.pos = np.zeros((budget, 2))
+        self.vel = np.zeros((budget, 2))
+        self.age = np.zeros(budget)
+        self.life = np.ones(budget)
+        self.kind = np.zeros(budget, dtype=np.intp)
+        self.count = 0
+        self.rng = np.random.default_rng(seed)
+        self.thrust_carry = 0.0  # fractional thrust particles owed from earlier steps
+        self.emitted = 0
+        self.dropped = 0  # particles asked for but not emitted
+        self.surfaces = None
+
+    def clear(self):
+        self.count = 0
+        self.thrust_carry = 0.0
+
+    def reserve(self, wanted):
+        # Rows for up to `wanted` new particles, fewer as the system fills
+        free = self.budget - self.count
+        granted = min(wanted, free, math.ceil(wanted * free / self.budget)) if self.budget else 0
+        self.dropped += wanted - granted
+        self.emitted += granted
+        start = self.count
+        self.count += granted
+        return slice(start, self.count)
+
+    def emit(self, rows, kind, x, y, angles, speeds, life, vx=0.0, vy=0.0):
+        n = rows.stop - rows.start
+        self.pos[rows] = (x, y)
+        self.vel[rows, 0] = np.cos(angles) * speeds + vx
+        self.vel[rows, 1] = np.sin(angles) * speeds + vy
+        self.age[rows] = 0.0
+        self.life[rows] = self.rng.uniform(life[0], life[1], n)
+        self.kind[rows] = kind
+
+    def burst(self, position, velocity, radius):
+        # Debris flying out of a destroyed asteroid, carrying half its momentum
+        rows = self.reserve(round(radius * PARTICLES_PER_RADIUS))
+        n = rows.stop - rows.start
+        if n:
+            angles = self.rng.uniform(0, 2 * math.pi, n)
+            speeds = self.rng.uniform(40, 160, n)
+            self.emit(rows, DEBRIS, position.x, position.y, angles, speeds, (0.4, 1.0), velocity.x / 2, velocity.y / 2)
+
+    def thrust(self, position, direction, dt, offset):
+        # Exhaust behind a ship moving along `direction` for `dt` seconds
+        self.thrust_carry += THRUST_PARTICLE_RATE * dt
+        wanted = int(self.thrust_carry)
+        self.thrust_carry -= wanted
+        rows = self.reserve(wanted)
+        n = rows.stop - rows.start
+        if n:
+            back = math.atan2(-direction.y, -direction.x)
+            angles = back + self.rng.uniform(-0.3, 0.3, n)
+            speeds = self.rng.uniform(80, 150, n)
+            exhaust = position - direction * offset
+            self.emit(rows, THRUST, exhaust.x, exhaust.y, angles, speeds, (0.15, 0.35))
+
+    def update(self, dt):
+        n = self.count
+        if not n:
+            return
+        age = self.age[:n]
+        age += dt
+        pos, vel = self.pos[:n], self.vel[:n]
+        vel *= PARTICLE_DRAG**dt
+        pos += vel * dt
+        np.mod(pos[:, 0], SCREEN_WIDTH, out=pos[:, 0])
+        np.mod(pos[:, 1], SCREEN_HEIGHT, out=pos[:, 1])
+
+        alive = age < self.life[:n]
+        if not alive.all():
+            keep = np.flatnonzero(alive)
+            live = len(keep)
+            for array in (self.pos, self.vel, self.age, self.life, self.kind):
+                array[:live] = array[keep]
+            self.count = live
+
+    def remember_position(self):
+        pass  # drawn where the last step left the particles
+
+    def blits(self):
+        n = self.count
+        if not n:
+            return []
+        if self.surfaces is None:
+            # One pre-rendered dot per kind and fade level, indexed kind * levels + level
+            self.surfaces = [atlas.circle(PARTICLE_RADIUS, color) for fade in FADES for color in fade]
+        levels = len(FADES[0])
+        fade = np.minimum(self.age[:n] / self.life[:n] * levels, levels - 1).astype(np.intp)
+        index = self.kind[:n] * levels + fade
+        half = self.surfaces[0].get_width() / 2
+        surfaces = self.surfaces
+        return [(surfaces[i], topleft) for i, topleft in zip(index.tolist(), (self.pos[:n] - half).tolist())]
@@ -1,13 +1,13 @@
 import pygame
+from textcache import text_cache, get_font
 
 class PauseMenu:
     def __init__(self, screen_width, screen_height):
         self.screen_width = screen_width
         self.screen_height = screen_height
 
-        self.title_font = pygame.font.Font(None, 74)
-        self.item_font = pygame.font.Font(None, 50)
         self.text_color = (255, 255, 255)  # White
+        self.overlay_color = (0, 0, 0, 128)  # Translucent black over the playfield
 
         self.title_text = "Paused"
         self.resume_text = "R - Resume"
@@ -15,21 +15,41 @@ class PauseMenu:
 
         self.resume_rect = None
         self.quit_rect = None
+        self.surface = None  # Overlay and text, composed once
+
+    @property
+    def title_font(self):
+        return get_font(74)
+
+    @property
+    def item_font(self):
+        return get_font(50)
+
+    def compose(self):
+        # The menu never changes, so it is rendered onto one overlay surface on first use
+        if self.surface is not None:
+            return self.surface
+
+        self.surface = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
+        self.surface.fill(self.overlay_color)
 
-    def draw(self, screen):
         # Render "Paused" text
-        title_surf = self.title_font.render(self.title_text, True, self.text_color)
+        title_surf = text_cache.render(self.title_font, self.title_text, self.text_color)
         title_rect = title_surf.get_rect(center=(self.screen_width / 2, self.screen_height / 3))
-        screen.blit(title_surf, title_rect)
+        self.surface.blit(title_surf, title_rect)
 
         # Render "R - Resume" text
-        resume_surf = self.item_font.render(self.resume_text, True, self.text_color)
+        resume_surf = text_cache.render(self.item_font, self.resume_text, self.text_color)
         self.resume_rect = resume_surf.get_rect(center=(self.screen_width / 2, self.screen_height / 2))
-        screen.blit(resume_surf, self.resume_rect)
+        self.surface.blit(resume_surf, self.resume_rect)
 
         # Render "Q - Quit" text
-        quit_surf = self.item_font.render(self.quit_text, True, self.text_color)
+        quit_surf = text_cache.render(self.item_font, self.quit_text, self.text_color)
         self.quit_rect = quit_surf.get_rect(center=(self.screen_width / 2, self.screen_height / 2 + 60))
-        screen.blit(quit_surf, self.quit_rect)
+        self.surface.blit(quit_surf, self.quit_rect)
+
+        return self.surface
 
+    def draw(self, screen):
+        screen.blit(self.compose(), (0, 0))
         return self.resume_rect, self.quit_rect
@@ -0,0 +1,266 @@
+import pygame
+from asteroid import Asteroid
+from shot import Shot
+from pool import Pool
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, ASTEROID_POOL_SIZE, SHOT_POOL_SIZE
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency, only needed for the array backend
+    np = None
+
+
+class BodyArray:
+    """Positions, velocities, radii and birth times of a population in NumPy arrays.
+
+    Live bodies occupy the first `count` rows. Removing a body moves the last
+    row into its slot, so the arrays stay contiguous.
+    """
+
+    def __init__(self, capacity=256):
+        if np is None:
+            raise RuntimeError("The array physics backend requires numpy")
+        self.pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.prev = np.zeros((capacity, 2))  # positions before the last step, for render interpolation
+        self.radius = np.zeros(capacity)
+        self.born = np.zeros(capacity)
+        self.bodies = []
+        self.count = 0
+
+    def _grow(self):
+        capacity = len(self.radius) * 2
+        for name in ("pos", "vel", "prev", "radius", "born"):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:])
+            new[: self.count] = old[: self.count]
+            setattr(self, name, new)
+
+    def attach(self, body):
+        if self.count == len(self.radius):
+            self._grow()
+        slot = self.count
+        self.pos[slot] = body._position
+        self.vel[slot] = body._velocity
+        self.prev[slot] = body._position
+        self.radius[slot] = body._radius
+        self.born[slot] = body._born
+        self.bodies.append(body)
+        self.count += 1
+        body.slot = slot
+
+    def detach(self, body):
+        slot = body.slot
+        # Keep the last known state on the object so it stays readable after kill()
+        body._position = pygame.Vector2(*self.pos[slot])
+        body._velocity = pygame.Vector2(*self.vel[slot])
+        body._radius = float(self.radius[slot])
+        body._born = float(self.born[slot])
+        body.slot = None
+
+        last = self.count - 1
+        if slot != last:
+            self.pos[slot] = self.pos[last]
+            self.vel[slot] = self.vel[last]
+            self.prev[slot] = self.prev[last]
+            self.radius[slot] = self.radius[last]
+            self.born[slot] = self.born[last]
+            moved = self.bodies[last]
+            moved.slot = slot
+            self.bodies[slot] = moved
+        self.bodies.pop()
+        self.count = last
+
+    def remember(self):
+        n = self.count
+        self.prev[:n] = self.pos[:n]
+
+    def step(self, dt, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+        n = self.count
+        pos = self.pos[:n]
+        pos += self.vel[:n] * dt
+
+        # Same wrap-around rules as the per-sprite update()
+        x = pos[:, 0]
+        y = pos[:, 1]
+        x[x > width] = 0
+        x[x < 0] = width
+        y[y > height] = 0
+        y[y < 0] = height
+
+    def overlapping(self, x, y, radius):
+        # Bodies whose circle touches the circle at (x, y), in slot order
+        n = self.count
+        delta = self.pos[:n] - (x, y)
+        reach = self.radius[:n] + radius
+        hits = np.flatnonzero(np.einsum("ij,ij->i", delta, delta) <= reach * reach)
+        return [self.bodies[i] for i in hits]
+
+
+class ArrayBody:
+    """Mixin that keeps a CircleShape's physical state in a BodyArray.
+
+    A body owns a slot exactly while it is alive(): joining its first group
+    attaches it and kill() detaches it. Detached bodies keep their last
+    state in plain attributes, so split() and the game loop can still read
+    position and velocity after kill(). Note that `position` and `velocity`
+    return copies: assign to them rather than mutating in place.
+    """
+
+    bodies = None  # BodyArray, set by ArrayPhysics
+    slot = None
+
+    @property
+    def position(self):
+        if self.slot is None:
+            return self._position
+        return pygame.Vector2(*self.bodies.pos[self.slot])
+
+    @position.setter
+    def position(self, value):
+        if self.slot is None:
+            self._position = pygame.Vector2(value)
+        else:
+            self.bodies.pos[self.slot] = (value[0], value[1])
+
+    @property
+    def velocity(self):
+        if self.slot is None:
+            return self._velocity
+        return pygame.Vector2(*self.bodies.vel[self.slot])
+
+    @velocity.setter
+    def velocity(self, value):
+        if self.slot is None:
+            self._velocity = pygame.Vector2(value)
+        else:
+            self.bodies.vel[self.slot] = (value[0], value[1])
+
+    @property
+    def prev_position(self):
+        if self.slot is None:
+            return self._position
+        return pygame.Vector2(*self.bodies.prev[self.slot])
+
+    @prev_position.setter
+    def prev_position(self, value):
+        # Kept in BodyArray.prev, which is refreshed in bulk
+        pass
+
+    def remember_position(self):
+        # Done in bulk by ArrayPhysics.remember()
+        pass
+
+    @property
+    def radius(self):
+        if self.slot is None:
+            return self._radius
+        return float(self.bodies.radius[self.slot])
+
+    @radius.setter
+    def radius(self, value):
+        if self.slot is None:
+            self._radius = value
+        else:
+            self.bodies.radius[self.slot] = value
+
+    @property
+    def born(self):
+        if self.slot is None:
+            return self._born
+        return float(self.bodies.born[self.slot])
+
+    @born.setter
+    def born(self, value):
+        if self.slot is None:
+            self._born = value
+        else:
+            self.bodies.born[self.slot] = value
+
+    def add_internal(self, group):
+        super().add_internal(group)
+        if self.slot is None:
+            # CircleShape joins its groups before assigning its state
+            self.__dict__.setdefault("_position", pygame.Vector2(0, 0))
+            self.__dict__.setdefault("_velocity", pygame.Vector2(0, 0))
+            self.__dict__.setdefault("_radius", 0)
+            self.__dict__.setdefault("_born", 0.0)
+            self.bodies.attach(self)
+
+    def remove_internal(self, group):
+        super().remove_internal(group)
+        if self.slot is not None and not self.alive():
+            self.bodies.detach(self)
+
+    def kill(self):
+        super().kill()
+        if self.slot is not None:
+            self.bodies.detach(self)
+
+    def update(self, dt):
+        # Integrated in bulk by ArrayPhysics.step()
+        pass
+
+
+class ArrayAsteroid(ArrayBody, Asteroid):
+    pass
+
+
+class ArrayShot(ArrayBody, Shot):
+    pass
+
+
+ArrayAsteroid.pool = Pool(ArrayAsteroid, ASTEROID_POOL_SIZE)
+ArrayShot.pool = Pool(ArrayShot, SHOT_POOL_SIZE)
+
+
+class ArrayPhysics:
+    """Vectorized integration and collision tests for asteroids and shots."""
+
+    def __init__(self, capacity=256):
+        self.asteroids = BodyArray(capacity)
+        self.shots = BodyArray(capacity)
+        self.bind()
+
+    def bind(self):
+        # Point the array entity classes at this engine's storage
+        ArrayAsteroid.bodies = self.asteroids
+        ArrayShot.bodies = self.shots
+
+    def remember(self):
+        self.asteroids.remember()
+        self.shots.remember()
+
+    def step(self, dt):
+        self.asteroids.step(dt)
+        self.shots.step(dt)
+
+    def asteroids_touching(self, shape):
+        return self.asteroids.overlapping(shape.position.x, shape.position.y, shape.radius)
+
+    def shot_hits(self, chunk=1024):
+        # [(shot, [asteroids it touches, in slot order]), ...] for every shot
+        # that touches at least one asteroid. Shots are processed in chunks
+        # to bound the size of the distance matrix.
+        shots, asteroids = self.shots, self.asteroids
+        n_shots, n_asteroids = shots.count, asteroids.count
+        if not n_shots or not n_asteroids:
+            return []
+
+        a_pos = asteroids.pos[:n_asteroids]
+        a_radius = asteroids.radius[:n_asteroids]
+        shot_bodies = list(shots.bodies)
+        asteroid_bodies = list(asteroids.bodies)
+        hits = []
+        for start in range(0, n_shots, chunk):
+            stop = min(start + chunk, n_shots)
+            delta = shots.pos[start:stop, None, :] - a_pos[None, :, :]
+            dist_sq = np.einsum("ijk,ijk->ij", delta, delta)
+            reach = shots.radius[start:stop, None] + a_radius[None, :]
+            touching = dist_sq <= reach * reach
+            for row in np.flatnonzero(touching.any(axis=1)):
+                hits.append((
+                    shot_bodies[start + row],
+                    [asteroid_bodies[i] for i in np.flatnonzero(touching[row])],
+                ))
+        return hits
@@ -0,0 +1,174 @@
+import queue
+import threading
+import time
+from typing import NamedTuple
+from constants import MAX_CATCHUP_STEPS, SIM_RATE
+from spritecache import sprite_blits
+from world import NO_INPUT
+
+
+class Frame(NamedTuple):
+    # Everything the render loop needs from one simulation step
+    blits: tuple  # (surface, top-left) pairs for Surface.blits()
+    score: int
+    lives: int
+    game_over: bool
+    elapsed: float
+    powerups_collected: int
+    step: int
+
+
+class FrameBuffer:
+    """Double buffer of published frames.
+
+    The simulation writes each new frame into the back slot and then flips
+    `front`, a single attribute store, so the render loop always reads a
+    complete frame without taking a lock. Frames are immutable, so a frame
+    the renderer is still drawing is never changed under it.
+    """
+
+    def __init__(self):
+        self.slots = [None, None]
+        self.front = 0
+        self.published = 0
+
+    def publish(self, frame):
+        back = 1 - self.front
+        self.slots[back] = frame
+        self.front = back
+        self.published += 1
+
+    def latest(self):
+        return self.slots[self.front]
+
+
+class ThreadTiming:
+    """Busy wall time and CPU time of one thread's loop iterations."""
+
+    def __init__(self, name):
+        self.name = name
+        self.started = time.perf_counter()
+        self.iterations = 0
+        self.busy = 0.0
+        self.cpu = 0.0
+        self._start = 0.0
+        self._cpu_start = 0.0
+
+    def begin(self):
+        self._start = time.perf_counter()
+        self._cpu_start = time.thread_time()
+
+    def end(self):
+        self.busy += time.perf_counter() - self._start
+        self.cpu += time.thread_time() - self._cpu_start
+        self.iterations += 1
+
+    def summary(self):
+        wall = time.perf_counter() - self.started
+        return {
+            "iterations": self.iterations,
+            "busy_s": self.busy,
+            "cpu_s": self.cpu,
+            "busy_fraction": self.busy / wall if wall else 0.0,
+            "mean_ms": self.busy / self.iterations * 1000 if self.iterations else 0.0,
+        }
+
+
+def concurrency(*timings):
+    # Average number of these threads busy at once: their summed busy time
+    # over wall time. Above 1.0 the threads must have overlapped.
+    wall = max(time.perf_counter() - timing.started for timing in timings)
+    return sum(timing.busy for timing in timings) / wall if wall else 0.0
+
+
+class SimulationThread(threading.Thread):
+    """Steps the world at a fixed rate on its own thread.
+
+    `step(dt, inputs)` is called with the latest `inputs` set by the render
+    loop; after every step a Frame is published to `frames`. Anything else
+    that touches the world (reset, rewind, quick-load) must go through
+    call(), which runs it on this thread between steps. A command that
+    jumps the world in time calls resync(), so the steps missed while it
+    ran aren't made up for.
+    """
+
+    def __init__(self, world, step, rate=SIM_RATE, max_steps=MAX_CATCHUP_STEPS):
+        super().__init__(name="simulation", daemon=True)
+        self.world = world
+        self.step = step
+        self.step_dt = 1 / rate
+        self.max_steps = max_steps
+        self.inputs = NO_INPUT
+        self.paused = False
+        self.frames = FrameBuffer()
+        self.commands = queue.SimpleQueue()
+        self.stopping = threading.Event()
+        self.timing = ThreadTiming("simulation")
+        self.steps = 0
+        self.dropped_steps = 0
+        self.next_step = time.perf_counter()
+        self.publish()
+
+    def call(self, fn):
+        self.commands.put(fn)
+
+    def resync(self):
+        # Restart the step schedule from now; only call this on this thread
+        self.next_step = time.perf_counter()
+
+    def stop(self):
+        self.stopping.set()
+        if self.is_alive():
+            self.join()
+
+    def publish(self):
+        world = self.world
+        self.frames.publish(
+            Frame(
+                tuple(sprite_blits(world.drawable)),
+                world.score,
+                world.lives,
+                world.game_over,
+                world.elapsed,
+                world.powerups_collected,
+                self.steps,
+            )
+        )
+
+    def run(self):
+        self.next_step = time.perf_counter()
+        while not self.stopping.is_set():
+            wait = self.next_step - time.perf_counter()
+            if wait > 0:
+                self.stopping.wait(wait)
+                continue
+            self.timing.begin()
+            while True:
+                try:
+                    self.commands.get_nowait()()
+                except queue.Empty:
+                    break
+            if not self.paused and not self.world.game_over:
+                self.step(self.step_dt, self.inputs)
+                self.steps += 1
+            self.publish()
+            self.timing.end()
+
+            self.next_step += self.step_dt
+            behind = (time.perf_counter() - self.next_step) / self.step_dt
+            if behind > self.max_steps:
+                # Too slow to catch up; drop the backlog like FixedTimestep does
+                self.dropped_steps += int(behind)
+                self.next_step = time.perf_counter()
+
+
+def timing_report(*timings):
+    lines = []
+    for timing in timings:
+        summary = timing.summary()
+        lines.append(
+            f"{timing.name:<12}{summary['iterations']:>8} iterations {summary['mean_ms']:>8.2f} ms mean"
+            f" {summary['busy_fraction']:>6.0%} busy {summary['cpu_s']:>8.2f} s CPU"
+        )
+    lines.append(f"concurrency {concurrency(*timings):>8.2f} threads busy on average")
+    return "\n".join(lines)
@@ -1,4 +1,5 @@
 import pygame
+from typing import NamedTuple
 from circleshape import CircleShape
 from constants import (
     PLAYER_RADIUS,
@@ -10,10 +11,40 @@ from constants import (
     SCREEN_HEIGHT,
 )
 from shot import Shot
+from spritecache import atlas
+from eventlog import event_log, INFO
+
+
+class PlayerInput(NamedTuple):
+    forward: bool = False
+    backward: bool = False
+    left: bool = False
+    right: bool = False
+    fire: bool = False
+
+    @classmethod
+    def from_keys(cls, keys):
+        return cls(
+            keys[pygame.K_w],
+            keys[pygame.K_s],
+            keys[pygame.K_a],
+            keys[pygame.K_d],
+            keys[pygame.K_SPACE],
+        )
+
+
+class Effect:
+    # One collected power-up working on a player until `timer` fires
+    __slots__ = ("kind", "timer")
+
+    def __init__(self, kind):
+        self.kind = kind  # the PowerUp subclass, whose modify() applies it
+        self.timer = None
 
 
 class Player(CircleShape):
     containers = None  # Will be set in main.py
+    shot_class = Shot  # Swapped for ArrayShot by the array backend
 
     def __init__(self, x, y):
         super().__init__(x, y, PLAYER_RADIUS)
@@ -26,11 +57,14 @@ class Player(CircleShape):
         self.rect = self.image.get_rect(center=(x,y))
         
         self.rotation = 0
-        self.timer = 0 # For shooting cooldown
+        self.prev_rotation = 0
+        self.reload_timer = None # Pending while the gun cools down
 
+        # Power-up effects stack; each one expires on its own timer and the
+        # modifiers below are recomputed from whatever is still active
+        self.effects = []
         self.shoot_cooldown_multiplier = 1.0 # 1.0 means normal cooldown
-        self.powerup_timer = 0.0 # Duration for active power-up
-        self.active_powerup_type = None
+        self.active_powerup_type = None # Newest active effect
         self.active_powerup_color = None # For visual indicator
         self.shield_active = False
         self.spread_shot_active = False
@@ -40,59 +74,124 @@ class Player(CircleShape):
             self.add(Player.containers)
 
     # in the player class
-    def triangle(self):
-        forward = pygame.Vector2(0, 1).rotate(self.rotation)
-        right = pygame.Vector2(0, 1).rotate(self.rotation + 90) * self.radius / 1.5
-        a = self.position + forward * self.radius  # type: ignore
-        b = self.position - forward * self.radius - right  # type: ignore
-        c = self.position - forward * self.radius + right  #  type: ignore
+    def triangle(self, center=None, rotation=None):
+        center = self.position if center is None else center
+        rotation = self.rotation if rotation is None else rotation
+        forward = pygame.Vector2(0, 1).rotate(rotation)
+        right = pygame.Vector2(0, 1).rotate(rotation + 90) * self.radius / 1.5
+        a = center + forward * self.radius  # type: ignore
+        b = center - forward * self.radius - right  # type: ignore
+        c = center - forward * self.radius + right  #  type: ignore
         return [a, b, c]
 
+    def remember_position(self):
+        super().remember_position()
+        self.prev_rotation = self.rotation
+
+    def render_rotation(self):
+        alpha = CircleShape.render_alpha
+        if alpha >= 1.0:
+            return self.rotation
+        return self.prev_rotation + (self.rotation - self.prev_rotation) * alpha
+
     def rotate(self, dt):
         self.rotation += PLAYER_TURN_SPEED * dt
 
     def move(self, dt):
         forward = pygame.Vector2(0, 1).rotate(self.rotation)
         self.position += forward * PLAYER_SPEED * dt
+        if self.particles:
+            # Exhaust comes out opposite the direction of travel
+            self.particles.thrust(self.position, forward if dt > 0 else -forward, abs(dt), self.radius)
 
     def shoot(self):
         current_shoot_cooldown = PLAYER_SHOOT_COOLDOWN * self.shoot_cooldown_multiplier
-        if self.timer <= 0:
+        if self.reload_timer is None:
             angles = [0]
             if self.spread_shot_active:
                 angles = [-15, 0, 15]
             for a in angles:
-                new_shot = Shot(self.position.x, self.position.y)
+                new_shot = self.shot_class.pool.acquire(self.position.x, self.position.y)
                 new_shot.velocity = (
                     pygame.Vector2(0, 1).rotate(self.rotation + a) * PLAYER_SHOOT_SPEED
                 )
-            self.timer = current_shoot_cooldown
-
-    def draw(self, screen):
-        # This manual draw is for the triangle.
+                new_shot.owner = self
+            self.reload_timer = self.scheduler.schedule(current_shoot_cooldown, self.reload)
+
+    def reload(self):
+        self.reload_timer = None
+
+    def kill(self):
+        # A destroyed ship's timers would otherwise fire on it and keep it alive
+        self.scheduler.cancel(self.reload_timer)
+        for effect in self.effects:
+            self.scheduler.cancel(effect.timer)
+        super().kill()
+
+    def add_effect(self, kind, duration):
+        # Start one effect of the PowerUp class `kind` for `duration` seconds
+        effect = Effect(kind)
+        effect.timer = self.scheduler.schedule(duration, self.end_effect, effect)
+        self.effects.append(effect)
+        self.refresh_effects()
+        return effect
+
+    def end_effect(self, effect):
+        # Called by the effect's timer, or early (a shield absorbing a hit)
+        if effect not in self.effects:
+            return
+        if effect.timer.active:
+            self.scheduler.cancel(effect.timer)
+        elif event_log.enabled_for(INFO):
+            event_log.info("powerup_expired", kind=effect.kind.powerup_type)
+        self.effects.remove(effect)
+        self.refresh_effects()
+
+    def find_effect(self, powerup_type):
+        # The oldest active effect of this type, or None
+        return next((effect for effect in self.effects if effect.kind.powerup_type == powerup_type), None)
+
+    def refresh_effects(self):
+        self.shoot_cooldown_multiplier = 1.0
+        self.shield_active = False
+        self.spread_shot_active = False
+        for effect in self.effects:
+            effect.kind.modify(self)
+        newest = self.effects[-1].kind if self.effects else None
+        self.active_powerup_type = newest.powerup_type if newest else None
+        self.active_powerup_color = newest.color if newest else None
+
+    @property
+    def powerup_timer(self):
+        # Seconds until the last active effect runs out
+        return max((self.scheduler.remaining(effect.timer) for effect in self.effects), default=0.0)
+
+    def blits(self):
+        # The triangle comes pre-rendered from the atlas at the nearest cached rotation.
         # The self.image for sprite group drawing is just a circle for collision.
-        # If we wanted the triangle to be on self.image, we'd render it there.
         current_draw_color = self.active_powerup_color if self.active_powerup_color else "white"
-        pygame.draw.polygon(screen, current_draw_color, self.triangle(), 2)
+        center = self.render_position()
+        items = [atlas.blit_at(atlas.ship(self.radius, current_draw_color, self.render_rotation()), center)]
         if self.shield_active:
-            pygame.draw.circle(screen, "blue", (int(self.position.x), int(self.position.y)), self.radius + 5, 1)
+            items.append(atlas.blit_at(atlas.circle(self.radius + 5, "blue", 1), center))
+        return items
 
-    def update(self, dt):
-        keys = pygame.key.get_pressed()
+    def update(self, dt, inputs=None):
+        # Without explicit inputs the ship is flown from the keyboard
+        if inputs is None:
+            inputs = PlayerInput.from_keys(pygame.key.get_pressed())
 
-        if keys[pygame.K_w]:
+        if inputs.forward:
             self.move(dt)
-        if keys[pygame.K_s]:
+        if inputs.backward:
             self.move(-dt)
-        if keys[pygame.K_a]:
+        if inputs.left:
             self.rotate(-dt)
-        if keys[pygame.K_d]:
+        if inputs.right:
             self.rotate(dt)
-        if keys[pygame.K_SPACE]:
+        if inputs.fire:
             self.shoot()
 
-        self.timer -= dt
-
         # Screen wrap-around
         if self.position.x > SCREEN_WIDTH:
             self.position.x = 0
@@ -104,18 +203,3 @@ class Player(CircleShape):
             self.position.y = SCREEN_HEIGHT
 
         self.rect.center = (int(self.position.x), int(self.position.y))  # Keep rect synced
-
-        # Power-up timer update
-        if self.powerup_timer > 0:
-            self.powerup_timer -= dt
-            if self.powerup_timer <= 0:
-                print(f"Power-up {self.active_powerup_type} expired.")
-                if self.active_powerup_type == "rapid_fire":
-                    self.shoot_cooldown_multiplier = 1.0
-                elif self.active_powerup_type == "shield":
-                    self.shield_active = False
-                elif self.active_powerup_type == "spread_shot":
-                    self.spread_shot_active = False
-                self.active_powerup_type = None
-                self.active_powerup_color = None
-                self.powerup_timer = 0.0
@@ -0,0 +1,54 @@
+class Pool:
+    """Free list of reusable entities of one class.
+
+    `acquire(*args)` hands out a released instance re-initialised through
+    its `reset(*args)` (a hit) or constructs a new one (a miss). `release`
+    kills the instance and keeps it for reuse, up to `size` spare objects.
+    Between `hold()` and `recycle()` released instances are set aside and
+    only become reusable at `recycle()`.
+    """
+
+    def __init__(self, cls, size):
+        self.cls = cls
+        self.size = size
+        self.free = []
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0  # releases dropped because the pool was full
+        self.held = None  # releases set aside while holding
+
+    def acquire(self, *args):
+        if self.free:
+            self.hits += 1
+            obj = self.free.pop()
+            obj.pooled = False
+            obj.reset(*args)
+            return obj
+        self.misses += 1
+        return self.cls(*args)
+
+    def release(self, obj):
+        obj.kill()
+        if getattr(obj, "pooled", False):
+            return  # already released
+        if len(self.free) + len(self.held or ()) < self.size:
+            obj.pooled = True
+            (self.free if self.held is None else self.held).append(obj)
+        else:
+            self.discarded += 1
+
+    def hold(self):
+        self.held = []
+
+    def recycle(self):
+        held, self.held = self.held, None
+        self.free.extend(held or ())
+
+    def stats(self):
+        return {
+            "size": self.size,
+            "free": len(self.free),
+            "hits": self.hits,
+            "misses": self.misses,
+            "discarded": self.discarded,
+        }
@@ -1,36 +1,57 @@
-import pygame
 from circleshape import CircleShape # Assuming this is the correct path
+from spritecache import atlas
+from eventlog import event_log, DEBUG
 # from player import Player # Avoiding direct import for now to prevent circular dependency
 
 class PowerUp(CircleShape):
     containers = None  # Will be set in main.py
+    # Seconds an uncollected power-up stays on the field, and the callback
+    # that removes it then; both set by the World (None: no despawn)
+    lifetime = None
+    on_expire = None
 
     def __init__(self, x, y, radius, color, powerup_type, duration):
         super().__init__(x, y, radius)
         
-        self.image = pygame.Surface([radius*2, radius*2], pygame.SRCALPHA)
-        pygame.draw.circle(self.image, color, (radius, radius), radius)
+        self.image = atlas.circle(radius, color) # Shared with every power-up of this kind
         self.rect = self.image.get_rect(center=(x,y))
         
         self.color = color # Kept for potential direct drawing or reference
         self.powerup_type = powerup_type
         self.duration = duration
+        self.despawn_timer = None
+        self.schedule_despawn()
 
         # Add to groups if containers are set
         if PowerUp.containers:
             self.add(PowerUp.containers)
 
-    def draw(self, screen):
-        # This method might be redundant if self.image is used by a sprite group's draw method.
-        # However, CircleShape's draw method might be different or more detailed.
-        # For now, relying on group.draw() using self.image and self.rect.
-        # If specific drawing is needed, this can be uncommented or Group.draw can be replaced.
-        # pygame.draw.circle(screen, self.color, (int(self.position.x), int(self.position.y)), self.radius)
-        pass
+    def schedule_despawn(self):
+        # (Re)arm the despawn timer for `lifetime` seconds after `born`
+        self.scheduler.cancel(self.despawn_timer)
+        self.despawn_timer = None
+        if PowerUp.lifetime is not None and PowerUp.on_expire:
+            self.despawn_timer = self.scheduler.at(self.born + PowerUp.lifetime, PowerUp.on_expire, self)
+
+    def kill(self):
+        self.scheduler.cancel(self.despawn_timer)
+        super().kill()
+
+    def blits(self):
+        return [atlas.blit_at(self.image, self.render_position())]
 
 
     def apply_effect(self, player):
-        # player argument will be an instance of the Player class
+        # player argument will be an instance of the Player class.
+        # The effect runs on its own timer, alongside any others the player has.
+        if event_log.enabled_for(DEBUG):
+            event_log.debug("powerup_applied", kind=self.powerup_type, duration=self.duration)
+        player.add_effect(type(self), self.duration)
+
+    @classmethod
+    def modify(cls, player):
+        # Applies one active effect of this kind to the player's modifiers,
+        # which Player.refresh_effects() resets before calling it
         raise NotImplementedError("Subclasses must implement this method.")
 
     def update(self, dt):
@@ -39,54 +60,50 @@ class PowerUp(CircleShape):
         # Other update logic for the power-up item itself (e.g., animation, lifetime) can go here.
 
 class RapidFirePowerUp(PowerUp):
+    powerup_type = "rapid_fire"
+    color = (0, 255, 0) # Green
+
     def __init__(self, x, y):
-        super().__init__(x, y, radius=10, color=(0, 255, 0), powerup_type="rapid_fire", duration=5.0) # Green, 5 seconds
+        super().__init__(x, y, radius=10, color=self.color, powerup_type=self.powerup_type, duration=5.0) # 5 seconds
 
-    def apply_effect(self, player):
-        # This method will be called when the player collects the power-up.
-        # It directly modifies the player object passed to it.
-        # The Player class will need 'shoot_cooldown_multiplier' and 'powerup_timer' attributes.
-        print(f"Applying {self.powerup_type} to player for {self.duration}s. Current player cooldown multiplier: {getattr(player, 'shoot_cooldown_multiplier', 'N/A')}")
-        player.shoot_cooldown_multiplier = 0.5 # Example: Halves the cooldown
-        player.powerup_timer = self.duration # Player needs to handle this timer
-        player.active_powerup_type = self.powerup_type
-        player.active_powerup_color = self.color # Set player's active color
-        print(f"Set player.shoot_cooldown_multiplier to 0.5, player.powerup_timer to {self.duration}, player.active_powerup_type to {self.powerup_type}, player.active_powerup_color to {self.color}")
+    @classmethod
+    def modify(cls, player):
+        player.shoot_cooldown_multiplier *= 0.5 # Halves the cooldown; stacked ones halve it again
 
 
 class ShieldPowerUp(PowerUp):
+    powerup_type = "shield"
+    color = (0, 0, 255)
+
     def __init__(self, x, y):
         super().__init__(
             x,
             y,
             radius=12,
-            color=(0, 0, 255),
-            powerup_type="shield",
+            color=self.color,
+            powerup_type=self.powerup_type,
             duration=5.0,
         )
 
-    def apply_effect(self, player):
-        print(f"Applying {self.powerup_type} to player for {self.duration}s.")
-        player.shield_active = True
-        player.powerup_timer = self.duration
-        player.active_powerup_type = self.powerup_type
-        player.active_powerup_color = self.color
+    @classmethod
+    def modify(cls, player):
+        player.shield_active = True # Each stacked shield absorbs one hit
 
 
 class SpreadShotPowerUp(PowerUp):
+    powerup_type = "spread_shot"
+    color = (255, 165, 0)
+
     def __init__(self, x, y):
         super().__init__(
             x,
             y,
             radius=12,
-            color=(255, 165, 0),
-            powerup_type="spread_shot",
+            color=self.color,
+            powerup_type=self.powerup_type,
             duration=5.0,
         )
 
-    def apply_effect(self, player):
-        print(f"Applying {self.powerup_type} to player for {self.duration}s.")
+    @classmethod
+    def modify(cls, player):
         player.spread_shot_active = True
-        player.powerup_timer = self.duration
-        player.active_powerup_type = self.powerup_type
-        player.active_powerup_color = self.color
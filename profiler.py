@@ -0,0 +1,146 @@
+import json
+import time
+from array import array
+from constants import PROFILER_FRAMES, PROFILER_OVERLAY_INTERVAL
+
+EVENTS, COLLISION, UPDATE, DRAW, PRESENT = range(5)
+PHASE_NAMES = ("events", "collision", "update", "draw", "present")
+
+
+class FrameProfiler:
+    """Per-phase frame timings kept in a fixed-size ring buffer.
+
+    The game loop calls begin_frame(), then mark(phase) as each phase ends,
+    then end_frame(). mark() adds the time since the previous mark to that
+    phase, so phases that run several times in one frame (fixed-step
+    catch-up) accumulate. When disabled every call returns immediately.
+    """
+
+    def __init__(self, capacity=PROFILER_FRAMES, enabled=False):
+        self.capacity = capacity
+        self.enabled = enabled
+        self.stride = len(PHASE_NAMES) + 1  # frame start, then one slot per phase
+        self.samples = array("d", bytes(8 * capacity * self.stride))
+        self.frame_times = array("d", bytes(8 * capacity))
+        self.head = 0
+        self.count = 0
+        self.last = 0.0
+        self.counts = {}  # entity count per group, from the latest frame
+        self.overlay = []  # rendered overlay lines, redrawn every PROFILER_OVERLAY_INTERVAL
+        self.overlay_at = None
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.last = time.perf_counter()
+        base = self.head * self.stride
+        self.samples[base] = self.last
+        for i in range(base + 1, base + self.stride):
+            self.samples[i] = 0.0
+
+    def mark(self, phase):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.samples[self.head * self.stride + 1 + phase] += now - self.last
+        self.last = now
+
+    def end_frame(self, **counts):
+        if not self.enabled:
+            return
+        self.frame_times[self.head] = self.last - self.samples[self.head * self.stride]
+        self.counts = counts
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        if self.enabled:
+            self.begin_frame()  # time the rest of the current frame
+
+    def frames(self):
+        # Recorded frames, oldest first, as (start, [phase durations], frame time)
+        first = (self.head - self.count) % self.capacity
+        for n in range(self.count):
+            slot = (first + n) % self.capacity
+            base = slot * self.stride
+            yield (
+                self.samples[base],
+                list(self.samples[base + 1 : base + self.stride]),
+                self.frame_times[slot],
+            )
+
+    def percentiles(self, points=(50, 95, 99)):
+        if not self.count:
+            return {}
+        times = sorted(frame_time for _, _, frame_time in self.frames())
+        result = {f"p{p}": times[min(len(times) - 1, len(times) * p // 100)] for p in points}
+        result["max"] = times[-1]
+        return result
+
+    def export_csv(self, path):
+        with open(path, "w") as f:
+            f.write("start_s,frame_ms," + ",".join(f"{name}_ms" for name in PHASE_NAMES) + "\n")
+            for start, phases, frame_time in self.frames():
+                cells = [f"{start:.6f}", f"{frame_time * 1000:.4f}"]
+                cells.extend(f"{duration * 1000:.4f}" for duration in phases)
+                f.write(",".join(cells) + "\n")
+
+    def export_chrome_trace(self, path):
+        # Trace Event Format, viewable in chrome://tracing or Perfetto. Phases
+        # are laid end to end from the frame start in loop order.
+        events = []
+        for start, phases, frame_time in self.frames():
+            ts = start * 1e6
+            events.append({"name": "frame", "ph": "X", "ts": ts, "dur": frame_time * 1e6, "pid": 1, "tid": 1})
+            for name, duration in zip(PHASE_NAMES, phases):
+                if duration:
+                    events.append({"name": name, "ph": "X", "ts": ts, "dur": duration * 1e6, "pid": 1, "tid": 1})
+                    ts += duration * 1e6
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def draw_overlay(self, blit, font, position=(10, 80)):
+        # Frame-time percentiles and entity counts, one text line each. The
+        # numbers change every frame, so the lines are rendered here a few
+        # times a second rather than through the shared text cache.
+        now = time.perf_counter()
+        if self.overlay_at is None or now - self.overlay_at >= PROFILER_OVERLAY_INTERVAL:
+            self.overlay_at = now
+            lines = [
+                f"{name} {seconds * 1000:.1f} ms" for name, seconds in self.percentiles().items()
+            ]
+            lines.extend(f"{group}: {count}" for group, count in self.counts.items())
+            self.overlay = [font.render(line, True, (255, 255, 0)) for line in lines]
+        x, y = position
+        for surface in self.overlay:
+            blit(surface, (x, y))
+            y += surface.get_height()
+
+
+NULL_PROFILER = FrameProfiler(capacity=1)
+
+
+class StartupTimer:
+    """Named startup phases, each timed from the end of the previous one."""
+
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.last = self.start
+        self.phases = {}
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.phases[name] = now - self.last
+        self.last = now
+
+    def total(self):
+        return self.last - self.start
+
+    def milliseconds(self):
+        result = {name: round(seconds * 1000, 2) for name, seconds in self.phases.items()}
+        result["total"] = round(self.total() * 1000, 2)
+        return result
+
+    def report(self):
+        return "\n".join(f"startup {name:<12} {ms:8.1f} ms" for name, ms in self.milliseconds().items())
@@ -0,0 +1,108 @@
+import pygame
+from constants import RENDER_SCALES, RENDER_SCALE_WINDOW, RENDER_SCALE_HIGH, RENDER_SCALE_LOW
+
+
+class ScaledRenderer:
+    """Draws the playfield to an offscreen canvas and scales it to the window.
+
+    Sprites still produce their blits in world coordinates; draw_blits()
+    shrinks each surface (cached per surface and scale) and its position
+    onto the canvas, and present() scales the canvas up over the whole
+    window. At scale 1.0 drawing goes straight to the window. HUD and
+    menus are drawn on the window afterwards at full resolution. The
+    World never sees the render scale.
+    """
+
+    def __init__(self, screen, scale=1.0, background="#000000"):
+        self.screen = screen
+        self.background = background
+        self.scaled = {}  # source surface -> its copy at `scale`
+        self.canvas = None
+        self.scale = None
+        self.set_scale(scale)
+
+    def set_scale(self, scale):
+        if scale == self.scale:
+            return
+        self.scale = scale
+        self.scaled.clear()
+        if scale == 1.0:
+            self.canvas = self.screen
+        else:
+            width, height = self.screen.get_size()
+            self.canvas = pygame.Surface((round(width * scale), round(height * scale))).convert()
+
+    def begin(self):
+        self.canvas.fill(self.background)
+
+    def draw_blits(self, blits):
+        if self.scale == 1.0:
+            self.canvas.blits(blits, False)
+            return
+        scale, scaled = self.scale, self.scaled
+        batch = []
+        for surface, (x, y) in blits:
+            small = scaled.get(surface)
+            if small is None:
+                small = scaled[surface] = pygame.transform.smoothscale_by(surface, scale)
+            batch.append((small, (x * scale, y * scale)))
+        self.canvas.blits(batch, False)
+
+    def present(self):
+        # Cover the window with the canvas; HUD drawing goes on top of it
+        if self.scale != 1.0:
+            pygame.transform.scale(self.canvas, self.screen.get_size(), self.screen)
+
+
+class ResolutionController:
+    """Picks a render scale from RENDER_SCALES by measured frame time.
+
+    Every `window` frames the median frame time is compared with the frame
+    budget: above RENDER_SCALE_HIGH of it the scale steps down, below
+    RENDER_SCALE_LOW it steps back up. A step up that has to be undone
+    doubles how many good windows the next step up waits for, so the
+    scale settles instead of bouncing between two levels.
+    """
+
+    def __init__(self, budget, scales=RENDER_SCALES, scale=1.0, window=RENDER_SCALE_WINDOW):
+        self.budget = budget
+        self.scales = sorted(scales)
+        self.index = self.scales.index(scale)
+        self.window = window
+        self.samples = []
+        self.good_windows = 0
+        self.raise_after = 1  # good windows needed before stepping up
+        self.just_raised = False
+        self.changes = 0
+
+    @property
+    def scale(self):
+        return self.scales[self.index]
+
+    def update(self, frame_time):
+        # Record one frame; returns the scale to render the next frame at
+        self.samples.append(frame_time)
+        if len(self.samples) < self.window:
+            return self.scale
+        self.samples.sort()
+        median = self.samples[len(self.samples) // 2]
+        self.samples.clear()
+
+        if median > self.budget * RENDER_SCALE_HIGH:
+            self.good_windows = 0
+            if self.index > 0:
+                if self.just_raised:
+                    self.raise_after *= 2
+                self.index -= 1
+                self.changes += 1
+            self.just_raised = False
+        elif median < self.budget * RENDER_SCALE_LOW and self.index < len(self.scales) - 1:
+            self.good_windows += 1
+            self.just_raised = self.good_windows >= self.raise_after
+            if self.just_raised:
+                self.good_windows = 0
+                self.index += 1
+                self.changes += 1
+        else:
+            self.just_raised = False
+        return self.scale
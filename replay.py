@@ -0,0 +1,167 @@
+"""Compact input recordings and headless max-speed playback.
+
+A recording is a fixed header followed by one 5-byte record per
+simulation step:
+
+    header: magic b"ASTR", format version (u16), flags (u16), seed (i64)
+    step:   dt (f32), input bits (u8)
+
+Input bits 0-4 are the PlayerInput fields in order. Bit 7 marks a
+world.reset() before the step. The format can be streamed both ways:
+records are appended as the game runs, and the reader decodes them in
+chunks. A truncated final record (a crash mid-write) is ignored.
+
+Replay a recording with no window, as fast as the CPU allows:
+
+    python replay.py session.replay
+"""
+import argparse
+import struct
+import sys
+import time
+from player import PlayerInput
+from world import World
+
+MAGIC = b"ASTR"
+VERSION = 2  # 2: timers run on the world scheduler
+FLAG_ARRAY_PHYSICS = 1
+FLAG_CONTINUOUS_COLLISION = 2
+RESET_BIT = 0x80
+
+HEADER = struct.Struct("<4sHHq")
+STEP = struct.Struct("<fB")
+_DT = struct.Struct("<f")
+
+
+def pack_input(inputs):
+    bits = 0
+    for i, pressed in enumerate(inputs):
+        if pressed:
+            bits |= 1 << i
+    return bits
+
+
+def unpack_input(bits):
+    return PlayerInput(*(bool(bits & (1 << i)) for i in range(len(PlayerInput._fields))))
+
+
+def quantize_dt(dt):
+    # The dt a replay will see; recording sessions must step with this value
+    return _DT.unpack(_DT.pack(dt))[0]
+
+
+class ReplayRecorder:
+    def __init__(self, f, seed, array_physics=False, flush_every=60, continuous_collision=False):
+        self.f = f
+        self.flush_every = flush_every
+        self.steps = 0
+        self.pending_reset = False
+        flags = FLAG_ARRAY_PHYSICS if array_physics else 0
+        if continuous_collision:
+            flags |= FLAG_CONTINUOUS_COLLISION
+        f.write(HEADER.pack(MAGIC, VERSION, flags, seed))
+
+    @classmethod
+    def open(cls, path, seed, array_physics=False, continuous_collision=False):
+        return cls(open(path, "wb"), seed, array_physics, continuous_collision=continuous_collision)
+
+    def mark_reset(self):
+        self.pending_reset = True
+
+    def record(self, dt, inputs):
+        # Returns the quantized dt, which the live world must be stepped with
+        bits = pack_input(inputs)
+        if self.pending_reset:
+            bits |= RESET_BIT
+            self.pending_reset = False
+        self.f.write(STEP.pack(dt, bits))
+        self.steps += 1
+        if self.steps % self.flush_every == 0:
+            self.f.flush()
+        return quantize_dt(dt)
+
+    def close(self):
+        self.f.close()
+
+
+class ReplayReader:
+    def __init__(self, f, chunk_steps=4096):
+        self.f = f
+        self.chunk_size = STEP.size * chunk_steps
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError("Not a replay file: header is truncated")
+        magic, version, flags, seed = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError("Not a replay file: bad magic")
+        if version != VERSION:
+            raise ValueError(f"Unsupported replay version {version}")
+        self.seed = seed
+        self.array_physics = bool(flags & FLAG_ARRAY_PHYSICS)
+        self.continuous_collision = bool(flags & FLAG_CONTINUOUS_COLLISION)
+
+    @classmethod
+    def open(cls, path):
+        return cls(open(path, "rb"))
+
+    def __iter__(self):
+        # Yields (dt, PlayerInput, reset) for every complete step record
+        leftover = b""
+        while True:
+            chunk = self.f.read(self.chunk_size)
+            if not chunk:
+                return
+            data = leftover + chunk
+            usable = len(data) - len(data) % STEP.size
+            for dt, bits in STEP.iter_unpack(data[:usable]):
+                yield dt, unpack_input(bits & ~RESET_BIT), bool(bits & RESET_BIT)
+            leftover = data[usable:]
+
+    def close(self):
+        self.f.close()
+
+
+def replay(reader, array_physics=None, on_step=None):
+    # Re-simulate a recording headless; returns the final World
+    if array_physics is None:
+        array_physics = reader.array_physics
+    world = World(
+        array_physics=array_physics,
+        seed=reader.seed,
+        continuous_collision=reader.continuous_collision,
+    )
+    for dt, inputs, reset in reader:
+        if reset:
+            world.reset()
+        world.step(dt, inputs)
+        if on_step:
+            on_step(world)
+    return world
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Replay an Asteroids recording headless")
+    parser.add_argument("recording")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    reader = ReplayReader.open(args.recording)
+    steps = 0
+
+    def count(world):
+        nonlocal steps
+        steps += 1
+
+    start = time.perf_counter()
+    world = replay(reader, on_step=count)
+    elapsed = time.perf_counter() - start
+    reader.close()
+    print(f"Replayed {steps} steps in {elapsed:.2f}s ({steps / max(elapsed, 1e-9):.0f} steps/s)")
+    print(f"Final state: {world.state}, score {world.score}, lives {world.lives}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+import heapq
+
+
+class Timer:
+    __slots__ = ("when", "seq", "callback", "args", "active")
+
+    def __init__(self, when, seq, callback, args):
+        self.when = when
+        self.seq = seq  # breaks ties in scheduling order, so runs are reproducible
+        self.callback = callback
+        self.args = args
+        self.active = True  # until it fires or is cancelled
+
+    def __lt__(self, other):
+        return (self.when, self.seq) < (other.when, other.seq)
+
+
+class Scheduler:
+    """Callbacks due at points in simulation time, kept in a heap.
+
+    advance(now) runs every timer due by `now` in time order, so a step
+    only touches the timers that fire in it, however many are pending.
+    cancel() marks a timer inactive and it is dropped when it reaches the top.
+    A timer scheduled from a running callback fires on a later advance()
+    at the earliest, even with no delay, so a timer that reschedules
+    itself can't stall a step.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self.heap = []
+        self.seq = 0
+        self.running = False
+        self.deferred = []  # scheduled while callbacks were running
+        self.fired = 0
+
+    def pending(self):
+        return sum(1 for timer in self.heap + self.deferred if timer.active)
+
+    def at(self, when, callback, *args):
+        timer = Timer(when, self.seq, callback, args)
+        self.seq += 1
+        if self.running:
+            self.deferred.append(timer)
+        else:
+            heapq.heappush(self.heap, timer)
+        return timer
+
+    def schedule(self, delay, callback, *args):
+        return self.at(self.now + delay, callback, *args)
+
+    def cancel(self, timer):
+        if timer is not None:
+            timer.active = False
+
+    def remaining(self, timer):
+        return max(0.0, timer.when - self.now)
+
+    def advance(self, now):
+        self.now = now
+        heap = self.heap
+        self.running = True
+        try:
+            while heap and heap[0].when <= now:
+                timer = heapq.heappop(heap)
+                if timer.active:
+                    timer.active = False
+                    self.fired += 1
+                    timer.callback(*timer.args)
+        finally:
+            self.running = False
+            for timer in self.deferred:
+                heapq.heappush(heap, timer)
+            self.deferred.clear()
+
+    def clear(self, now=0.0):
+        # Drop every pending timer and restart the clock at `now`
+        self.heap.clear()
+        self.deferred.clear()
+        self.now = now
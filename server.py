@@ -0,0 +1,286 @@
+"""Authoritative multiplayer server: several ships in one asteroid field.
+
+    python server.py --port 9999 --snapshot-rate 20
+
+The server owns the World. Clients (client.py) only send their input
+bits; the server steps the simulation at a fixed rate with each seat's
+latest input and sends every client a delta-compressed snapshot at the
+snapshot rate (see netcode.py). --loss, --latency and --jitter simulate a
+bad network on everything the server sends.
+"""
+import argparse
+import asyncio
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, PLAYER_LIVES, SIM_RATE, MAX_CATCHUP_STEPS
+from player import Player
+from profiler import COLLISION, UPDATE
+from replay import unpack_input
+from world import World, NO_INPUT
+from netcode import (
+    HELLO,
+    INPUT,
+    BYE,
+    WELCOME,
+    ASTEROID,
+    SHOT,
+    SHIP,
+    POWERUP_KINDS,
+    INPUT_MESSAGE,
+    WELCOME_MESSAGE,
+    EntityRecords,
+    NetworkConditions,
+    apply,
+    diff,
+    pack_snapshot,
+    quantize_rotation,
+)
+
+MAX_PLAYERS = 8
+SEAT_TIMEOUT = 5.0  # seconds without a packet before a client is dropped
+SNAPSHOT_HISTORY = 32  # sent snapshots kept per client as delta bases
+
+
+class Seat:
+    # One connected client: its ship, score and what it has acknowledged
+    def __init__(self, player_id, address, now):
+        self.player_id = player_id
+        self.address = address
+        self.player = None
+        self.score = 0
+        self.lives = PLAYER_LIVES
+        self.inputs = NO_INPUT
+        self.input_seq = -1
+        self.acked = 0  # newest snapshot tick the client confirmed, 0 for none
+        self.history = {}  # snapshot tick -> the view the client holds after it
+        self.in_flight = {}  # the view once every snapshot sent so far arrives
+        self.last_heard = now
+
+
+class ServerWorld(World):
+    """A World whose ships belong to seats instead of one local player.
+
+    Every seat's ship is collided and moved each step. Lives and score are
+    kept per seat; a seat whose lives run out spectates until it says HELLO
+    again. The world's own `score` is the shared total.
+    """
+
+    def __init__(self, **kwargs):
+        self.seats = {}  # player id -> Seat
+        self.ships = {}  # Player -> Seat, for crediting shots to their owner
+        super().__init__(**kwargs)
+        self.player.kill()  # no local ship
+
+    def spawn_ship(self, seat):
+        self.bind()
+        seat.player = Player(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
+        self.ships[seat.player] = seat
+
+    def remove_ship(self, seat):
+        if seat.player:
+            seat.player.kill()
+            del self.ships[seat.player]
+            seat.player = None
+
+    def step(self, dt, inputs=None):
+        self.elapsed += dt
+        self.bind()
+        self.scheduler.advance(self.elapsed)
+        self.last_dt = dt  # swept shots reach back over this step
+        if self.interpolate:
+            self.remember_positions()
+        self.profiler.mark(UPDATE)
+        self.rebuild_collision_index()
+        for seat in self.seats.values():
+            if seat.player is None:
+                continue
+            if self.ship_hit(seat.player):
+                self.remove_ship(seat)
+                seat.lives -= 1
+                if seat.lives > 0:
+                    self.spawn_ship(seat)
+            else:
+                self.collect_powerups(seat.player)
+        self.collide_shots()
+        self.profiler.mark(COLLISION)
+        for seat in self.seats.values():
+            if seat.player:
+                seat.player.update(dt, seat.inputs)
+        self.advance_field(dt)
+        self.profiler.mark(UPDATE)
+
+    def shot_hit(self, shot, asteroid, index):
+        seat = self.ships.get(getattr(shot, "owner", None))
+        super().shot_hit(shot, asteroid, index)
+        if seat:
+            seat.score += 10
+
+    def entities(self):
+        # (sprite, kind, extra, rotation) for EntityRecords.update()
+        for asteroid in self.asteroids:
+            yield asteroid, ASTEROID, 0, 0
+        for shot in self.shots:
+            yield shot, SHOT, 0, 0
+        for powerup in self.powerups_group:
+            yield powerup, POWERUP_KINDS[powerup.powerup_type], 0, 0
+        for seat in self.seats.values():
+            if seat.player:
+                yield seat.player, SHIP, seat.player_id, quantize_rotation(seat.player.rotation)
+
+
+class GameServer(asyncio.DatagramProtocol):
+    def __init__(self, world, rate=SIM_RATE, snapshot_rate=20, conditions=None, max_players=MAX_PLAYERS):
+        self.world = world
+        self.rate = rate
+        self.snapshot_every = max(1, round(rate / snapshot_rate))
+        self.conditions = conditions or NetworkConditions()
+        self.max_players = max_players
+        self.records = EntityRecords(rate)
+        self.seats_by_address = {}
+        self.tick = 0
+        self.transport = None
+        self.loop = None
+        self.bytes_sent = 0
+        self.snapshots_sent = 0
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.loop = asyncio.get_running_loop()
+
+    def send(self, data, address):
+        self.bytes_sent += len(data)
+        self.conditions.sendto(self.loop, self.transport, data, address)
+
+    def datagram_received(self, data, address):
+        if not data:
+            return
+        kind = data[0]
+        seat = self.seats_by_address.get(address)
+        if kind == HELLO:
+            self.hello(seat, address)
+        elif seat is None:
+            return
+        elif kind == INPUT and len(data) >= INPUT_MESSAGE.size:
+            _, seq, ack, bits = INPUT_MESSAGE.unpack_from(data)
+            seat.last_heard = self.loop.time()
+            if seq > seat.input_seq:  # older inputs arrived out of order
+                seat.input_seq = seq
+                seat.inputs = unpack_input(bits)
+            if ack > seat.acked and ack in seat.history:
+                seat.acked = ack
+                for tick in [tick for tick in seat.history if tick < ack]:
+                    del seat.history[tick]
+        elif kind == BYE:
+            self.leave(seat)
+
+    def hello(self, seat, address):
+        # Join, or rejoin with fresh lives after a game over. Clients repeat
+        # HELLO until WELCOME arrives, so this must be idempotent.
+        if seat is None:
+            taken = {s.player_id for s in self.world.seats.values()}
+            free = [i for i in range(1, self.max_players + 1) if i not in taken]
+            if not free:
+                return
+            seat = Seat(free[0], address, self.loop.time())
+            self.world.seats[seat.player_id] = seat
+            self.seats_by_address[address] = seat
+        if seat.player is None:
+            seat.lives = PLAYER_LIVES
+            seat.score = 0
+            self.world.spawn_ship(seat)
+        seat.last_heard = self.loop.time()
+        self.send(WELCOME_MESSAGE.pack(WELCOME, seat.player_id, self.rate), address)
+
+    def leave(self, seat):
+        self.world.remove_ship(seat)
+        del self.world.seats[seat.player_id]
+        del self.seats_by_address[seat.address]
+
+    def step(self):
+        self.tick += 1
+        self.world.step(1 / self.rate)
+        if self.tick % self.snapshot_every == 0:
+            now = self.loop.time()
+            for seat in list(self.world.seats.values()):
+                if now - seat.last_heard > SEAT_TIMEOUT:
+                    self.leave(seat)
+            self.send_snapshots()
+
+    def send_snapshots(self):
+        current = self.records.update(self.world.entities(), self.tick)
+        for seat in self.world.seats.values():
+            base = seat.history.get(seat.acked)
+            base_tick = seat.acked if base is not None else 0
+            view = base or {}
+            records, removed = diff(view, current, sent=seat.in_flight)
+            seat.history[self.tick] = apply(view, records, removed)
+            # Ids gone from the field that the acked view never had need no removal
+            gone = [net_id for net_id in seat.in_flight if net_id not in current and net_id not in view]
+            seat.in_flight = apply(seat.in_flight, records, removed + gone)
+            while len(seat.history) > SNAPSHOT_HISTORY:
+                del seat.history[next(iter(seat.history))]
+            data = pack_snapshot(self.tick, base_tick, seat.score, max(0, seat.lives), records, removed)
+            self.send(data, seat.address)
+            self.snapshots_sent += 1
+
+    async def run(self, duration=None):
+        # Fixed-rate loop; a late wakeup runs the missed steps, up to a limit
+        loop = self.loop
+        started = next_step = loop.time()
+        while duration is None or loop.time() - started < duration:
+            for _ in range(MAX_CATCHUP_STEPS):
+                if loop.time() < next_step:
+                    break
+                self.step()
+                next_step += 1 / self.rate
+            else:
+                next_step = loop.time()  # too far behind; drop the backlog
+            await asyncio.sleep(max(0.0, next_step - loop.time()))
+
+
+async def serve(host, port, world, **options):
+    # Binds the server socket; returns (transport, GameServer)
+    loop = asyncio.get_running_loop()
+    return await loop.create_datagram_endpoint(
+        lambda: GameServer(world, **options), local_addr=(host, port)
+    )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Asteroids multiplayer server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9999)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--array-physics", action="store_true")
+    parser.add_argument("--snapshot-rate", type=float, default=20, help="snapshots per second to each client")
+    parser.add_argument("--max-players", type=int, default=MAX_PLAYERS)
+    parser.add_argument("--loss", type=float, default=0.0, help="fraction of outgoing packets to drop")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every outgoing packet")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra seconds per packet")
+    return parser.parse_args(argv)
+
+
+async def main_async(args):
+    world = ServerWorld(seed=args.seed, array_physics=args.array_physics)
+    transport, server = await serve(
+        args.host,
+        args.port,
+        world,
+        snapshot_rate=args.snapshot_rate,
+        max_players=args.max_players,
+        conditions=NetworkConditions(args.loss, args.latency, args.jitter),
+    )
+    print(f"Serving on {args.host}:{transport.get_extra_info('sockname')[1]}")
+    try:
+        await server.run()
+    finally:
+        transport.close()
+
+
+def main(argv=None):
+    try:
+        asyncio.run(main_async(parse_args(argv)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
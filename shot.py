@@ -1,14 +1,18 @@
 from circleshape import CircleShape
-from constants import SHOT_RADIUS, SCREEN_WIDTH, SCREEN_HEIGHT
-import pygame
+from constants import SHOT_RADIUS, SHOT_POOL_SIZE, SCREEN_WIDTH, SCREEN_HEIGHT
+from pool import Pool
+from spritecache import atlas
 
 
 class Shot(CircleShape):
     def __init__(self, x, y):
         super().__init__(x, y, SHOT_RADIUS)
 
-    def draw(self, screen):
-        pygame.draw.circle(screen, "white", self.position, self.radius, 2)
+    def reset(self, x, y):
+        super().reset(x, y, SHOT_RADIUS)
+
+    def blits(self):
+        return [atlas.blit_at(atlas.circle(self.radius, "white", 2), self.render_position())]
 
     def update(self, dt):
         self.position += self.velocity * dt
@@ -22,3 +26,6 @@ class Shot(CircleShape):
             self.position.y = 0
         elif self.position.y < 0:
             self.position.y = SCREEN_HEIGHT
+
+
+Shot.pool = Pool(Shot, SHOT_POOL_SIZE)
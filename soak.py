@@ -0,0 +1,250 @@
+"""Long headless sessions that check memory and frame time stay flat.
+
+    python soak.py --hours 2 --pilot scripted --interval 60
+
+A World is flown by a pilot from bots.py for the given number of simulated
+hours and restarted after every game over. The default pilot takes turns
+aiming and firing, evading and idling. Each step is timed, including
+drawing onto an offscreen surface unless --no-draw is given. Every
+`--interval` simulated seconds a sample is taken of:
+
+    traced memory     tracemalloc's current total, after a gc pass
+    group sizes       asteroids, shots, power-ups, updatable, drawable
+    pool free lists   spare pooled asteroids and shots
+    frame time        percentiles of the steps since the previous sample
+
+Once the first `--warmup` fraction of samples is past and caches and
+pools have filled, a least-squares slope per simulated hour is fitted to
+traced memory, entity count and p95 frame time. The run fails (exit code
+1) when any slope is over its limit. The allocation sites that grew the
+most after the warm-up are listed to help find a leak.
+
+Tracing every allocation makes each step several times slower, so frame
+times are only comparable within one soak run, which is all the trend
+needs. Events below --log-level (warning by default) are not logged. At
+info level, the event log's ring buffer keeps filling for the first few
+hours of play, which would read as growth.
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from benchmark import summarize
+from bots import PILOTS
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from eventlog import event_log, LEVELS, WARNING
+from spritecache import draw_sprites
+from world import World
+
+RESULTS_FILE = "soak_results.json"
+STEP_DT = 1 / 60
+HOUR = 3600.0
+# Largest allowed growth per simulated hour, after the warm-up
+MAX_MEMORY_GROWTH = 512 * 1024  # bytes
+MAX_ENTITY_GROWTH = 100  # drawable sprites
+MAX_FRAME_GROWTH = 0.5  # fraction of the mean p95 frame time
+
+
+def slope(xs, ys):
+    # Least-squares slope of ys over xs
+    count = len(xs)
+    if count < 2:
+        return 0.0
+    mean_x, mean_y = sum(xs) / count, sum(ys) / count
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    if not spread:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / spread
+
+
+def take_sample(world, sim_time, frame_times, games):
+    gc.collect()
+    traced, peak = tracemalloc.get_traced_memory()
+    return {
+        "sim_time": sim_time,
+        "traced_bytes": traced,
+        "peak_bytes": peak,
+        "games": games,
+        "groups": {
+            "asteroids": len(world.asteroids),
+            "shots": len(world.shots),
+            "powerups": len(world.powerups_group),
+            "updatable": len(world.updatable),
+            "drawable": len(world.drawable),
+        },
+        "pool_free": {
+            "asteroids": len(world.asteroid_field.asteroid_class.pool.free),
+            "shots": len(world.player.shot_class.pool.free),
+        },
+        "frame": summarize(frame_times) if frame_times else None,
+    }
+
+
+def trends(samples, warmup=0.25):
+    # Growth per simulated hour over the samples after the warm-up
+    steady = [sample for sample in samples[int(len(samples) * warmup) :] if sample["frame"]]
+    hours = [sample["sim_time"] / HOUR for sample in steady]
+    p95 = [sample["frame"]["p95_ms"] for sample in steady]
+    mean_p95 = sum(p95) / len(p95) if p95 else 0.0
+    return {
+        "samples": len(steady),
+        "memory_bytes_per_hour": slope(hours, [sample["traced_bytes"] for sample in steady]),
+        "entities_per_hour": slope(hours, [sample["groups"]["drawable"] for sample in steady]),
+        "p95_ms_per_hour": slope(hours, p95),
+        "p95_growth_per_hour": slope(hours, p95) / mean_p95 if mean_p95 else 0.0,
+    }
+
+
+def check(trend, max_memory=MAX_MEMORY_GROWTH, max_entities=MAX_ENTITY_GROWTH, max_frame=MAX_FRAME_GROWTH):
+    # Descriptions of every trend over its limit
+    failures = []
+    if trend["memory_bytes_per_hour"] > max_memory:
+        failures.append(f"traced memory grows {trend['memory_bytes_per_hour'] / 1024:.0f} KiB/hour")
+    if trend["entities_per_hour"] > max_entities:
+        failures.append(f"entity count grows {trend['entities_per_hour']:.0f}/hour")
+    if trend["p95_growth_per_hour"] > max_frame:
+        failures.append(f"p95 frame time grows {trend['p95_growth_per_hour']:.0%}/hour")
+    return failures
+
+
+def run(
+    hours=1.0,
+    pilot="scripted",
+    seed=0,
+    interval=60.0,
+    warmup=0.25,
+    draw=True,
+    dt=STEP_DT,
+    log=None,
+    log_level=WARNING,
+):
+    world = World(seed=seed)
+    bot = PILOTS[pilot](random.Random(seed ^ 0x5EED))
+    surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)) if draw else None
+    clock = time.perf_counter
+
+    level, event_log.level = event_log.level, log_level
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    samples = [take_sample(world, 0.0, [], 1)]
+    baseline = None
+    frame_times = []
+    games = 1
+    sim_time = 0.0  # world.elapsed starts over with every game
+    steps = round(hours * HOUR / dt)
+    steps_per_sample = max(1, round(interval / dt))
+    started = clock()
+    try:
+        for i in range(1, steps + 1):
+            start = clock()
+            world.step(dt, bot.inputs(world))
+            if surface:
+                surface.fill("#000000")
+                draw_sprites(surface, world.drawable)
+            frame_times.append(clock() - start)
+            sim_time += dt
+            if world.game_over:
+                world.reset()
+                games += 1
+
+            if i % steps_per_sample == 0:
+                samples.append(take_sample(world, sim_time, frame_times, games))
+                frame_times = []
+                if log:
+                    log(samples[-1])
+                if baseline is None and len(samples) > (steps // steps_per_sample) * warmup:
+                    baseline = tracemalloc.take_snapshot()
+        growth = []
+        if baseline:
+            stats = tracemalloc.take_snapshot().compare_to(baseline, "lineno")
+            growth = [
+                {"site": str(stat.traceback), "size_diff": stat.size_diff, "count_diff": stat.count_diff}
+                for stat in stats[:10]
+                if stat.size_diff > 0
+            ]
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+        event_log.level = level
+
+    return {
+        "meta": {"hours": hours, "pilot": pilot, "seed": seed, "interval": interval, "draw": draw},
+        "wall_seconds": clock() - started,
+        "samples": samples,
+        "trends": trends(samples, warmup),
+        "growth": growth,
+    }
+
+
+def print_sample(sample):
+    seconds = round(sample["sim_time"])
+    frame = sample["frame"]
+    print(
+        f"{seconds // 3600:3d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+        f"  mem {sample['traced_bytes'] / 2**20:7.2f} MiB"
+        f"  entities {sample['groups']['drawable']:4d}"
+        f"  p50 {frame['p50_ms']:6.3f} ms  p95 {frame['p95_ms']:6.3f} ms  p99 {frame['p99_ms']:6.3f} ms"
+        f"  games {sample['games']}"
+    )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Asteroids soak test")
+    parser.add_argument("--hours", type=float, default=1.0, help="simulated hours to play")
+    parser.add_argument("--pilot", choices=sorted(PILOTS), default="scripted")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--interval", type=float, default=60.0, help="simulated seconds between samples")
+    parser.add_argument("--warmup", type=float, default=0.25, help="fraction of samples left out of the trends")
+    parser.add_argument("--log-level", choices=list(LEVELS), default="warning")
+    parser.add_argument("--no-draw", action="store_true", help="time the simulation only")
+    parser.add_argument("--max-memory-growth", type=float, default=MAX_MEMORY_GROWTH, help="bytes per hour")
+    parser.add_argument("--max-entity-growth", type=float, default=MAX_ENTITY_GROWTH, help="sprites per hour")
+    parser.add_argument(
+        "--max-frame-growth", type=float, default=MAX_FRAME_GROWTH, help="p95 frame time growth per hour, 0.5 = 50%%"
+    )
+    parser.add_argument("--output", default=RESULTS_FILE, help="write samples and trends as JSON to this file")
+    parser.add_argument("--quiet", action="store_true", help="don't print every sample")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = run(
+        args.hours,
+        args.pilot,
+        args.seed,
+        args.interval,
+        args.warmup,
+        draw=not args.no_draw,
+        log=None if args.quiet else print_sample,
+        log_level=LEVELS[args.log_level],
+    )
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    trend = results["trends"]
+    print(
+        f"{results['wall_seconds']:.0f} s wall for {args.hours:g} simulated hours; per hour after warm-up:"
+        f" memory {trend['memory_bytes_per_hour'] / 1024:+.1f} KiB,"
+        f" entities {trend['entities_per_hour']:+.1f},"
+        f" p95 frame {trend['p95_ms_per_hour']:+.3f} ms ({trend['p95_growth_per_hour']:+.0%})"
+    )
+    for entry in results["growth"][:5]:
+        print(f"  {entry['size_diff']:+9d} B {entry['count_diff']:+6d} blocks  {entry['site']}")
+    failures = check(trend, args.max_memory_growth, args.max_entity_growth, args.max_frame_growth)
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+import math
+from constants import ASTEROID_MAX_RADIUS, SCREEN_WIDTH, SCREEN_HEIGHT
+
+
+class SpatialHash:
+    """Uniform grid broadphase over the wrap-around playfield.
+
+    Shapes are bucketed by the cells their bounding circle covers. Cell
+    coordinates wrap around the screen edges, so shapes that sit just off
+    screen (freshly spawned asteroids) or straddle an edge still land in
+    the right buckets. Cells are stretched to tile the screen exactly,
+    so the grid wraps where the playfield does.
+    """
+
+    def __init__(self, cell_size=ASTEROID_MAX_RADIUS * 2, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+        self.cols = max(1, math.ceil(width / cell_size))
+        self.rows = max(1, math.ceil(height / cell_size))
+        self.cell_width = width / self.cols
+        self.cell_height = height / self.rows
+        self.cells = {}
+        self.order = {}  # shape -> insertion index, keeps results in group order
+
+    def clear(self):
+        self.cells.clear()
+        self.order.clear()
+
+    def _keys(self, x, y, reach):
+        width, height = self.cell_width, self.cell_height
+        x0 = math.floor((x - reach) / width)
+        x1 = math.floor((x + reach) / width)
+        y0 = math.floor((y - reach) / height)
+        y1 = math.floor((y + reach) / height)
+
+        # A shape wider than the grid covers every column/row exactly once
+        if x1 - x0 + 1 >= self.cols:
+            xs = range(self.cols)
+        else:
+            xs = [cx % self.cols for cx in range(x0, x1 + 1)]
+        if y1 - y0 + 1 >= self.rows:
+            ys = range(self.rows)
+        else:
+            ys = [cy % self.rows for cy in range(y0, y1 + 1)]
+
+        return [cy * self.cols + cx for cy in ys for cx in xs]
+
+    def _reach(self, shape, dt):
+        # With `dt` the bounds also cover the path travelled over the last dt seconds
+        if dt:
+            return shape.radius + shape.velocity.length() * dt
+        return shape.radius
+
+    def insert(self, shape, dt=0):
+        if shape in self.order:
+            return
+        self.order[shape] = len(self.order)
+        for key in self._keys(shape.position.x, shape.position.y, self._reach(shape, dt)):
+            bucket = self.cells.get(key)
+            if bucket is None:
+                self.cells[key] = [shape]
+            else:
+                bucket.append(shape)
+
+    def rebuild(self, *groups, dt=0):
+        self.clear()
+        for group in groups:
+            for shape in group:
+                self.insert(shape, dt)
+
+    def candidates(self, shape, group=None, dt=0):
+        # Shapes sharing at least one cell with `shape`, in insertion order.
+        # When `group` is given only its members are returned.
+        found = set()
+        cells = self.cells
+        for key in self._keys(shape.position.x, shape.position.y, self._reach(shape, dt)):
+            bucket = cells.get(key)
+            if bucket:
+                found.update(bucket)
+        found.discard(shape)
+        if group is not None:
+            found = [other for other in found if other in group]
+        return sorted(found, key=self.order.__getitem__)
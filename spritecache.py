@@ -0,0 +1,98 @@
+import math
+import pygame
+from constants import SHIP_ROTATION_STEPS
+
+
+class SpriteAtlas:
+    """Pre-rendered surfaces for everything the game draws.
+
+    Circles are rendered once per radius, colour and line width. Ship
+    triangles are rendered once per colour and per quantized rotation
+    (`rotation_steps` variants around the full circle).
+    """
+
+    def __init__(self, rotation_steps=SHIP_ROTATION_STEPS):
+        self.rotation_steps = rotation_steps
+        self.circles = {}
+        self.ships = {}
+        self.colors = {}  # colour as passed in -> its RGBA tuple
+
+    def _color(self, color):
+        # One dict lookup per draw instead of building a pygame.Color, while
+        # "white" and (255, 255, 255) still share entries
+        try:
+            return self.colors[color]
+        except KeyError:
+            rgba = self.colors[color] = tuple(pygame.Color(color))
+            return rgba
+        except TypeError:  # pygame.Color isn't hashable
+            return tuple(color)
+
+    def _surface(self, size):
+        surface = pygame.Surface((size, size), pygame.SRCALPHA)
+        return surface
+
+    def _finish(self, surface):
+        # Match the display's pixel format when there is one, for faster blits
+        if pygame.display.get_init() and pygame.display.get_surface():
+            return surface.convert_alpha()
+        return surface
+
+    def circle(self, radius, color, width=0):
+        key = (radius, self._color(color), width)
+        surface = self.circles.get(key)
+        if surface is None:
+            half = math.ceil(radius) + 1
+            surface = self._surface(half * 2)
+            pygame.draw.circle(surface, color, (half, half), radius, width)
+            surface = self._finish(surface)
+            self.circles[key] = surface
+        return surface
+
+    def ship(self, radius, color, rotation):
+        step = round(rotation * self.rotation_steps / 360) % self.rotation_steps
+        key = (radius, self._color(color), step)
+        surface = self.ships.get(key)
+        if surface is None:
+            half = radius + 2
+            surface = self._surface(half * 2)
+            angle = step * 360 / self.rotation_steps
+            center = pygame.Vector2(half, half)
+            forward = pygame.Vector2(0, 1).rotate(angle)
+            right = pygame.Vector2(0, 1).rotate(angle + 90) * radius / 1.5
+            points = [
+                center + forward * radius,
+                center - forward * radius - right,
+                center - forward * radius + right,
+            ]
+            pygame.draw.polygon(surface, color, points, 2)
+            surface = self._finish(surface)
+            self.ships[key] = surface
+        return surface
+
+    def blit_at(self, surface, center):
+        # (surface, top-left) pair that centres `surface` on `center`
+        half = surface.get_width() / 2
+        return surface, (center[0] - half, center[1] - half)
+
+    def clear(self):
+        # Needed after the display mode changes, since surfaces were converted for it
+        self.circles.clear()
+        self.ships.clear()
+
+
+atlas = SpriteAtlas()
+
+
+def sprite_blits(sprites):
+    # Every sprite's (surface, destination) pairs in one flat list
+    batch = []
+    for sprite in sprites:
+        batch.extend(sprite.blits())
+    return batch
+
+
+def draw_sprites(surface, sprites, doreturn=False):
+    # Draw every sprite with a single Surface.blits() call; with `doreturn`
+    # the list of touched rects is returned
+    return surface.blits(sprite_blits(sprites), doreturn)
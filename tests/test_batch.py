@@ -0,0 +1,46 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+
+import batch
+
+CONFIG = {"pilot": "spin", "max_time": 5.0, "params": {"spawn_rate": 0.2}}
+
+
+def test_games_are_reproducible():
+    assert batch.run_game(3, "random", max_time=5.0) == batch.run_game(3, "random", max_time=5.0)
+
+
+def test_histogram_counts_every_value():
+    hist = batch.histogram([0, 1, 2, 3, 10], bins=5)
+    assert sum(hist["counts"]) == 5
+    assert hist["counts"][-1] == 1
+    assert len(hist["edges"]) == 6
+
+
+def test_checkpoint_resume(tmp_path):
+    checkpoint = str(tmp_path / "sweep.jsonl")
+    first = batch.run_batch(range(3), CONFIG, workers=2, checkpoint=checkpoint)
+    assert sorted(s["seed"] for s in first) == [0, 1, 2]
+
+    streamed = []
+    resumed = batch.run_batch(range(5), CONFIG, workers=2, checkpoint=checkpoint, on_result=streamed.append)
+    assert sorted(s["seed"] for s in streamed) == [3, 4]
+    assert sorted(s["seed"] for s in resumed) == list(range(5))
+    assert batch.aggregate(resumed)["games"] == 5
+
+
+def test_resume_after_torn_line(tmp_path):
+    checkpoint = str(tmp_path / "sweep.jsonl")
+    batch.run_batch(range(2), CONFIG, workers=1, checkpoint=checkpoint)
+    with open(checkpoint, "a") as f:
+        f.write('{"seed": 2, "sc')  # crash mid-write
+
+    batch.run_batch(range(3), CONFIG, workers=1, checkpoint=checkpoint)
+    streamed = []
+    resumed = batch.run_batch(range(4), CONFIG, workers=1, checkpoint=checkpoint, on_result=streamed.append)
+    assert [s["seed"] for s in streamed] == [3]
+    assert sorted(s["seed"] for s in resumed) == list(range(4))
+    with open(checkpoint) as f:
+        assert len(f.readlines()) == 5  # header and one row per seed
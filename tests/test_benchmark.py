@@ -0,0 +1,31 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+import pygame
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+import benchmark
+
+
+def test_scenarios_are_seeded():
+    spec = benchmark.SCENARIOS["shots_vs_asteroids"]
+    first = benchmark.build_world(spec, seed=3)
+    second = benchmark.build_world(spec, seed=3)
+    positions = lambda world: sorted((a.position.x, a.position.y, a.radius) for a in world.asteroids)
+    assert positions(first) == positions(second)
+    assert len(first.shots) == spec["shots"]
+
+
+def test_run_reports_every_phase_and_detects_regressions():
+    results = benchmark.run(["spread_burst"], seed=0, frames=5)
+    phases = results["scenarios"]["spread_burst"]
+    assert set(benchmark.PHASES) <= set(phases)
+
+    baseline = {"scenarios": {"spread_burst": {
+        phase: dict(phases[phase], p50_ms=phases[phase]["p50_ms"] / 10) for phase in benchmark.PHASES
+    }}}
+    assert benchmark.compare(results, results, tolerance=0.5) == []
+    regressed = {phase for _, phase, _, _ in benchmark.compare(results, baseline, tolerance=0.5)}
+    assert "frame" in regressed
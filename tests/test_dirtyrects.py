@@ -0,0 +1,37 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+import pygame
+pygame.init()
+
+from asteroid import Asteroid
+from dirtyrects import DirtyRectRenderer
+
+
+def test_partial_update_then_full_fallback(monkeypatch):
+    screen = pygame.display.set_mode((400, 400))
+    calls = []
+    monkeypatch.setattr(pygame.display, "flip", lambda: calls.append("flip"))
+    monkeypatch.setattr(pygame.display, "update", lambda rects: calls.append(list(rects)))
+
+    renderer = DirtyRectRenderer(screen, threshold=0.5)
+    group = pygame.sprite.Group()
+    rock = Asteroid(100, 100, 20)
+    group.add(rock)
+
+    for _ in range(2):
+        renderer.begin()
+        renderer.draw_sprites(group)
+        renderer.present()
+    assert calls[0] == "flip"  # first frame is always full
+    assert isinstance(calls[1], list) and len(calls[1]) == 2
+
+    # The old position is erased when the rock moves
+    rock.position = pygame.Vector2(300, 300)
+    renderer.begin()
+    assert screen.get_at((119, 100)) == pygame.Color("black")
+    renderer.draw_sprites(group)
+    renderer.blit(pygame.Surface((400, 300)), (0, 0))
+    renderer.present()
+    assert calls[-1] == "flip"
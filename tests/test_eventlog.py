@@ -0,0 +1,58 @@
+import json
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from eventlog import EventLog, DEBUG, INFO, WARNING
+
+
+class Exploding:
+    def __str__(self):
+        raise AssertionError("formatted a record below the log level")
+
+
+def test_disabled_levels_are_not_formatted():
+    log = EventLog(level=INFO)
+    log.debug("noise", value=Exploding())
+    log.info("kept", value=1)
+    assert [record[2] for record in log.recent()] == ["kept"]
+
+
+def test_ring_buffer_drops_oldest():
+    log = EventLog(capacity=3)
+    for i in range(5):
+        log.info("tick", i=i)
+    assert [record[3]["i"] for record in log.recent()] == [2, 3, 4]
+    assert log.dropped == 2
+
+
+def test_background_flush_writes_json_lines(tmp_path):
+    path = tmp_path / "events.jsonl"
+    log = EventLog(level=DEBUG, flush_interval=0.01)
+    log.open(str(path))
+    log.warning("powerup_spawned", kind="shield", x=1.5, y=2.0)
+    log.debug("vector", position=(3, 4))
+    log.close()
+    entries = [json.loads(line) for line in path.read_text().splitlines()]
+    assert entries[0]["event"] == "powerup_spawned"
+    assert entries[0]["level"] == "warning"
+    assert entries[0]["kind"] == "shield"
+    assert entries[1]["position"] == [3, 4]
+    assert not log.recent()
+
+
+def test_filtered_hot_path_fields_are_not_computed(monkeypatch):
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    from eventlog import event_log
+    from player import Player
+    from powerup import ShieldPowerUp
+    from world import World
+
+    def explode(player):
+        raise AssertionError("computed a field for a filtered event")
+    monkeypatch.setattr(Player, "powerup_timer", property(explode))
+    monkeypatch.setattr(event_log, "level", WARNING)
+    world = World(spawn_rate=10**9)
+    ShieldPowerUp(world.player.position.x, world.player.position.y)
+    world.step(1 / 60)
+    assert world.powerups_collected == 1
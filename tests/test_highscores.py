@@ -0,0 +1,14 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from highscores import load_high_scores
+
+
+def test_load_missing_or_corrupt_file(tmp_path):
+    path = tmp_path / "scores.json"
+    assert load_high_scores(str(path)) == []
+    path.write_text("[30, 2")
+    assert load_high_scores(str(path)) == []
+    path.write_text("[30, 20]")
+    assert load_high_scores(str(path)) == [30, 20]
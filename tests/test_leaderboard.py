@@ -0,0 +1,99 @@
+import json
+import os
+import sys
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from leaderboard import Leaderboard
+
+
+def test_queries(tmp_path):
+    board = Leaderboard(str(tmp_path / "board.db"))
+    board.record("ann", 50, 30.0, 1)
+    board.record("bob", 120, 60.0, 2)
+    board.record("ann", 90, 45.0, 0)
+    board.record("cid", 90, 20.0, 0)
+
+    assert [run.score for run in board.top(3)] == [120, 90, 90]
+    assert board.player_best("ann").score == 90
+    assert board.player_best("nobody") is None
+    assert board.rank_of(120) == 1
+    assert board.rank_of(90) == 2
+    assert board.rank_of(60) == 4
+    assert board.count() == 4
+
+
+def test_import_scores_json_once(tmp_path):
+    scores = tmp_path / "scores.json"
+    scores.write_text(json.dumps([70, 40]))
+    board = Leaderboard(str(tmp_path / "board.db"))
+    assert board.import_json(str(scores)) == 2
+    assert board.import_json(str(scores)) == 0
+    assert [run.score for run in board.top()] == [70, 40]
+
+
+def test_queries_use_indexes(tmp_path):
+    board = Leaderboard(str(tmp_path / "board.db"))
+    board.record_many((f"p{i % 100}", i % 5000, 0.0, 1.0, 0) for i in range(20000))
+    db = board.connection()
+    plans = [
+        " ".join(row[-1] for row in db.execute("EXPLAIN QUERY PLAN " + sql, args))
+        for sql, args in [
+            ("SELECT score FROM runs ORDER BY score DESC LIMIT 5", ()),
+            ("SELECT score FROM runs WHERE player = ? ORDER BY score DESC LIMIT 1", ("p1",)),
+        ]
+    ]
+    assert all("INDEX" in plan and "TEMP B-TREE" not in plan for plan in plans)
+    assert board.rank_of(4999) == 1
+    assert board.player_best("p1").score == 4901
+
+
+def test_failed_write_keeps_previous_runs(tmp_path):
+    board = Leaderboard(str(tmp_path / "board.db"))
+    board.record("ann", 10, 5.0)
+
+    def runs():
+        yield ("bob", 99, 0.0, 5.0, 0)
+        raise OSError("disk full")
+    try:
+        board.record_many(runs())
+    except OSError:
+        pass
+    # The batch is one transaction: none of it is kept, and the old run survives
+    assert [run.score for run in board.top()] == [10]
+    board.close()
+    assert [run.score for run in Leaderboard(str(tmp_path / "board.db")).top()] == [10]
+
+
+def test_boards_sharing_a_file_keep_every_run(tmp_path):
+    path = str(tmp_path / "board.db")
+    boards = [Leaderboard(path) for _ in range(2)]
+
+    def play(board, scores):
+        for score in scores:
+            board.record("p", score, 1.0)
+        board.close()
+
+    threads = [
+        threading.Thread(target=play, args=(boards[0], [10, 50, 30])),
+        threading.Thread(target=play, args=(boards[1], [20, 40, 60])),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert [run.score for run in Leaderboard(path).top()] == [60, 50, 40, 30, 20]
+
+
+def test_reads_do_not_wait_for_a_writer(tmp_path):
+    path = str(tmp_path / "board.db")
+    writer, reader = Leaderboard(path), Leaderboard(path)
+    writer.record("ann", 10, 5.0)
+    db = writer.connection()
+    db.execute("BEGIN IMMEDIATE")  # another instance mid-write holds the lock
+    db.execute("INSERT INTO runs (player, score, finished_at, duration) VALUES ('bob', 99, 0, 0)")
+    start = time.perf_counter()
+    assert [run.score for run in reader.top()] == [10]
+    assert time.perf_counter() - start < 1.0  # well under busy_timeout
+    db.rollback()
@@ -0,0 +1,151 @@
+import asyncio
+import os
+import random
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+import pygame
+
+from client import connect
+from netcode import (
+    ASTEROID,
+    SHIP,
+    RECORD,
+    MAX_SNAPSHOT_RECORDS,
+    DRIFT_TOLERANCE,
+    EntityRecords,
+    NetworkConditions,
+    apply,
+    diff,
+    extrapolate,
+    pack_snapshot,
+    unpack_snapshot,
+)
+from player import PlayerInput
+from server import Seat, ServerWorld, serve
+from world import UNLIMITED
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+
+
+def seated_world(asteroids, seed=1):
+    world = ServerWorld(seed=seed, limits=UNLIMITED, spawn_rate=10**9)
+    rng = random.Random(seed)
+    for _ in range(asteroids):
+        world.asteroid_field.spawn(
+            20 * rng.randint(1, 3),
+            pygame.Vector2(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT)),
+            pygame.Vector2(rng.uniform(40, 100), 0).rotate(rng.uniform(0, 360)),
+        )
+    seat = Seat(1, None, 0.0)
+    world.seats[1] = seat
+    world.spawn_ship(seat)
+    seat.player.position.update(-1000, -1000)  # out of harm's way
+    return world, seat
+
+
+def delta_sizes(asteroids, snapshots=60):
+    # Bytes per snapshot for a client that acknowledges every one
+    world, _ = seated_world(asteroids)
+    records = EntityRecords(60)
+    view, sizes = {}, []
+    for tick in range(1, snapshots * 3 + 1):
+        world.step(1 / 60)
+        if tick % 3:
+            continue
+        current = records.update(world.entities(), tick)
+        changed, removed = diff(view, current)
+        data = pack_snapshot(tick, 1, 0, 3, changed, removed)
+        _, _, _, _, got, gone = unpack_snapshot(data)
+        view = apply(view, got, gone)
+        sizes.append(len(data))
+    return world, records, view, sizes
+
+
+def test_client_view_tracks_server():
+    world, records, view, _ = delta_sizes(40)
+    assert view == records.records
+    tick = 180
+    for sprite, net_id in records.ids.items():
+        x, y = extrapolate(view[net_id], tick, 60)
+        dx = (sprite.position.x - x + SCREEN_WIDTH / 2) % SCREEN_WIDTH - SCREEN_WIDTH / 2
+        dy = (sprite.position.y - y + SCREEN_HEIGHT / 2) % SCREEN_HEIGHT - SCREEN_HEIGHT / 2
+        assert dx * dx + dy * dy <= DRIFT_TOLERANCE ** 2
+
+
+def test_bandwidth_stays_flat_with_asteroid_count():
+    _, _, _, small = delta_sizes(50)
+    _, _, _, large = delta_sizes(400)
+    steady_small = sum(small[20:]) / len(small[20:])
+    steady_large = sum(large[20:]) / len(large[20:])
+    assert steady_large < 1200  # well under one MTU, though a full snapshot is ~7 KB
+    assert steady_large < RECORD.size * 400 / 5
+    assert steady_large < steady_small * 8
+
+
+def test_unacked_records_do_not_starve_the_rest():
+    # No acks arrive, so every snapshot is a delta against the empty view
+    world, _ = seated_world(150)
+    current = EntityRecords(60).update(world.entities(), 1)
+    in_flight, delivered = {}, set()
+    for _ in range(3):
+        records, removed = diff({}, current, sent=in_flight)
+        in_flight = apply(in_flight, records, removed)
+        delivered.update(record[0] for record in records)
+    assert delivered == set(current)
+
+
+def test_mass_removal_stays_inside_the_snapshot_budget():
+    # The client still holds 800 entities that were all cleared at once
+    world, _ = seated_world(100)
+    current = EntityRecords(60).update(world.entities(), 1)
+    stale = next(iter(current.values()))
+    view = {net_id: (net_id,) + stale[1:] for net_id in range(1000, 1800)}
+    full = len(pack_snapshot(1, 0, 0, 3, [stale] * MAX_SNAPSHOT_RECORDS, []))
+    snapshots = 0
+    while view != current:
+        records, removed = diff(view, current)
+        assert len(pack_snapshot(1, 0, 0, 3, records, removed)) <= full
+        view = apply(view, records, removed)
+        snapshots += 1
+    assert snapshots <= 4
+
+
+def test_server_sweeps_shots_over_the_current_step():
+    world, seat = seated_world(0)
+    world.continuous_collision = True
+    world.asteroid_field.spawn(20, pygame.Vector2(100, 300), pygame.Vector2(0, 0))
+    # The shot flew through the asteroid during this 10 Hz step
+    shot = seat.player.shot_class.pool.acquire(100, 340)
+    shot.velocity = pygame.Vector2(0, 500)
+    world.step(0.1)
+    assert world.score == 10
+
+
+def test_localhost_session_with_loss_and_latency():
+    async def session():
+        world = ServerWorld(seed=5)
+        bad_network = lambda seed: NetworkConditions(loss=0.2, latency=0.02, jitter=0.02, rng=random.Random(seed))
+        server_transport, server = await serve("127.0.0.1", 0, world, snapshot_rate=20, conditions=bad_network(0))
+        port = server_transport.get_extra_info("sockname")[1]
+        clients = [await connect("127.0.0.1", port, bad_network(seed)) for seed in (1, 2)]
+        run = asyncio.ensure_future(server.run(duration=2.0))
+        while not run.done():
+            for _, client in clients:
+                if client.welcomed.is_set():
+                    client.send_input(PlayerInput(fire=True, right=True))
+            await asyncio.sleep(1 / 60)
+        for transport, client in clients:
+            client.close()
+        server_transport.close()
+        return world, server, [client for _, client in clients]
+
+    world, server, clients = asyncio.run(session())
+    assert {client.player_id for client in clients} == {1, 2}
+    assert len(world.seats) == 2
+    for client in clients:
+        assert client.snapshots_received > 10
+        ships = {extra for kind, extra, *_ in client.entities() if kind == SHIP}
+        assert ships <= {1, 2} and client.player_id in ships
+        asteroids = sum(1 for kind, *_ in client.entities() if kind == ASTEROID)
+        assert abs(asteroids - len(world.asteroids)) <= 3
+    assert server.conditions.dropped > 0
@@ -0,0 +1,52 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+import pygame
+
+from particles import ParticleSystem
+from player import PlayerInput
+from world import World
+
+
+def test_emission_thins_out_as_the_budget_fills():
+    particles = ParticleSystem(budget=100, seed=1)
+    still = pygame.Vector2(0, 0)
+    particles.burst(pygame.Vector2(50, 50), still, 50)  # asks for 30
+    assert particles.count == 30
+    particles.burst(pygame.Vector2(50, 50), still, 50)
+    assert particles.count == 51  # 70% free: 21 of 30
+    for _ in range(20):
+        particles.burst(pygame.Vector2(50, 50), still, 50)
+    assert particles.count <= particles.budget
+    assert particles.emitted + particles.dropped == 22 * 30
+
+
+def test_update_moves_wraps_and_compacts_dead_particles():
+    particles = ParticleSystem(budget=64, seed=2)
+    particles.burst(pygame.Vector2(1, 1), pygame.Vector2(0, 0), 40)
+    count = particles.count
+    particles.life[: count // 2] = 0.05
+    particles.update(0.1)
+    assert particles.count == count - count // 2
+    live = particles.pos[: particles.count]
+    assert (live >= 0).all() and (live[:, 0] < 1280).all() and (live[:, 1] < 720).all()
+    assert len(particles.blits()) == particles.count
+
+
+def test_world_feeds_particles_without_changing_the_game():
+    plain, effects = World(seed=5), World(seed=5, particles=512)
+    asteroid_counts = []
+    for world in (plain, effects):
+        world.bind()
+        world.player.update(0.5, PlayerInput(forward=True))  # thrust
+        if world.particles:
+            assert world.particles.count > 0
+        world.asteroid_field.spawn(40, pygame.Vector2(100, 100), pygame.Vector2(10, 0))
+        for asteroid in list(world.asteroids):
+            asteroid.split(world.rng)
+        for _ in range(120):
+            world.step(1 / 60, PlayerInput(fire=True, left=True))
+        asteroid_counts.append(sorted((a.position.x, a.position.y) for a in world.asteroids))
+    assert asteroid_counts[0] == asteroid_counts[1]
+    assert effects.particles.emitted > 0 and effects.particles in effects.drawable
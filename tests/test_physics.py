@@ -0,0 +1,66 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+import pygame
+import pytest
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+pytest.importorskip("numpy")
+
+from physics import ArrayPhysics, ArrayAsteroid, ArrayShot
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+
+
+@pytest.fixture
+def groups():
+    physics = ArrayPhysics()
+    asteroids = pygame.sprite.Group()
+    shots = pygame.sprite.Group()
+    ArrayAsteroid.containers = (asteroids,)
+    ArrayShot.containers = (shots,)
+    yield physics, asteroids, shots
+    ArrayAsteroid.containers = None
+    ArrayShot.containers = None
+
+
+def test_step_integrates_and_wraps(groups):
+    physics, asteroids, shots = groups
+    a = ArrayAsteroid(SCREEN_WIDTH - 1, 10, 20)
+    a.velocity = pygame.Vector2(100, -200)
+    physics.step(0.1)
+    assert a.position.x == 0
+    assert a.position.y == SCREEN_HEIGHT
+
+
+def test_kill_detaches_and_keeps_state(groups):
+    physics, asteroids, shots = groups
+    first = ArrayAsteroid(10, 10, 20)
+    second = ArrayAsteroid(30, 40, 40)
+    first.kill()
+    assert physics.asteroids.count == 1
+    assert second.slot == 0
+    assert second.position == pygame.Vector2(30, 40)
+    assert first.position == pygame.Vector2(10, 10)
+    assert not first.alive()
+
+
+def test_split_spawns_array_fragments(groups):
+    physics, asteroids, shots = groups
+    rock = ArrayAsteroid(100, 100, 40)
+    rock.velocity = pygame.Vector2(50, 0)
+    fragments = rock.split()
+    assert len(fragments) == 2
+    assert all(isinstance(f, ArrayAsteroid) for f in fragments)
+    assert set(asteroids) == set(fragments)
+    assert physics.asteroids.count == 2
+
+
+def test_shot_hits(groups):
+    physics, asteroids, shots = groups
+    rock = ArrayAsteroid(100, 100, 20)
+    ArrayAsteroid(600, 300, 20)
+    hit = ArrayShot(110, 100)
+    ArrayShot(400, 400)
+    assert physics.shot_hits() == [(hit, [rock])]
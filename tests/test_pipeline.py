@@ -0,0 +1,84 @@
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+
+from pipeline import Frame, FrameBuffer, SimulationThread, ThreadTiming, timing_report
+from world import World
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        assert time.perf_counter() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_frame_buffer_flips_between_two_slots():
+    frames = FrameBuffer()
+    assert frames.latest() is None
+    first = Frame((), 0, 3, False, 0.0, 0, 1)
+    second = first._replace(step=2)
+    frames.publish(first)
+    frames.publish(second)
+    assert frames.latest() is second
+    assert first in frames.slots  # the previous frame is still intact
+    assert frames.published == 2
+
+
+def test_simulation_thread_publishes_frames_and_runs_commands():
+    world = World(seed=1)
+    sim = SimulationThread(world, world.step, rate=240)
+    sim.start()
+    try:
+        wait_for(lambda: sim.frames.latest().step >= 10)
+        frame = sim.frames.latest()
+        assert frame.blits  # at least the ship
+        assert frame.elapsed > 0
+
+        world.score = 1234
+        sim.call(world.reset)
+        wait_for(lambda: sim.frames.latest().score == 0)
+        sim.paused = True
+        time.sleep(0.05)  # let a step already under way finish
+        paused_at = sim.steps
+        time.sleep(0.05)
+        assert sim.steps == paused_at
+    finally:
+        sim.stop()
+    assert not sim.is_alive()
+    assert sim.timing.iterations > 0
+
+
+def test_resync_skips_the_steps_missed_during_a_jump():
+    world = World(seed=1)
+    sim = SimulationThread(world, world.step, rate=100, max_steps=1000)
+    jumped = []
+
+    def jump():
+        time.sleep(0.3)  # a slow restore, about 30 steps' worth
+        sim.resync()
+        jumped.append(sim.steps)
+
+    sim.start()
+    try:
+        wait_for(lambda: sim.steps >= 2)
+        sim.call(jump)
+        wait_for(lambda: jumped)
+        time.sleep(0.05)
+        assert sim.steps - jumped[0] < 15  # back at 100 Hz, no burst of catch-up steps
+    finally:
+        sim.stop()
+
+
+def test_timing_report_lists_threads_and_concurrency():
+    sim, render = ThreadTiming("simulation"), ThreadTiming("render")
+    for timing in (sim, render):
+        timing.begin()
+        time.sleep(0.01)
+        timing.end()
+    assert render.summary()["iterations"] == 1
+    assert render.summary()["busy_s"] >= 0.01
+    report = timing_report(sim, render)
+    assert "simulation" in report and "render" in report and "concurrency" in report
@@ -0,0 +1,50 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+import pygame
+
+from asteroid import Asteroid
+from pool import Pool
+from shot import Shot
+
+
+def test_release_then_acquire_reuses_instance():
+    pool = Pool(Shot, 4)
+    group = pygame.sprite.Group()
+    Shot.containers = (group,)
+    try:
+        shot = pool.acquire(10, 20)
+        shot.velocity = pygame.Vector2(5, 5)
+        pool.release(shot)
+        pool.release(shot)  # double release is ignored
+        assert len(group) == 0
+        again = pool.acquire(30, 40)
+        assert again is shot
+        assert again.alive()
+        assert again.position == pygame.Vector2(30, 40)
+        assert again.velocity == pygame.Vector2(0, 0)
+        assert pool.stats()["hits"] == 1
+        assert pool.stats()["misses"] == 1
+    finally:
+        Shot.containers = None
+
+
+def test_pool_size_limits_spares():
+    pool = Pool(Asteroid, 1)
+    first = pool.acquire(0, 0, 20)
+    second = pool.acquire(0, 0, 20)
+    pool.release(first)
+    pool.release(second)
+    assert pool.stats()["free"] == 1
+    assert pool.stats()["discarded"] == 1
+
+
+def test_held_releases_are_reused_after_recycle():
+    pool = Pool(Shot, 4)
+    shot = pool.acquire(0, 0)
+    pool.hold()
+    pool.release(shot)
+    assert pool.acquire(0, 0) is not shot
+    pool.recycle()
+    assert pool.acquire(0, 0) is shot
@@ -0,0 +1,81 @@
+import os
+import sys
+import json
+import time
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+import pygame
+
+from profiler import FrameProfiler, PHASE_NAMES, EVENTS, COLLISION, UPDATE, DRAW
+from textcache import text_cache
+from world import World
+
+
+def record(profiler, frames):
+    for _ in range(frames):
+        profiler.begin_frame()
+        profiler.mark(EVENTS)
+        profiler.mark(DRAW)
+        profiler.mark(DRAW)
+        profiler.end_frame(asteroids=3)
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = FrameProfiler(capacity=8)
+    record(profiler, 3)
+    assert profiler.count == 0
+    assert profiler.percentiles() == {}
+
+
+def test_ring_buffer_keeps_latest_frames():
+    profiler = FrameProfiler(capacity=4, enabled=True)
+    record(profiler, 10)
+    frames = list(profiler.frames())
+    assert len(frames) == 4
+    assert [start for start, _, _ in frames] == sorted(start for start, _, _ in frames)
+    assert set(profiler.percentiles()) == {"p50", "p95", "p99", "max"}
+    assert profiler.counts == {"asteroids": 3}
+
+
+def test_exports(tmp_path):
+    profiler = FrameProfiler(capacity=4, enabled=True)
+    record(profiler, 2)
+    csv_path = tmp_path / "profile.csv"
+    trace_path = tmp_path / "trace.json"
+    profiler.export_csv(csv_path)
+    profiler.export_chrome_trace(trace_path)
+
+    lines = csv_path.read_text().splitlines()
+    assert len(lines) == 3
+    assert lines[0].split(",")[2:] == [f"{name}_ms" for name in PHASE_NAMES]
+    events = json.loads(trace_path.read_text())["traceEvents"]
+    assert sum(1 for event in events if event["name"] == "frame") == 2
+    assert all(event["ph"] == "X" for event in events)
+
+
+def test_timers_are_not_counted_as_collision():
+    world = World(spawn_rate=10**9)
+    world.profiler = FrameProfiler(enabled=True)
+    world.scheduler.schedule(0.0, time.sleep, 0.02)
+    world.profiler.begin_frame()
+    world.step(1 / 60)
+    world.profiler.end_frame()
+    (_, phases, _), = world.profiler.frames()
+    assert phases[UPDATE] >= 0.02
+    assert phases[COLLISION] < 0.02
+
+
+def test_overlay_refreshes_a_few_times_a_second_outside_the_text_cache():
+    pygame.font.init()
+    font = pygame.font.Font(None, 24)
+    profiler = FrameProfiler(enabled=True)
+    record(profiler, 5)
+    cached = len(text_cache.surfaces)
+    drawn = []
+    profiler.draw_overlay(lambda surface, pos: drawn.append(surface), font)
+    first = list(drawn)
+    record(profiler, 5)
+    drawn.clear()
+    profiler.draw_overlay(lambda surface, pos: drawn.append(surface), font)
+    assert drawn == first  # same surfaces until the refresh interval passes
+    assert len(text_cache.surfaces) == cached
@@ -0,0 +1,49 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+import pygame
+pygame.init()
+
+from renderscale import ScaledRenderer, ResolutionController
+from spritecache import atlas
+
+
+def test_scaled_renderer_keeps_world_positions():
+    screen = pygame.display.set_mode((200, 100))
+    renderer = ScaledRenderer(screen, 0.5)
+    assert renderer.canvas.get_size() == (100, 50)
+    renderer.begin()
+    renderer.draw_blits([atlas.blit_at(atlas.circle(10, "white"), (150, 50))])
+    renderer.present()
+    assert screen.get_at((150, 50))[:3] == (255, 255, 255)
+    assert screen.get_at((50, 50))[:3] == (0, 0, 0)
+
+    renderer.set_scale(1.0)
+    assert renderer.canvas is screen and not renderer.scaled
+
+
+def test_controller_steps_down_when_slow_and_back_up_when_fast():
+    controller = ResolutionController(budget=1 / 60, scales=(0.5, 0.75, 1.0), window=4)
+    for _ in range(4):
+        controller.update(0.02)
+    assert controller.scale == 0.75
+    for _ in range(8):
+        controller.update(0.02)
+    assert controller.scale == 0.5  # and no lower
+    for _ in range(4):
+        controller.update(0.005)
+    assert controller.scale == 0.75
+
+
+def test_controller_backs_off_after_an_undone_step_up():
+    controller = ResolutionController(budget=1 / 60, scales=(0.5, 1.0), scale=0.5, window=2)
+    for frame_time in (0.005, 0.005, 0.02, 0.02):  # up, then straight back down
+        controller.update(frame_time)
+    assert controller.scale == 0.5 and controller.raise_after == 2
+    for _ in range(2):
+        controller.update(0.005)
+    assert controller.scale == 0.5  # needs a second good window now
+    for _ in range(2):
+        controller.update(0.005)
+    assert controller.scale == 1.0
@@ -0,0 +1,76 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+
+from scheduler import Scheduler
+from player import PlayerInput
+from powerup import RapidFirePowerUp, ShieldPowerUp
+from world import World
+
+
+def test_timers_fire_in_order_and_cancel():
+    scheduler = Scheduler()
+    fired = []
+    scheduler.at(2.0, fired.append, "b")
+    scheduler.at(1.0, fired.append, "a")
+    scheduler.at(2.0, fired.append, "c")
+    dropped = scheduler.at(1.5, fired.append, "x")
+    scheduler.cancel(dropped)
+    scheduler.advance(1.0)
+    assert fired == ["a"]
+    scheduler.advance(5.0)
+    assert fired == ["a", "b", "c"]
+    assert scheduler.pending() == 0
+
+
+def test_timer_scheduled_in_callback_waits_for_next_advance():
+    scheduler = Scheduler()
+    ticks = []
+
+    def tick():
+        ticks.append(scheduler.now)
+        scheduler.schedule(0.0, tick)
+
+    scheduler.at(0.0, tick)
+    scheduler.advance(0.0)
+    scheduler.advance(1.0)
+    assert ticks == [0.0, 1.0]
+    assert scheduler.pending() == 1
+
+
+def test_stacked_effects_expire_independently():
+    world = World(spawn_rate=10**9)
+    player = world.player
+    RapidFirePowerUp(0, 0).apply_effect(player)
+    for _ in range(60):
+        world.step(1 / 60, PlayerInput())
+    ShieldPowerUp(0, 0).apply_effect(player)
+    ShieldPowerUp(0, 0).apply_effect(player)
+    assert player.shoot_cooldown_multiplier == 0.5 and player.shield_active
+
+    # The shield hit ends one shield; the other keeps the player covered
+    player.end_effect(player.find_effect("shield"))
+    assert player.shield_active and len(player.effects) == 2
+
+    # Rapid fire was picked up a second earlier and runs out first
+    for _ in range(4 * 60 + 30):
+        world.step(1 / 60, PlayerInput())
+    assert player.shoot_cooldown_multiplier == 1.0
+    assert player.shield_active
+    for _ in range(60):
+        world.step(1 / 60, PlayerInput())
+    assert not player.effects and not player.shield_active
+
+
+def test_destroyed_ship_cancels_its_timers():
+    world = World(spawn_rate=10**9)
+    player = world.player
+    pending = world.scheduler.pending()  # the asteroid field's spawn timer
+    player.shoot()
+    pickup = ShieldPowerUp(0, 0)
+    pickup.apply_effect(player)
+    pickup.kill()
+    assert world.scheduler.pending() == pending + 2
+    player.kill()
+    assert world.scheduler.pending() == pending
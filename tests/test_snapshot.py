@@ -0,0 +1,88 @@
+import os
+import random
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+import pygame
+import pytest
+
+from player import PlayerInput
+from snapshot import RewindBuffer, capture, capture_into, restore
+from world import World, UNLIMITED
+
+
+def play(world, steps, seed=3):
+    rng = random.Random(seed)
+    for _ in range(steps):
+        world.step(1 / 60, PlayerInput(*(rng.random() < 0.5 for _ in PlayerInput._fields)))
+        if world.game_over:
+            world.reset()
+
+
+@pytest.mark.parametrize("array_physics", [False, True])
+def test_restore_resumes_identically(array_physics):
+    if array_physics:
+        pytest.importorskip("numpy")
+    world = World(seed=11, array_physics=array_physics, spawn_rate=0.2, powerup_drop_chance=0.5)
+    play(world, 600)
+    saved = capture(world)
+    play(world, 300)
+    expected = capture(world)
+
+    restore(world, saved)
+    assert capture(world) == saved
+    play(world, 300)
+    assert capture(world) == expected
+
+
+def test_rewind_ring_buffer():
+    world = World(seed=2)
+    rewind = RewindBuffer(capacity=4)
+    for i in range(6):
+        world.score = i
+        rewind.push(world)
+    assert len(rewind) == 4
+    assert rewind.rewind(world, back=3)
+    assert world.score == 3
+    assert len(rewind) == 2
+    assert not rewind.rewind(world, back=3)
+
+
+@pytest.mark.parametrize("array_physics", [False, True])
+def test_capture_into_reuses_buffer(array_physics):
+    if array_physics:
+        pytest.importorskip("numpy")
+    world = World(seed=5, array_physics=array_physics, spawn_rate=0.2)
+    play(world, 300)
+    buf = bytearray(1 << 20)
+    size = capture_into(world, buf)
+    assert len(buf) == 1 << 20
+    assert bytes(buf[:size]) == capture(world)
+
+
+def test_restore_clears_particles():
+    pytest.importorskip("numpy")
+    world = World(seed=4, particles=256)
+    saved = capture(world)
+    play(world, 120)
+    world.particles.burst(pygame.Vector2(100, 100), pygame.Vector2(0, 0), 40)
+    assert world.particles.count
+    restore(world, saved)
+    assert not world.particles.count
+
+
+def test_array_capture_under_a_millisecond():
+    pytest.importorskip("numpy")
+    world = World(seed=1, array_physics=True, limits=UNLIMITED)
+    rng = random.Random(1)
+    for _ in range(3000):
+        world.asteroid_field.spawn(
+            20, pygame.Vector2(rng.uniform(0, 1280), rng.uniform(0, 720)), pygame.Vector2(50, 0)
+        )
+    timings = []
+    for _ in range(20):
+        start = time.perf_counter()
+        capture(world)
+        timings.append(time.perf_counter() - start)
+    assert min(timings) < 0.001
@@ -0,0 +1,63 @@
+import os
+import random
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+import pygame
+
+import soak
+from bots import AimPilot, EvadePilot, ScriptedPilot, IdlePilot
+from world import World
+
+
+def lone_asteroid(world, x, y):
+    for asteroid in list(world.asteroids):
+        asteroid.kill()
+    return world.asteroid_field.spawn(20, pygame.Vector2(x, y), pygame.Vector2(0, 0))
+
+
+def test_bots_aim_evade_and_take_turns():
+    world = World(seed=1)
+    player = world.player
+    lone_asteroid(world, player.position.x + 200, player.position.y)  # to the ship's right
+    aim = AimPilot(random.Random(0))
+    inputs = aim.inputs(world)
+    assert not inputs.fire and (inputs.left or inputs.right)
+    player.rotation = pygame.Vector2(0, 1).angle_to(pygame.Vector2(1, 0))
+    assert aim.inputs(world).fire
+
+    lone_asteroid(world, player.position.x, player.position.y + 60)  # dead ahead
+    player.rotation = 180  # facing away from it
+    assert EvadePilot().inputs(world).forward
+
+    scripted = ScriptedPilot(period=10)
+    world.elapsed = 25
+    assert isinstance(scripted.current(world), IdlePilot)
+
+
+def test_trends_fit_slopes_and_check_flags_growth():
+    assert soak.slope([0, 1, 2, 3], [5, 7, 9, 11]) == 2
+    samples = [
+        {
+            "sim_time": minute * 60.0,
+            "traced_bytes": 1000 + minute * 100_000,  # ~6 MB/hour
+            "groups": {"drawable": 50},
+            "frame": {"p95_ms": 1.0},
+        }
+        for minute in range(20)
+    ]
+    trend = soak.trends(samples, warmup=0.25)
+    assert trend["entities_per_hour"] == 0
+    assert round(trend["memory_bytes_per_hour"]) == 6_000_000
+    failures = soak.check(trend)
+    assert len(failures) == 1 and "memory" in failures[0]
+
+
+def test_short_soak_samples_every_interval():
+    results = soak.run(hours=20 / 3600, interval=5, seed=2)
+    samples = results["samples"]
+    assert len(samples) == 5  # the start plus one every 5 simulated seconds
+    assert abs(samples[-1]["sim_time"] - 20.0) < 1e-6
+    assert all(sample["traced_bytes"] > 0 for sample in samples[1:])
+    assert samples[-1]["frame"]["p99_ms"] >= samples[-1]["frame"]["p50_ms"]
+    assert set(results["trends"]) >= {"memory_bytes_per_hour", "entities_per_hour", "p95_growth_per_hour"}
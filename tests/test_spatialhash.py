@@ -0,0 +1,58 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+import pygame
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+from asteroid import Asteroid
+from shot import Shot
+from spatialhash import SpatialHash
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+
+
+def test_candidates_only_nearby():
+    near = Asteroid(100, 100, 20)
+    far = Asteroid(900, 500, 20)
+    shot = Shot(110, 100)
+    index = SpatialHash()
+    index.rebuild([near, far])
+    assert index.candidates(shot) == [near]
+
+
+def test_candidates_across_wrap_edge():
+    edge = Asteroid(SCREEN_WIDTH - 2, SCREEN_HEIGHT / 2, 20)
+    shot = Shot(2, SCREEN_HEIGHT / 2)
+    index = SpatialHash()
+    index.insert(edge)
+    assert index.candidates(shot) == [edge]
+
+
+def test_candidates_reach_far_across_wrap_edge():
+    # A swept shot at x=0 reaches back 100 px, to the cells left of the right edge
+    edge = Asteroid(SCREEN_WIDTH - 105, SCREEN_HEIGHT / 2, 20)
+    shot = Shot(0, SCREEN_HEIGHT / 2)
+    shot.velocity = pygame.Vector2(1000, 0)
+    index = SpatialHash()
+    index.insert(edge)
+    assert index.candidates(shot, dt=0.1) == [edge]
+
+
+def test_candidates_filtered_by_group():
+    asteroids = pygame.sprite.Group()
+    rock = Asteroid(200, 200, 20)
+    other = Shot(205, 200)
+    asteroids.add(rock)
+    index = SpatialHash()
+    index.rebuild([rock, other])
+    probe = Shot(200, 205)
+    assert index.candidates(probe, asteroids) == [rock]
+
+
+def test_check_collision_squared_distance():
+    a = Asteroid(0, 0, 20)
+    s = Shot(25, 0)
+    assert a.check_collision(s)
+    s.position.x = 25.01
+    assert not a.check_collision(s)
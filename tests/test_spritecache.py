@@ -0,0 +1,41 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+import pygame
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+from asteroid import Asteroid
+from player import Player
+from spritecache import SpriteAtlas, atlas, draw_sprites
+
+
+def test_circles_are_rendered_once():
+    cache = SpriteAtlas()
+    first = cache.circle(20, "white", 2)
+    assert cache.circle(20, (255, 255, 255), 2) is first
+    assert cache.circle(40, "white", 2) is not first
+
+
+def test_colours_are_normalised_once():
+    cache = SpriteAtlas()
+    first = cache.circle(10, "red")
+    assert cache.circle(10, pygame.Color(255, 0, 0)) is first  # unhashable, still found
+    assert list(cache.colors) == ["red"]
+
+
+def test_ship_rotations_are_quantized():
+    cache = SpriteAtlas(rotation_steps=72)
+    assert cache.ship(20, "white", 1) is cache.ship(20, "white", 359)
+    assert cache.ship(20, "white", 0) is not cache.ship(20, "white", 5)
+    assert cache.ship(20, "white", 0) is not cache.ship(20, (0, 255, 0), 0)
+
+
+def test_draw_sprites_blits_centered():
+    screen = pygame.Surface((200, 200))
+    group = pygame.sprite.Group()
+    group.add(Asteroid(100, 100, 20), Player(50, 50))
+    draw_sprites(screen, group)
+    assert screen.get_at((119, 100)) == pygame.Color("white")
+    assert screen.get_at((100, 100)) == pygame.Color("black")
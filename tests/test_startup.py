@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Process launch to first presented frame, with the dummy video driver.
+# Generous, so only real regressions (an eager heavy import, blocking I/O
+# before the first frame) trip it on a slow CI machine.
+COLD_START_BUDGET = 3.0
+
+
+def test_cold_start_budget(tmp_path):
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy")
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, os.path.join(ROOT, "main.py"), "--startup-report", "--quit-after", "1", "--seed", "1"],
+        cwd=tmp_path,  # keep any files the game writes out of the repo
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=30,
+    )
+    elapsed = time.perf_counter() - started
+    assert result.returncode == 0, result.stderr
+    phases = {}
+    for line in result.stdout.splitlines():
+        if line.startswith("startup "):
+            _, name, ms, _ = line.split()
+            phases[name] = float(ms)
+    assert list(phases) == ["imports", "display", "world", "first_frame", "total"]
+    assert elapsed < COLD_START_BUDGET
+    # The leaderboard database is not opened before a game ends
+    assert not os.listdir(tmp_path)
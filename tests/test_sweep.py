@@ -0,0 +1,64 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+import pygame
+
+from asteroid import Asteroid
+from shot import Shot
+from world import World
+from constants import SCREEN_WIDTH
+
+
+def tunneling_world(continuous_collision):
+    # A shot that moved 50 px in a 10 Hz step, straight through a small asteroid
+    world = World(seed=0, continuous_collision=continuous_collision)
+    for a in world.asteroids: a.kill()
+    Asteroid(100, 300, 20)
+    shot = Shot(100, 340)
+    shot.velocity = pygame.Vector2(0, 500)
+    world.last_dt = 0.1
+    return world
+
+
+def test_swept_shots_do_not_tunnel():
+    world = tunneling_world(False)
+    world.collide_shots()
+    assert world.score == 0
+
+    world = tunneling_world(True)
+    world.collide_shots()
+    assert world.score == 10
+    assert not world.shots
+
+
+def test_earliest_hit_along_path():
+    shot = Shot(100, 400)
+    shot.velocity = pygame.Vector2(0, 1000)
+    near = Asteroid(100, 330, 20)
+    far = Asteroid(100, 380, 20)
+    t_near = shot.time_of_impact(near, 0.1)
+    t_far = shot.time_of_impact(far, 0.1)
+    assert 0 < t_near < t_far < 1
+    assert shot.time_of_impact(Asteroid(200, 330, 20), 0.1) is None
+
+
+def test_sweep_across_wrap_edge():
+    # The shot left the right edge and wrapped to x=0 during the step
+    shot = Shot(0, 300)
+    shot.velocity = pygame.Vector2(600, 0)
+    edge = Asteroid(SCREEN_WIDTH - 20, 300, 20)
+    assert not shot.check_collision(edge)
+    assert shot.time_of_impact(edge, 0.1) is not None
+
+
+def test_swept_hit_across_wrap_edge():
+    # The shot's path over the step starts left of x=0, on the far side of the wrap
+    world = World(seed=0, continuous_collision=True)
+    for a in world.asteroids: a.kill()
+    Asteroid(SCREEN_WIDTH - 105, 300, 20)
+    shot = Shot(0, 300)
+    shot.velocity = pygame.Vector2(1000, 0)
+    world.last_dt = 0.1
+    world.collide_shots()
+    assert world.score == 10
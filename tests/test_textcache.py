@@ -0,0 +1,35 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+import pygame
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+from game_over_screen import GameOverScreen
+from pause_menu import PauseMenu
+from textcache import TextCache
+
+
+def test_lru_hits_and_eviction():
+    font = pygame.font.Font(None, 36)
+    cache = TextCache(capacity=2)
+    first = cache.render(font, "Score: 0")
+    assert cache.render(font, "Score: 0") is first
+    cache.render(font, "Score: 10")
+    cache.render(font, "Score: 0")  # refreshes "Score: 0"
+    cache.render(font, "Score: 20")  # evicts "Score: 10"
+    assert (font, "Score: 10", (255, 255, 255), True) not in cache.surfaces
+    assert cache.render(font, "Score: 0") is first
+    assert cache.hits == 3
+
+
+def test_static_screens_are_composed_once():
+    menu = PauseMenu(640, 480)
+    assert menu.compose() is menu.compose()
+    assert menu.resume_rect.centerx == 320
+
+    screen = GameOverScreen(640, 480)
+    surface, rect = screen.compose(30, [50, 30])
+    assert screen.compose(30, [50, 30])[0] is surface
+    assert screen.compose(40, [50, 40])[0] is not surface
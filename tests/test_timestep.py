@@ -0,0 +1,42 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+import pygame
+import pytest
+
+from circleshape import CircleShape
+from shot import Shot
+from timestep import FixedTimestep
+from constants import SCREEN_WIDTH
+
+
+def test_accumulates_partial_frames():
+    stepper = FixedTimestep(50)
+    assert stepper.advance(0.015) == 0
+    assert stepper.advance(0.015) == 1
+    assert stepper.alpha == pytest.approx(0.5)
+
+
+def test_catchup_is_capped_and_backlog_dropped():
+    stepper = FixedTimestep(100, max_steps=4)
+    assert stepper.advance(1.0) == 4
+    assert stepper.accumulator < stepper.step_dt
+    assert stepper.dropped_time == pytest.approx(0.96)
+
+
+def test_render_position_interpolates():
+    shot = Shot(100, 100)
+    shot.velocity = pygame.Vector2(100, 0)
+    shot.remember_position()
+    shot.update(0.5)
+    CircleShape.render_alpha = 0.25
+    try:
+        assert shot.render_position() == pygame.Vector2(112.5, 100)
+        # No interpolation across a wrap-around
+        shot.position.x = SCREEN_WIDTH - 1
+        shot.remember_position()
+        shot.update(0.1)
+        assert shot.render_position() == shot.position
+    finally:
+        CircleShape.render_alpha = 1.0
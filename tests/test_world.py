@@ -0,0 +1,110 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+import pygame
+import pytest
+
+from asteroid import Asteroid
+from player import PlayerInput
+from world import World, GAME_OVER, EntityLimits
+from powerup import ShieldPowerUp
+from shot import Shot
+from constants import PLAYER_LIVES
+
+
+def test_step_runs_headless():
+    world = World()
+    for _ in range(600):
+        world.step(1 / 60, PlayerInput(fire=True, right=True))
+    assert world.score >= 0
+    assert len(world.shots) > 0 or world.lives < PLAYER_LIVES
+
+
+def test_asteroid_on_player_costs_life_then_game_over():
+    world = World()
+    for _ in range(PLAYER_LIVES):
+        assert not world.game_over
+        Asteroid(world.player.position.x, world.player.position.y, 20)
+        world.step(1 / 60)
+        for a in world.asteroids: a.kill()
+    assert world.state == GAME_OVER
+    world.reset()
+    assert world.lives == PLAYER_LIVES
+    assert world.score == 0
+
+
+def test_shot_hit_scores_and_splits():
+    world = World()
+    for a in world.asteroids: a.kill()
+    x, y = world.player.position
+    Asteroid(x, y + 200, 40)
+    world.step(1 / 60, PlayerInput(fire=True))
+    for _ in range(30):
+        world.step(1 / 60)
+    assert sorted(a.radius for a in world.asteroids) == [20, 20]
+    assert world.score == 10
+
+
+def test_shots_and_powerups_expire():
+    world = World(limits=EntityLimits(shot_lifetime=0.5, powerup_lifetime=1.0), spawn_rate=10**9)
+    Shot(100, 100)
+    ShieldPowerUp(100, 600)
+    for _ in range(45):
+        world.step(1 / 60)
+    assert not world.shots
+    assert len(world.powerups_group) == 1
+    for _ in range(30):
+        world.step(1 / 60)
+    assert not world.powerups_group
+    assert world.limit_counts["shot_expired"] == 1
+    assert world.limit_counts["powerup_expired"] == 1
+
+
+def test_caps_evict_oldest_and_skip_spawns():
+    world = World(limits=EntityLimits(max_asteroids=3, max_entities=5), spawn_rate=0.01)
+    for a in world.asteroids: a.kill()
+    world.step(1 / 60)
+    oldest = [Asteroid(100 + 60 * i, 50, 20) for i in range(2)]
+    world.step(1 / 60)
+    for i in range(3):
+        Asteroid(100 + 60 * i, 150, 20)
+    world.step(1 / 60)
+    assert len(world.asteroids) == 3
+    assert not any(a.alive() for a in oldest)
+    assert world.limit_counts["asteroid_evicted"] == 3
+    assert world.limit_counts["asteroid_spawn_skipped"] == 2  # Full on the second and third step
+    for i in range(4):
+        Shot(100 + 60 * i, 400)
+    world.step(1 / 60)
+    assert world.entity_count() == 5
+
+
+@pytest.mark.parametrize("array_physics", [False, True])
+def test_two_shots_hit_one_asteroid_in_one_step(array_physics):
+    if array_physics:
+        pytest.importorskip("numpy")
+    world = World(seed=0, array_physics=array_physics, spawn_rate=10**9, powerup_drop_chance=0)
+    world.bind()
+    for a in world.asteroids: a.kill()
+    rock = world.asteroid_field.asteroid_class.pool.acquire(200, 200, 60)
+    for _ in range(2):
+        world.player.shot_class.pool.acquire(200, 200)
+    world.collide()
+    # The destroyed asteroid is never revived as one of the fragments
+    assert rock not in world.asteroids
+    assert len(set(world.asteroids)) == len(world.asteroids)
+    # The second shot splits one of the fresh fragments, on either backend
+    assert world.score == 20 and not world.shots
+    assert len(world.asteroids) == 3
+
+
+def test_backends_play_the_same_game():
+    pytest.importorskip("numpy")
+    results = []
+    for array_physics in (False, True):
+        world = World(seed=8, array_physics=array_physics, spawn_rate=0.3)
+        for i in range(1800):
+            world.step(1 / 60, PlayerInput(fire=True, left=i % 240 < 120, forward=i % 90 < 30))
+        results.append((world.score, world.lives, len(world.asteroids), len(world.shots)))
+    assert results[0] == results[1]
@@ -0,0 +1,41 @@
+import functools
+import pygame
+from collections import OrderedDict
+from constants import TEXT_CACHE_SIZE
+
+
+@functools.lru_cache(maxsize=None)
+def get_font(size):
+    # Default font at `size`, loaded on first use instead of at startup
+    return pygame.font.Font(None, size)
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by font, string and colour."""
+
+    def __init__(self, capacity=TEXT_CACHE_SIZE):
+        self.capacity = capacity
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color=(255, 255, 255), antialias=True):
+        key = (font, text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+text_cache = TextCache()
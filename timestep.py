@@ -0,0 +1,36 @@
+from constants import MAX_CATCHUP_STEPS
+
+
+class FixedTimestep:
+    """Turns variable frame times into a whole number of fixed simulation steps.
+
+    Frame time is banked in an accumulator and spent in `step_dt` chunks.
+    At most `max_steps` steps run per frame; any backlog past that is
+    dropped instead of carried over, so a slow frame can't snowball into
+    ever longer catch-up frames. `alpha` is how far the render time sits
+    between the last two simulation states.
+    """
+
+    def __init__(self, rate, max_steps=MAX_CATCHUP_STEPS):
+        self.step_dt = 1.0 / rate
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.dropped_time = 0.0  # seconds of simulation skipped by the catch-up cap
+
+    def advance(self, frame_dt):
+        self.accumulator += frame_dt
+        steps = int(self.accumulator / self.step_dt)
+        if steps > self.max_steps:
+            backlog = (steps - self.max_steps) * self.step_dt
+            self.dropped_time += backlog
+            self.accumulator -= backlog
+            steps = self.max_steps
+        self.accumulator -= steps * self.step_dt
+        return steps
+
+    @property
+    def alpha(self):
+        return min(self.accumulator / self.step_dt, 1.0)
+
+    def reset(self):
+        self.accumulator = 0.0
@@ -0,0 +1,424 @@
+import pygame
+import random
+from collections import Counter
+from typing import NamedTuple, Optional
+from constants import (
+    SCREEN_WIDTH,
+    SCREEN_HEIGHT,
+    PLAYER_LIVES,
+    PLAYER_SHOOT_SPEED,
+    ASTEROID_SPAWN_RATE,
+    POWERUP_DROP_CHANCE,
+    SHOT_LIFETIME,
+    SHOT_RANGE,
+    POWERUP_LIFETIME,
+    MAX_ASTEROIDS,
+    MAX_SHOTS,
+    MAX_POWERUPS,
+    MAX_ENTITIES,
+)
+from circleshape import CircleShape
+from player import Player, PlayerInput
+from asteroid import Asteroid
+from asteroidfield import AsteroidField
+from shot import Shot
+from spatialhash import SpatialHash
+from scheduler import Scheduler
+from profiler import NULL_PROFILER, COLLISION, UPDATE
+from eventlog import event_log, INFO
+from powerup import (
+    RapidFirePowerUp,
+    ShieldPowerUp,
+    SpreadShotPowerUp,
+    PowerUp,
+)
+
+PLAYING = "PLAYING"
+GAME_OVER = "GAME_OVER"
+
+NO_INPUT = PlayerInput()
+
+
+class EntityLimits(NamedTuple):
+    # None switches a limit off
+    shot_lifetime: Optional[float] = SHOT_LIFETIME
+    shot_range: Optional[float] = SHOT_RANGE
+    powerup_lifetime: Optional[float] = POWERUP_LIFETIME
+    max_asteroids: Optional[int] = MAX_ASTEROIDS
+    max_shots: Optional[int] = MAX_SHOTS
+    max_powerups: Optional[int] = MAX_POWERUPS
+    max_entities: Optional[int] = MAX_ENTITIES
+
+    def shot_max_age(self):
+        ages = [self.shot_lifetime]
+        if self.shot_range is not None:
+            ages.append(self.shot_range / PLAYER_SHOOT_SPEED)
+        ages = [age for age in ages if age is not None]
+        return min(ages) if ages else None
+
+
+UNLIMITED = EntityLimits(*[None] * len(EntityLimits._fields))
+
+
+class World:
+    """The game rules, independent of any window, event queue or clock.
+
+    `step(dt, inputs)` advances the simulation by `dt` seconds using the
+    given PlayerInput. The world owns its sprite groups and points the
+    entity classes' `containers` at them whenever it steps, so several
+    worlds can live in one process.
+    """
+
+    def __init__(
+        self,
+        array_physics=False,
+        interpolate=False,
+        seed=None,
+        spawn_rate=ASTEROID_SPAWN_RATE,
+        powerup_drop_chance=POWERUP_DROP_CHANCE,
+        powerup_duration=None,
+        continuous_collision=False,
+        limits=EntityLimits(),
+        particles=0,
+    ):
+        # Tunables; powerup_duration=None keeps each power-up's own duration
+        self.spawn_rate = spawn_rate
+        self.powerup_drop_chance = powerup_drop_chance
+        self.powerup_duration = powerup_duration
+        # All game randomness comes from this generator, so a seed plus the
+        # per-step inputs reproduce a session exactly
+        self.seed = seed
+        self.rng = random.Random(seed)
+        # With `interpolate` every step first records the previous positions
+        # so the renderer can draw between the last two states
+        self.interpolate = interpolate
+        # With `continuous_collision` shots are swept along their last step's
+        # path, so they can't pass through asteroids at low step rates
+        self.continuous_collision = continuous_collision
+        self.last_dt = 0.0
+        self.limits = limits
+        self.limit_counts = Counter()  # how often each limit triggered, by name
+        self.updatable = pygame.sprite.Group()
+        self.drawable = pygame.sprite.Group()
+        self.asteroids = pygame.sprite.Group()
+        self.shots = pygame.sprite.Group()
+        self.powerups_group = pygame.sprite.Group() # Power-ups group
+
+        self.physics = None
+        if array_physics:
+            from physics import ArrayPhysics
+
+            self.physics = ArrayPhysics()
+        # Cosmetic debris and exhaust, with room for `particles` at a time
+        self.particles = None
+        if particles:
+            from particles import ParticleSystem
+
+            self.particles = ParticleSystem(particles)
+            self.particles.add(self.updatable, self.drawable)
+        # Shot cooldowns, power-up effects and despawns, and asteroid spawns
+        self.scheduler = Scheduler()
+        self.collision_index = SpatialHash()
+        self.sweep_index = SpatialHash()
+        self.profiler = NULL_PROFILER
+
+        self.player = None
+        self.asteroid_field = None
+        self.elapsed = 0.0
+        self.reset()
+
+    def bind(self):
+        CircleShape.clock = self.elapsed
+        CircleShape.particles = self.particles
+        CircleShape.scheduler = self.scheduler
+        PowerUp.lifetime = self.limits.powerup_lifetime
+        PowerUp.on_expire = self.expire_powerup
+        # The player is stepped explicitly with its inputs, so it stays out of `updatable`
+        Player.containers = (self.drawable,)
+        Asteroid.containers = (self.asteroids, self.updatable, self.drawable)
+        AsteroidField.containers = () # Spawns on the scheduler, so it needs no update()
+        Shot.containers = (self.shots, self.updatable, self.drawable)
+        PowerUp.containers = (self.powerups_group, self.updatable, self.drawable)
+
+        if self.physics:
+            from physics import ArrayAsteroid, ArrayShot
+
+            # Array bodies are integrated in bulk, so they stay out of `updatable`
+            self.physics.bind()
+            ArrayAsteroid.containers = (self.asteroids, self.drawable)
+            ArrayShot.containers = (self.shots, self.drawable)
+            AsteroidField.asteroid_class = ArrayAsteroid
+            Player.shot_class = ArrayShot
+        else:
+            AsteroidField.asteroid_class = Asteroid
+            Player.shot_class = Shot
+
+    def reset(self):
+        self.bind()
+        if self.player:
+            self.player.kill()
+        if self.asteroid_field:
+            self.asteroid_field.kill()  # Remove old asteroid field before creating a new one
+        for a in self.asteroids: type(a).pool.release(a)
+        for s in self.shots: type(s).pool.release(s)
+        for p in self.powerups_group: p.kill() # Clear existing power-ups
+        if self.particles:
+            self.particles.clear()
+        self.scheduler.clear()
+
+        self.player = Player(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
+        self.asteroid_field = AsteroidField(self.rng, self.spawn_rate, self.has_room_for_asteroid, self.scheduler)
+        self.score = 0
+        self.elapsed = 0.0  # simulated seconds this game
+        CircleShape.clock = 0.0
+        self.last_dt = 0.0
+        self.powerups_collected = 0
+        self.lives = PLAYER_LIVES
+        self.state = PLAYING
+
+    @property
+    def game_over(self):
+        return self.state == GAME_OVER
+
+    def step(self, dt, inputs=NO_INPUT):
+        if self.state != PLAYING:
+            return
+        self.elapsed += dt
+        self.bind()
+        self.scheduler.advance(self.elapsed)
+        if self.interpolate:
+            self.remember_positions()
+        self.profiler.mark(UPDATE)  # timers and bookkeeping, not collision
+        alive = self.collide()
+        self.profiler.mark(COLLISION)
+        if alive:
+            self.advance(dt, inputs)
+            self.profiler.mark(UPDATE)
+
+    def collide(self):
+        # Collision pass; returns False when the rest of the step is skipped
+        if not self.collide_player():
+            return False
+        self.collide_shots()
+        self.collect_powerups()
+        return True
+
+    def advance(self, dt, inputs=NO_INPUT):
+        # Movement pass
+        self.player.update(dt, inputs)
+        self.advance_field(dt)
+
+    def advance_field(self, dt):
+        # Everything but the ship(s): asteroids, shots, power-ups, the spawner
+        self.last_dt = dt
+        for sprite in self.updatable:
+            sprite.update(dt)
+        if self.physics:
+            self.physics.step(dt)
+        self.enforce_limits()
+
+    def has_room_for_asteroid(self):
+        # Asked by the asteroid field before each spawn
+        limits = self.limits
+        if limits.max_asteroids is not None and len(self.asteroids) >= limits.max_asteroids:
+            self.limit_counts["asteroid_spawn_skipped"] += 1
+            return False
+        if limits.max_entities is not None and self.entity_count() >= limits.max_entities:
+            self.limit_counts["asteroid_spawn_skipped"] += 1
+            return False
+        return True
+
+    def entity_count(self):
+        return len(self.asteroids) + len(self.shots) + len(self.powerups_group)
+
+    def enforce_limits(self):
+        limits, now = self.limits, self.elapsed
+        shot_max_age = limits.shot_max_age()
+        if shot_max_age is not None:
+            for shot in self.shots:
+                if now - shot.born > shot_max_age:
+                    self.remove_entity(shot, "shot_expired")
+
+        self.evict_oldest(self.shots, limits.max_shots, "shot_evicted")
+        self.evict_oldest(self.powerups_group, limits.max_powerups, "powerup_evicted")
+        self.evict_oldest(self.asteroids, limits.max_asteroids, "asteroid_evicted")
+        if limits.max_entities is not None:
+            # Over the global budget: shots go first, asteroids last
+            excess = self.entity_count() - limits.max_entities
+            for group, name in (
+                (self.shots, "shot_evicted"),
+                (self.powerups_group, "powerup_evicted"),
+                (self.asteroids, "asteroid_evicted"),
+            ):
+                if excess <= 0:
+                    break
+                excess -= self.evict_oldest(group, max(0, len(group) - excess), name)
+
+    def expire_powerup(self, powerup):
+        # Despawn timer of a power-up nobody collected
+        if powerup.alive():
+            self.remove_entity(powerup, "powerup_expired")
+
+    def evict_oldest(self, group, cap, counter):
+        # Remove the oldest members of `group` beyond `cap`; returns how many
+        if cap is None or len(group) <= cap:
+            return 0
+        oldest = sorted(group, key=lambda sprite: sprite.born)[: len(group) - cap]
+        for sprite in oldest:
+            self.remove_entity(sprite, counter)
+        return len(oldest)
+
+    def remove_entity(self, sprite, counter):
+        pool = getattr(type(sprite), "pool", None)
+        if pool:
+            pool.release(sprite)
+        else:
+            sprite.kill()
+        self.limit_counts[counter] += 1
+
+    def pool_stats(self):
+        return {
+            "shots": Player.shot_class.pool.stats(),
+            "asteroids": AsteroidField.asteroid_class.pool.stats(),
+        }
+
+    def remember_positions(self):
+        for sprite in self.drawable:
+            sprite.remember_position()
+        if self.physics:
+            self.physics.remember()
+
+    def collide_player(self):
+        # Returns False when the player lost a life and the rest of the step is skipped
+        self.rebuild_collision_index()
+        if self.ship_hit(self.player):
+            self.player.kill()
+            self.lives -= 1
+            if self.lives > 0:
+                self.player = Player(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
+            else:
+                self.state = GAME_OVER
+            return False
+        return True
+
+    def rebuild_collision_index(self):
+        if self.physics:
+            self.collision_index.rebuild(self.powerups_group)
+        else:
+            self.collision_index.rebuild(self.asteroids, self.powerups_group)
+
+    def ship_hit(self, player):
+        # True when an asteroid hit the unshielded ship; a shield absorbs one hit
+        if self.physics:
+            candidates = self.physics.asteroids_touching(player)
+        else:
+            candidates = self.collision_index.candidates(player, self.asteroids)
+
+        for asteroid in candidates:
+            if asteroid.check_collision(player):
+                if player.shield_active:
+                    asteroid.split(self.rng)
+                    player.end_effect(player.find_effect("shield"))
+                else:
+                    return True
+        return False
+
+    def collide_shots(self):
+        # Asteroids destroyed in this pass are reused only after it, so the
+        # candidate lists and index cells never point at a revived fragment
+        pool = self.asteroid_field.asteroid_class.pool
+        pool.hold()
+        try:
+            if self.continuous_collision:
+                self.collide_shots_swept(self.last_dt)
+            else:
+                self.collide_shots_discrete()
+        finally:
+            pool.recycle()
+
+    def collide_shots_discrete(self):
+        # Both backends visit shots in group order and try each shot's
+        # candidates in the order the asteroids were added, so a game plays
+        # out the same on either
+        index = self.collision_index
+        if self.physics:
+            # Candidates from the arrays as the pass starts; fragments split
+            # off during it only live in the index, as the asteroids aren't there
+            touching = dict(self.physics.shot_hits())
+            indexed = len(index.order)
+            order = None
+        for shot in self.shots:
+            if not self.physics:
+                candidates = index.candidates(shot, self.asteroids)
+            else:
+                candidates = touching.get(shot, [])
+                if len(candidates) > 1:
+                    if order is None:
+                        order = {asteroid: i for i, asteroid in enumerate(self.asteroids)}
+                    candidates.sort(key=lambda asteroid: order.get(asteroid, -1))
+                if len(index.order) > indexed:
+                    candidates = candidates + index.candidates(shot, self.asteroids)
+            for asteroid in candidates:
+                if not asteroid.alive():
+                    continue # Already split by an earlier shot this step
+                if asteroid.check_collision(shot):
+                    self.shot_hit(shot, asteroid, index)
+                    break # Assume one shot hits one asteroid part
+
+    def collide_shots_swept(self, dt):
+        # Each shot hits the asteroid its path over the last step touched first
+        index = self.sweep_index
+        index.rebuild(self.asteroids, dt=dt)
+        for shot in self.shots:
+            hit, first = None, None
+            for asteroid in index.candidates(shot, dt=dt):
+                if not asteroid.alive():
+                    continue # Already split by an earlier shot this step
+                t = shot.time_of_impact(asteroid, dt)
+                if t is not None and (first is None or t < first):
+                    hit, first = asteroid, t
+            if hit:
+                self.shot_hit(shot, hit, index)
+
+    def shot_hit(self, shot, asteroid, index):
+        type(shot).pool.release(shot)
+        position = pygame.Vector2(asteroid.position)
+        for fragment in asteroid.split(self.rng):
+            index.insert(fragment)
+        self.score += 10
+        self.drop_powerup(position)
+
+    def drop_powerup(self, position):
+        if self.rng.random() < self.powerup_drop_chance:
+            powerup_cls = self.rng.choice([
+                RapidFirePowerUp,
+                ShieldPowerUp,
+                SpreadShotPowerUp,
+            ])
+            powerup = powerup_cls(position.x, position.y)
+            if self.powerup_duration is not None:
+                powerup.duration = self.powerup_duration
+            self.collision_index.insert(powerup)
+            if event_log.enabled_for(INFO):
+                event_log.info("powerup_spawned", kind=powerup.powerup_type, x=position.x, y=position.y)
+
+    def collect_powerups(self, player=None):
+        player = player or self.player
+        collected_powerups = [
+            powerup_obj
+            for powerup_obj in self.collision_index.candidates(player, self.powerups_group)
+            if powerup_obj.check_collision(player)
+        ]
+        for powerup_obj in collected_powerups:
+            powerup_obj.kill()
+            powerup_obj.apply_effect(player)
+            self.powerups_collected += 1
+            # Only build the fields when they will be kept; powerup_timer
+            # walks every active effect
+            if event_log.enabled_for(INFO):
+                event_log.info(
+                    "powerup_collected",
+                    kind=powerup_obj.powerup_type,
+                    cooldown_multiplier=player.shoot_cooldown_multiplier,
+                    timer=player.powerup_timer,
+                )